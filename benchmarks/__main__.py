@@ -0,0 +1,65 @@
+"""
+Runs every benchmark and prints the results as a single JSON document, so that runs of different versions can be
+compared with: python -m benchmarks.compare baseline.json current.json
+Run from the repository root with: python -m benchmarks [--output results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from . import (bench_body, bench_converter, bench_deserializer,
+               bench_end_to_end, bench_serializer)
+
+
+def getRevision() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(quick: bool = False) -> dict:
+    scale = 10 if quick else 1
+    return {
+        'metadata': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'revision': getRevision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'serializer': bench_serializer.run(100000 // scale),
+        'deserializer': bench_deserializer.run(10000 // scale),
+        'converter': bench_converter.run(10000 // scale),
+        'body': bench_body.run(100000 // scale),
+        'end_to_end': bench_end_to_end.run(200 // scale),
+        'end_to_end_latency': bench_end_to_end.run(100 // scale, latency=0.005),
+        'end_to_end_errors': bench_end_to_end.run(200 // scale, error_rate=0.1),
+        'end_to_end_too_large': bench_end_to_end.run(
+            50 // scale, values=10000, max_body_size=32 * 1024
+        ),
+        'end_to_end_batched': bench_end_to_end.run(
+            50 // scale,
+            values=10000,
+            max_body_size=32 * 1024,
+            max_payload_size=28 * 1024,
+        ),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help='File to write the results to')
+    parser.add_argument('--quick', action='store_true', help='Run smaller benchmarks')
+    args = parser.parse_args()
+    results = json.dumps(run(args.quick), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(results)
+    print(results)
@@ -0,0 +1,101 @@
+"""
+Measures how long omfRequest takes to build its gzip request bodies: a single body, batched bodies, a streamed body and
+bodies sharded across a process pool with one worker per core, as column data pickled to the workers or as objects
+forked with them.
+Run from the repository root with: python -m benchmarks.bench_body
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import timeit
+
+from omf_sample_library_preview.Client.OMFClient import OMFClient
+from omf_sample_library_preview.Client.ShardSerializer import ShardSerializer
+from omf_sample_library_preview.Client.StreamingEncoder import StreamingEncoder
+from omf_sample_library_preview.Models import OMFColumnData
+
+from .bench_serializer import createData, createType
+
+
+def run(values: int = 100000, repeat: int = 5) -> dict:
+    data = [createData(values)]
+    client = OMFClient('http://127.0.0.1')
+    results = {'values': values}
+
+    body = client._createBody(data)
+    results['single'] = {
+        'seconds': min(
+            timeit.repeat(lambda: client._createBody(data), number=1, repeat=repeat)
+        ),
+        'bytes': len(body),
+        'bodies': 1,
+    }
+
+    # Split into about eight bodies to measure the batching overhead
+    client.MaxPayloadSize = max(len(body) // 8, 1024)
+    bodies = client._createBodies(data)
+    results['batched'] = {
+        'seconds': min(
+            timeit.repeat(lambda: client._createBodies(data), number=1, repeat=repeat)
+        ),
+        'bytes': sum(len(body) for body in bodies),
+        'bodies': len(bodies),
+    }
+
+    encoder = StreamingEncoder()
+    results['streamed'] = {
+        'seconds': min(
+            timeit.repeat(
+                lambda: b''.join(encoder.encode(data)), number=1, repeat=repeat
+            )
+        ),
+        'bytes': len(b''.join(encoder.encode(data))),
+        'bodies': 1,
+    }
+
+    # Shard into about four bodies per worker, timed once the worker processes are started. Pickled workers only
+    # shard values held in columns. The benchmark runs no other thread, so the workers can also be forked for every
+    # message list.
+    workers = os.cpu_count() or 1
+    client.MaxPayloadSize = None
+    column_data = [OMFColumnData.fromValues(createType(), data[0].Values, 'container')]
+    for name, start_method, messages in [
+        ('sharded', None, column_data),
+        ('sharded_fork', 'fork', data),
+    ]:
+        if start_method and start_method not in multiprocessing.get_all_start_methods():
+            continue
+        client.ShardSerializer = ShardSerializer(
+            workers, max(values // (4 * workers), 1), 0, start_method
+        )
+        bodies = client._createBodies(messages)
+        results[name] = {
+            'seconds': min(
+                timeit.repeat(
+                    lambda: client._createBodies(messages), number=1, repeat=repeat
+                )
+            ),
+            'bytes': sum(len(body) for body in bodies),
+            'bodies': len(bodies),
+            'workers': workers,
+            'start_method': client.ShardSerializer.StartMethod,
+        }
+        client.ShardSerializer.close()
+    client.close()
+
+    for result in results.values():
+        if isinstance(result, dict):
+            result['values_per_second'] = values / result['seconds']
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--values', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.values, args.repeat), indent=2))
@@ -0,0 +1,59 @@
+"""
+Measures ClassToOMFTypeConverter.convert on a decorated class with a few properties.
+Run from the repository root with: python -m benchmarks.bench_converter
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from omf_sample_library_preview.Converters import (convert, omf_type,
+                                                   omf_type_property)
+from omf_sample_library_preview.Models import OMFTypeCode
+
+
+@omf_type()
+class Reading:
+    def __init__(self, timestamp: datetime, value: float, quality: int, unit: str):
+        self.__timestamp = timestamp
+        self.__value = value
+        self.__quality = quality
+        self.__unit = unit
+
+    @omf_type_property(IsIndex=True)
+    def timestamp(self) -> datetime:
+        return self.__timestamp
+
+    @omf_type_property(Type=[OMFTypeCode.Number, OMFTypeCode.Null], Uom='m')
+    def value(self) -> float | None:
+        return self.__value
+
+    @property
+    def quality(self) -> int:
+        return self.__quality
+
+    @property
+    def unit(self) -> str:
+        return self.__unit
+
+
+def run(iterations: int = 10000, repeat: int = 5) -> dict:
+    seconds = min(
+        timeit.repeat(lambda: convert(Reading), number=iterations, repeat=repeat)
+    )
+    return {
+        'iterations': iterations,
+        'seconds': seconds,
+        'microseconds_per_convert': seconds / iterations * 1e6,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.iterations, args.repeat), indent=2))
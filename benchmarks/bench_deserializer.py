@@ -0,0 +1,62 @@
+"""
+Compares the compiled Serializeable.fromJson with the get_type_hints and deserialize implementation it replaced, on
+OMF type definitions and on a captured list of container messages.
+Run from the repository root with: python -m benchmarks.bench_deserializer
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import get_type_hints
+
+from omf_sample_library_preview.Models import OMFContainer, OMFType
+from omf_sample_library_preview.Models.Serializeable import deserialize
+
+from .bench_serializer import createType
+
+
+def legacyFromJson(cls: type, content: dict):
+    test = {}
+    for field, field_type in get_type_hints(cls).items():
+        if field in content:
+            test.update({field: deserialize(field_type, content[field])})
+    return cls(**test)
+
+
+def measure(fn, number: int, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=repeat))
+
+
+def run(messages: int = 10000, repeat: int = 5) -> dict:
+    omf_type = createType().toDictionary()
+    containers = [
+        OMFContainer(f'container{i}', 'Reading', Tags=['a', 'b']).toDictionary()
+        for i in range(messages)
+    ]
+
+    results = {}
+    for name, cls, contents in [
+        ('OMFType', OMFType, [omf_type] * (messages // 10)),
+        ('OMFContainer', OMFContainer, containers),
+    ]:
+        legacy_seconds = measure(
+            lambda: [legacyFromJson(cls, content) for content in contents], 1, repeat
+        )
+        compiled_seconds = measure(lambda: cls.fromJsonMany(contents), 1, repeat)
+        results[name] = {
+            'messages': len(contents),
+            'legacy_seconds': legacy_seconds,
+            'compiled_seconds': compiled_seconds,
+            'speedup': legacy_seconds / compiled_seconds,
+        }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.messages, args.repeat), indent=2))
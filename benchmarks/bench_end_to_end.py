@@ -0,0 +1,117 @@
+"""
+Measures DataService.createData throughput and latency against the local OMF endpoint emulator.
+Run from the repository root with: python -m benchmarks.bench_end_to_end
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+
+from omf_sample_library_preview.Client.OMFClient import OMFClient
+from omf_sample_library_preview.Client.OMFError import OMFError
+from omf_sample_library_preview.Client.RetryPolicy import RetryPolicy
+from omf_sample_library_preview.Emulator import OMFEmulator
+from omf_sample_library_preview.Models import OMFContainer
+from omf_sample_library_preview.Services import (ContainerService, DataService,
+                                                 TypeService)
+
+from .bench_serializer import createData, createType
+
+
+def percentiles(latencies: list[float]) -> dict:
+    if len(latencies) < 2:
+        return {'p50': latencies[0] if latencies else None}
+
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'p50': cuts[49],
+        'p90': cuts[89],
+        'p99': cuts[98],
+        'max': max(latencies),
+    }
+
+
+def run(
+    requests: int = 200,
+    values: int = 1000,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    max_body_size: int = None,
+    max_payload_size: int = None,
+) -> dict:
+    data = [createData(values)]
+    latencies = []
+    failures = 0
+    with OMFEmulator(seed=0) as emulator:
+        client = OMFClient(emulator.Url)
+        client.RetryPolicy = RetryPolicy(base_delay=0.01, max_delay=0.1)
+        client.MaxPayloadSize = max_payload_size
+        TypeService(client).createTypes([createType()])
+        ContainerService(client).createContainers(
+            [OMFContainer(data[0].ContainerId, 'Reading')]
+        )
+        data_service = DataService(client)
+
+        # Failures are only injected once the type and container exist
+        emulator.Latency = latency
+        emulator.ErrorRate = error_rate
+        emulator.MaxBodySize = max_body_size
+        before = emulator.stats()
+
+        start = time.perf_counter()
+        for _ in range(requests):
+            request_start = time.perf_counter()
+            try:
+                data_service.createData(data)
+            except OMFError:
+                failures += 1
+            latencies.append(time.perf_counter() - request_start)
+        seconds = time.perf_counter() - start
+        client.close()
+
+        stats = emulator.stats()
+        status_codes = {
+            str(code): count - before['status_codes'].get(code, 0)
+            for code, count in sorted(stats['status_codes'].items())
+        }
+        return {
+            'requests': requests,
+            'values_per_request': values,
+            'seconds': seconds,
+            'values_per_second': requests * values / seconds,
+            'failed_requests': failures,
+            'latency_seconds': percentiles(latencies),
+            'http_requests': stats['requests'] - before['requests'],
+            'bytes_received': stats['bytes_received'] - before['bytes_received'],
+            'values_received': stats['values'],
+            'status_codes': {
+                code: count for code, count in status_codes.items() if count
+            },
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--values', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-body-size', type=int, default=None)
+    parser.add_argument('--max-payload-size', type=int, default=None)
+    args = parser.parse_args()
+    print(
+        json.dumps(
+            run(
+                args.requests,
+                args.values,
+                args.latency,
+                args.error_rate,
+                args.max_body_size,
+                args.max_payload_size,
+            ),
+            indent=2,
+        )
+    )
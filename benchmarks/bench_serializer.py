@@ -0,0 +1,87 @@
+"""
+Compares the compiled Serializeable.toDictionary with the dataclasses.asdict implementation it replaced, and measures
+Serializeable.toJson.
+Run from the repository root with: python -m benchmarks.bench_serializer
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from omf_sample_library_preview.Models import (OMFClassification, OMFData,
+                                               OMFFormatCode, OMFType,
+                                               OMFTypeCode, OMFTypeProperty,
+                                               OMFTypeType)
+from omf_sample_library_preview.Models.Serializeable import dictionaryFactory
+
+
+@dataclass
+class Reading:
+    timestamp: datetime
+    value: float
+    quality: int
+
+
+def createData(count: int) -> OMFData[Reading]:
+    start = datetime(2000, 1, 1)
+    return OMFData[Reading](
+        [Reading(start + timedelta(seconds=i), i * 0.5, 192) for i in range(count)],
+        ContainerId='container',
+    )
+
+
+def createType() -> OMFType:
+    return OMFType(
+        'Reading',
+        OMFClassification.Dynamic,
+        OMFTypeType.Object,
+        Properties={
+            'timestamp': OMFTypeProperty(
+                OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+            ),
+            'value': OMFTypeProperty([OMFTypeCode.Number, OMFTypeCode.Null]),
+            'quality': OMFTypeProperty(OMFTypeCode.Integer),
+        },
+    )
+
+
+def measure(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def run(values: int = 100000, repeat: int = 5) -> dict:
+    data = createData(values)
+    omf_type = createType()
+    results = {}
+    for name, model, number in [('OMFData', data, 1), ('OMFType', omf_type, 1000)]:
+        asdict_seconds = measure(
+            lambda: [
+                asdict(model, dict_factory=dictionaryFactory) for _ in range(number)
+            ],
+            repeat,
+        )
+        compiled_seconds = measure(
+            lambda: [model.toDictionary() for _ in range(number)], repeat
+        )
+        json_seconds = measure(lambda: [model.toJson() for _ in range(number)], repeat)
+        results[name] = {
+            'iterations': number,
+            'asdict_seconds': asdict_seconds,
+            'compiled_seconds': compiled_seconds,
+            'speedup': asdict_seconds / compiled_seconds,
+            'to_json_seconds': json_seconds,
+        }
+    results['OMFData']['values'] = values
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--values', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.values, args.repeat), indent=2))
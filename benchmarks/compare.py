@@ -0,0 +1,42 @@
+"""
+Compares two benchmark result files and prints the ratio current / baseline of every timing, throughput and latency.
+Timings and latencies above 1 are slower, throughputs below 1 are slower.
+Run from the repository root with: python -m benchmarks.compare baseline.json current.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+# Keys holding a measurement worth comparing, other numbers describe the benchmark itself
+MEASUREMENTS = ('seconds', 'per_second', 'per_convert', 'p50', 'p90', 'p99', 'max')
+
+
+def compare(baseline: dict, current: dict, path: str = '') -> dict:
+    result = {}
+    for key, value in current.items():
+        name = f'{path}.{key}' if path else key
+        other = baseline.get(key)
+        if isinstance(value, dict) and isinstance(other, dict):
+            result.update(compare(other, value, name))
+        elif (
+            isinstance(value, (int, float))
+            and isinstance(other, (int, float))
+            and other
+            and any(key.endswith(measurement) for measurement in MEASUREMENTS)
+        ):
+            result[name] = value / other
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    print(json.dumps(compare(baseline, current), indent=2))
@@ -22,6 +22,9 @@ class ADHOMFClient(OMFClient):
         client_secret: str = None,
         omf_version: str = '1.2',
         logging_enabled: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
     ):
         self.__resource = resource
         self.__api_version = api_version
@@ -37,7 +40,15 @@ class ADHOMFClient(OMFClient):
         else:
             self.__auth_object = None
 
-        super().__init__(self.FullPath, omf_version, True, logging_enabled)
+        super().__init__(
+            self.FullPath,
+            omf_version,
+            True,
+            logging_enabled,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+        )
 
     @staticmethod
     def fromAppsettings(path: str = None):
@@ -101,6 +112,14 @@ class ADHOMFClient(OMFClient):
     def FullPath(self) -> bool:
         return self.__full_path
 
+    def close(self):
+        """
+        Closes the pooled http session and stops refreshing the token in the background
+        """
+        super().close()
+        if self.__auth_object is not None:
+            self.__auth_object.close()
+
     def _getToken(self) -> str:
         """
         Gets the bearer token
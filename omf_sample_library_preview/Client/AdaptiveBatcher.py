@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterator
+
+from ..Models.OMFData import OMFData
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from .OMFMetrics import OMFMetrics
+
+# Responses after which requests are made smaller: payload too large, throttled and unavailable
+DECREASE_STATUS_CODES = (413, 429, 503)
+
+
+class AdaptiveBatcher(object):
+    """
+    Splits OMFData messages into requests whose size adapts to the endpoint. After each successful request the target
+    number of values and messages per request grows while the values sent per second keep up, and steps back when they
+    drop. Payload too large, throttled and unavailable responses, and requests failing without a response, cut the
+    targets by the decrease factor, and a payload too large response also lowers the largest target used from then on.
+    """
+
+    def __init__(
+        self,
+        min_values: int = 100,
+        max_values: int = 100000,
+        min_messages: int = 1,
+        max_messages: int = 1000,
+        initial_values: int = 1000,
+        initial_messages: int = 100,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        tolerance: float = 0.05,
+    ):
+        """
+        :param min_values: Smallest target number of values per request
+        :param max_values: Largest target number of values per request
+        :param min_messages: Smallest target number of OMFData messages per request
+        :param max_messages: Largest target number of OMFData messages per request
+        :param initial_values: Target number of values per request of the first request
+        :param initial_messages: Target number of OMFData messages per request of the first request
+        :param increase: Fraction by which the targets grow after a request as fast as the previous one
+        :param decrease: Factor applied to the targets after a payload too large, throttled or failed request
+        :param tolerance: Fraction by which the values sent per second may drop before the targets step back
+        """
+        if not 0 < min_values <= initial_values <= max_values:
+            raise ValueError(
+                'Values per request bounds must be 0 < min <= initial <= max'
+            )
+        if not 0 < min_messages <= initial_messages <= max_messages:
+            raise ValueError(
+                'Messages per request bounds must be 0 < min <= initial <= max'
+            )
+        if increase <= 0 or not 0 < decrease < 1:
+            raise ValueError('Increase must be positive and decrease between 0 and 1')
+
+        self.__min_values = min_values
+        self.__max_values = max_values
+        self.__min_messages = min_messages
+        self.__max_messages = max_messages
+        self.__increase = increase
+        self.__decrease = decrease
+        self.__tolerance = tolerance
+        self.__values = float(initial_values)
+        self.__messages = float(initial_messages)
+        self.__ceiling = float(max_values)
+        self.__values_per_second = None
+        self.__metrics = OMFMetrics()
+        self.__lock = threading.Lock()
+
+    @property
+    def ValuesPerRequest(self) -> int:
+        """
+        Gets the current target number of values per request
+        :return:
+        """
+        return int(self.__values)
+
+    @property
+    def MessagesPerRequest(self) -> int:
+        """
+        Gets the current target number of OMFData messages per request
+        :return:
+        """
+        return int(self.__messages)
+
+    @property
+    def MaxValuesPerRequest(self) -> int:
+        """
+        Gets the largest target number of values per request, lowered by payload too large responses
+        :return:
+        """
+        return int(self.__ceiling)
+
+    @property
+    def ValuesPerSecond(self) -> float | None:
+        """
+        Gets the values per second of the last successful request, None before the first one
+        :return:
+        """
+        return self.__values_per_second
+
+    @property
+    def Metrics(self) -> OMFMetrics:
+        """
+        Gets the hook receiving the targets and values per second after every request, for example the Metrics of the
+        client sending the requests
+        :return:
+        """
+        return self.__metrics
+
+    @Metrics.setter
+    def Metrics(self, value: OMFMetrics | None):
+        self.__metrics = value if value is not None else OMFMetrics()
+
+    def split(self, omf_data: list[OMFData]) -> Iterator[list[OMFData]]:
+        """
+        Splits OMFData messages into requests of at most the target number of messages and values, splitting messages
+        with too many values into several messages with the same TypeId and ContainerId. The targets are read again
+        for every request, so that results recorded while iterating apply to the next request.
+        :param omf_data: List of OMF Data
+        :return: Iterator of lists of OMF Data, one per request
+        """
+        batch = []
+        batch_values = 0
+        for message in omf_data:
+            count = len(message.Values) if message.Values is not None else 0
+            start = 0
+            while True:
+                room = max(1, self.ValuesPerRequest - batch_values)
+                stop = min(count, start + room)
+                batch.append(
+                    message
+                    if start == 0 and stop == count
+                    else message.slice(start, stop)
+                )
+                batch_values += stop - start
+                start = stop
+                if (
+                    batch_values >= self.ValuesPerRequest
+                    or len(batch) >= self.MessagesPerRequest
+                ):
+                    yield batch
+                    batch = []
+                    batch_values = 0
+                if start >= count:
+                    break
+
+        if batch:
+            yield batch
+
+    def record(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        messages: int,
+        values: int,
+        seconds: float,
+        status_code: int = None,
+    ):
+        """
+        Adjusts the targets after a request
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param messages: Number of OMFData messages sent
+        :param values: Number of values sent
+        :param seconds: Duration of the request, including retries
+        :param status_code: Response status code, None if the request failed without a response
+        """
+        with self.__lock:
+            if status_code is None or status_code in DECREASE_STATUS_CODES:
+                if status_code == 413:
+                    self.__ceiling = max(
+                        self.__min_values,
+                        min(self.__ceiling, values * self.__decrease),
+                    )
+                self.__resize(self.__decrease)
+            elif 200 <= status_code < 300 and seconds > 0:
+                values_per_second = values / seconds
+                if (
+                    self.__values_per_second is None
+                    or values_per_second
+                    >= self.__values_per_second * (1 - self.__tolerance)
+                ):
+                    self.__resize(1 + self.__increase)
+                else:
+                    self.__resize(1 / (1 + self.__increase))
+                self.__values_per_second = values_per_second
+
+            self.__metrics.recordBatchSize(
+                message_type,
+                action,
+                self.MessagesPerRequest,
+                self.ValuesPerRequest,
+                self.__values_per_second or 0.0,
+            )
+
+    def __resize(self, factor: float):
+        # Must be called while holding the lock
+        self.__values = min(
+            max(self.__values * factor, self.__min_values), self.__ceiling
+        )
+        self.__messages = min(
+            max(self.__messages * factor, self.__min_messages), self.__max_messages
+        )
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFLinkData import OMFLinkData
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from ..Models.OMFType import OMFType
+from .CompressionPolicy import CompressionPolicy
+from .OMFClient import OMFClient
+from .OMFError import OMFError
+from .StageTimings import StageTimings
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncOMFClient(OMFClient):
+    """Handles asynchronous communication with OMF Endpoint using aiohttp."""
+
+    def __init__(
+        self,
+        url: str,
+        omf_version: str = '1.2',
+        verify_ssl: bool = True,
+        logging_enabled: bool = False,
+        max_retries: int = 10,
+        pool_connections: int = 100,
+        pool_maxsize: int = 100,
+        keep_alive: bool = True,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncOMFClient requires aiohttp, install it with: pip install omf_sample_library_preview[async]'
+            )
+
+        super().__init__(
+            url,
+            omf_version,
+            verify_ssl,
+            logging_enabled,
+            max_retries,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+        )
+        self.__client_session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __enter__(self):
+        raise TypeError('AsyncOMFClient must be used with "async with"')
+
+    async def close(self):
+        """
+        Closes the aiohttp session and all of its connections. Requests made after the client is closed raise an OMFError.
+        """
+        super().close()
+        if self.__client_session is not None:
+            await self.__client_session.close()
+            self.__client_session = None
+
+    @property
+    def ClientSession(self) -> aiohttp.ClientSession:
+        """
+        Gets the pooled aiohttp session, creating it on first use. Must be called from within a running event loop.
+        :return:
+        """
+        if self.Closed:
+            raise OMFError('The OMF client has been closed')
+
+        if self.__client_session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.PoolConnections * self.PoolMaxSize,
+                limit_per_host=self.PoolMaxSize,
+                force_close=not self.KeepAlive,
+            )
+            self.__client_session = aiohttp.ClientSession(connector=connector)
+
+        return self.__client_session
+
+    async def omfRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ) -> requests.Response:
+        """
+        Base OMF request function. Requests are retried according to the RetryPolicy. When MaxPayloadSize is set the
+        messages may be sent as several requests, each one retried on its own, and the first unsuccessful response
+        (or else the last response) is returned.
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param omf_message: OMF message
+        :return: Http response
+        """
+
+        if type(omf_message) is not list:
+            raise TypeError('Omf messages must be a list')
+
+        with StageTimings.record(message_type, action, self.StageTimingCallback):
+            return await self.__omfRequest(message_type, action, omf_message)
+
+    async def __omfRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ) -> requests.Response:
+        self.Metrics.recordMessages(
+            message_type, action, len(omf_message), self.countValues(omf_message)
+        )
+
+        # Serialization and compression are cpu bound, keep them off the event loop
+        loop = asyncio.get_running_loop()
+        compressed_bodies = await loop.run_in_executor(
+            None, contextvars.copy_context().run, self._createBodies, omf_message
+        )
+        if self.StoreAndForward is not None:
+            return await loop.run_in_executor(
+                None, self._storeBodies, message_type, action, compressed_bodies
+            )
+
+        for compressed_body in compressed_bodies:
+            response = await self.__run(message_type, action, compressed_body)
+            if response.status_code < 200 or response.status_code >= 300:
+                return response
+
+        return response
+
+    async def __run(
+        self, message_type: OMFMessageType, action: OMFMessageAction, body: bytes
+    ) -> requests.Response:
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            if attempts:
+                self.Metrics.recordRetry(message_type, action)
+            attempts += 1
+            return await self.__omfBodyRequest(message_type, action, body)
+
+        return await self.RetryPolicy.runAsync(attempt)
+
+    async def __omfBodyRequest(
+        self, message_type: OMFMessageType, action: OMFMessageAction, body: bytes
+    ) -> requests.Response:
+        with StageTimings.measure('headers'):
+            headers = self.getHeaders(message_type, action)
+        if not CompressionPolicy.isCompressed(body):
+            headers.pop('compression', None)
+        self.Metrics.recordBody(
+            message_type, action, CompressionPolicy.uncompressedSize(body), len(body)
+        )
+
+        start = time.perf_counter()
+        try:
+            with StageTimings.measure('network'):
+                response = await self.request(
+                    'POST',
+                    self.OMFEndpoint,
+                    headers=headers,
+                    data=body,
+                    timeout=600,
+                )
+        except Exception:
+            self.Metrics.recordRequest(
+                message_type, action, time.perf_counter() - start
+            )
+            raise
+
+        self.Metrics.recordRequest(
+            message_type, action, time.perf_counter() - start, response.status_code
+        )
+        return response
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params=None,
+        data=None,
+        headers=None,
+        additional_headers=None,
+        timeout: float = 600,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Executes a request and reads the full response. The result is returned as a requests.Response so that it can be verified like any other OMFClient response.
+        :return: Http response
+        """
+        if not self.VerifySSL:
+            print(
+                'You are not verifying the certificate of the end point. This is not advised for any system as there are security issues with doing this.'
+            )
+
+            if self.LoggingEnabled:
+                logging.warning(
+                    f'You are not verifying the certificate of the end point. This is not advised for any system as there are security issues with doing this.'
+                )
+
+        if not headers:
+            headers = {}
+
+        if additional_headers:
+            headers.update(additional_headers)
+
+        if self.LoggingEnabled:
+            logging.info(f'executing request - method: {method}, url: {url}')
+            logging.debug(f'data: {data}')
+            for header, value in headers.items():
+                if header.lower() != "authorization":
+                    logging.debug(f'{header}: {value}')
+                else:
+                    logging.debug(f'{header}: <redacted>')
+
+        start = time.perf_counter()
+        # Transport errors are raised as their requests equivalent so that the RetryPolicy handles both clients alike
+        try:
+            async with self.ClientSession.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=headers,
+                ssl=self.VerifySSL,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                **kwargs,
+            ) as client_response:
+                content = await client_response.read()
+
+                response = requests.Response()
+                response.status_code = client_response.status
+                response.reason = client_response.reason
+                response.url = str(client_response.url)
+                response.headers = CaseInsensitiveDict(client_response.headers)
+                response._content = content
+                response._content_consumed = True
+                response.elapsed = timedelta(seconds=time.perf_counter() - start)
+                return response
+        except asyncio.TimeoutError as error:
+            raise requests.exceptions.Timeout(str(error)) from error
+        except aiohttp.ClientConnectionError as error:
+            raise requests.exceptions.ConnectionError(str(error)) from error
+
+    def _syncRequest(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executes a request on the synchronous session, since request is a coroutine function and the stored bodies are
+        sent from the store and forward queue's thread
+        :param method: Http method
+        :param url: Url
+        :return: Http response
+        """
+        return OMFClient.request(self, method, url, **kwargs)
+
+    async def retryWithBackoff(self, fn, *args, **kwargs) -> requests.Response:
+        """
+        Awaits a request coroutine function and retries it according to the RetryPolicy, waiting with asyncio.sleep.
+        omfRequest already retries its requests, so this is only needed for other requests.
+        :param fn: Coroutine function sending the request
+        :return: Http response
+        """
+        return await self.RetryPolicy.runAsync(fn, *args, **kwargs)
@@ -3,7 +3,9 @@ from __future__ import annotations
 import base64
 import hashlib
 import json
+import logging
 import secrets
+import threading
 import time
 import webbrowser
 from http.server import BaseHTTPRequestHandler, HTTPServer
@@ -13,16 +15,48 @@ import requests
 
 from .OMFError import OMFError
 
+# Discovery documents rarely change, so they are only fetched again after this many seconds
+DISCOVERY_MAX_AGE = 24 * 60 * 60
+
+# Seconds to wait before trying again when a background token refresh fails
+REFRESH_RETRY_INTERVAL = 30
+
 
 class Authentication(object):
-    def __init__(self, tenant: str, url: str, client_id: str, client_secret: str):
+    # OpenID discovery documents by url, shared by every Authentication object
+    __discovery_documents = {}
+    __discovery_lock = threading.Lock()
+
+    def __init__(
+        self,
+        tenant: str,
+        url: str,
+        client_id: str,
+        client_secret: str,
+        background_refresh: bool = True,
+        refresh_margin: float = 10 * 60,
+    ):
+        """
+        :param tenant: Tenant id
+        :param url: Base url of the identity server
+        :param client_id: Client id
+        :param client_secret: Client secret, None to log in interactively with PKCE
+        :param background_refresh: Whether client credential tokens are refreshed on a background thread before they
+            expire, so that requests never wait for the token endpoint
+        :param refresh_margin: Number of seconds before expiration at which the token is refreshed in the background
+        """
         self.__tenant = tenant
         self.__client_id = client_id
         self.__client_secret = client_secret
         self.__url = url
+        self.__background_refresh = background_refresh and client_secret is not None
+        self.__refresh_margin = refresh_margin
 
         self.__expiration = 0
         self.__token = ''
+        self.__lock = threading.Lock()
+        self.__timer = None
+        self.__closed = False
         if client_secret is not None:
             self.__getToken = self.__getClientIDSecretToken
         else:
@@ -32,15 +66,79 @@ class Authentication(object):
         if (self.__expiration - time.time()) > 5 * 60:
             return self.__token
 
-        return self.__getToken()
+        with self.__lock:
+            # Another thread may have refreshed the token while this one was waiting for the lock
+            if (self.__expiration - time.time()) > 5 * 60:
+                return self.__token
+
+            return self.__refresh()
+
+    def close(self):
+        """
+        Stops refreshing the token in the background
+        """
+        with self.__lock:
+            self.__closed = True
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+
+    def getDiscoveryDocument(self) -> dict:
+        """
+        Gets the OpenID discovery document of the identity server, fetching it at most once a day
+        :return: Discovery document
+        """
+        url = self.__url + '/identity/.well-known/openid-configuration'
+        with Authentication.__discovery_lock:
+            document, fetched = Authentication.__discovery_documents.get(url, (None, 0))
+        if document is not None and time.time() - fetched <= DISCOVERY_MAX_AGE:
+            return document
+
+        # Fetched outside the lock so that a slow identity server does not block the other ones
+        document = json.loads(requests.get(url).content)
+        with Authentication.__discovery_lock:
+            Authentication.__discovery_documents[url] = (document, time.time())
+        return document
+
+    def __refresh(self) -> str:
+        # Must be called while holding the lock
+        token = self.__getToken()
+        self.__scheduleRefresh()
+        return token
+
+    def __scheduleRefresh(self, delay: float = None):
+        if not self.__background_refresh or self.__closed:
+            return
+
+        if delay is None:
+            # Tokens that live shorter than the margin are refreshed halfway through their lifetime
+            remaining = self.__expiration - time.time()
+            if remaining > self.__refresh_margin:
+                delay = remaining - self.__refresh_margin
+            else:
+                delay = max(remaining / 2, 0)
+
+        if self.__timer is not None:
+            self.__timer.cancel()
+        self.__timer = threading.Timer(delay, self.__backgroundRefresh)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def __backgroundRefresh(self):
+        with self.__lock:
+            if self.__closed:
+                return
+
+            try:
+                self.__refresh()
+            except Exception as error:
+                # The current token is still valid, getToken refreshes it synchronously if it gets close to expiring
+                logging.warning(f'Failed to refresh token in the background: {error}')
+                self.__scheduleRefresh(REFRESH_RETRY_INTERVAL)
 
     def __getClientIDSecretToken(self) -> str:
         # Get OAuth endpoint configuration
-        endpoint = json.loads(
-            requests.get(
-                self.__url + '/identity/.well-known/openid-configuration'
-            ).content
-        )
+        endpoint = self.getDiscoveryDocument()
         token_endpoint = endpoint.get('token_endpoint')
 
         tokenInformation = requests.post(
@@ -77,11 +175,7 @@ class Authentication(object):
 
             # Get OAuth endpoint configuration
             print('Step 1: Get OAuth endpoint configuration...')
-            endpoint = json.loads(
-                requests.get(
-                    self.__url + '/identity/.well-known/openid-configuration'
-                ).content
-            )
+            endpoint = self.getDiscoveryDocument()
             auth_endpoint = endpoint.get('authorization_endpoint')
             token_endpoint = endpoint.get('token_endpoint')
 
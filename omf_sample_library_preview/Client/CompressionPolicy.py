@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import contextvars
+import gzip
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Iterator
+
+from .StageTimings import StageTimings
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class CompressionPolicy(object):
+    """
+    Controls how OMF request bodies are compressed and keeps statistics on the bytes before and after compression
+    """
+
+    def __init__(
+        self,
+        level: int = 9,
+        min_size: int = 0,
+        executor: str = None,
+        max_workers: int = 2,
+    ):
+        """
+        :param level: Gzip compression level, from 1 (fastest) to 9 (smallest)
+        :param min_size: Bodies smaller than this many bytes are sent uncompressed
+        :param executor: None to serialize and compress on the calling thread, or 'thread' to prepare the next body on
+            a worker thread while the previous one is sent. Only requests sent as several bodies, when a maximum
+            payload size is set, have a next body to prepare, a single body is always prepared on the calling thread.
+        :param max_workers: Number of worker threads used by the executor
+        """
+        if level < 0 or level > 9:
+            raise ValueError('Compression level must be between 0 and 9')
+        if executor == 'process':
+            # gzip releases the GIL, so a process pool would only add the cost of pickling the bodies
+            raise ValueError(
+                'Executor \'process\' is not supported, gzip already runs in parallel on a worker thread. '
+                'Use a ShardSerializer to serialize large message lists in worker processes.'
+            )
+        if executor not in (None, 'thread'):
+            raise ValueError('Executor must be None or \'thread\'')
+
+        self.__level = level
+        self.__min_size = min_size
+        self.__executor = executor
+        self.__max_workers = max_workers
+        self.__thread_pool = None
+        self.__lock = threading.Lock()
+        self.__bytes_before = 0
+        self.__bytes_after = 0
+        self.__compressed_bodies = 0
+        self.__uncompressed_bodies = 0
+
+    @property
+    def Level(self) -> int:
+        """
+        Gets the gzip compression level
+        :return:
+        """
+        return self.__level
+
+    @property
+    def MinSize(self) -> int:
+        """
+        Gets the size in bytes below which bodies are sent uncompressed
+        :return:
+        """
+        return self.__min_size
+
+    @property
+    def Executor(self) -> str | None:
+        """
+        Gets where the next body of a batched request is prepared: None or 'thread'
+        :return:
+        """
+        return self.__executor
+
+    @property
+    def BytesBeforeCompression(self) -> int:
+        """
+        Gets the total size of the request bodies before compression
+        :return:
+        """
+        return self.__bytes_before
+
+    @property
+    def BytesAfterCompression(self) -> int:
+        """
+        Gets the total size of the request bodies as sent, compressed or not
+        :return:
+        """
+        return self.__bytes_after
+
+    @property
+    def CompressedBodies(self) -> int:
+        """
+        Gets the number of bodies that were compressed
+        :return:
+        """
+        return self.__compressed_bodies
+
+    @property
+    def UncompressedBodies(self) -> int:
+        """
+        Gets the number of bodies sent uncompressed because they were below the minimum size
+        :return:
+        """
+        return self.__uncompressed_bodies
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Gets a snapshot of the compression statistics
+        :return: Dictionary of statistics
+        """
+        with self.__lock:
+            return {
+                'bytes_before_compression': self.__bytes_before,
+                'bytes_after_compression': self.__bytes_after,
+                'compressed_bodies': self.__compressed_bodies,
+                'uncompressed_bodies': self.__uncompressed_bodies,
+                'compression_ratio': (
+                    self.__bytes_after / self.__bytes_before
+                    if self.__bytes_before
+                    else 1.0
+                ),
+            }
+
+    def resetStats(self):
+        """
+        Resets the compression statistics
+        """
+        with self.__lock:
+            self.__bytes_before = 0
+            self.__bytes_after = 0
+            self.__compressed_bodies = 0
+            self.__uncompressed_bodies = 0
+
+    def record(self, size_before: int, size_after: int, compressed: bool = True):
+        """
+        Adds a sent body to the compression statistics
+        :param size_before: Size of the body before compression
+        :param size_after: Size of the body as sent
+        :param compressed: Whether the body was compressed
+        """
+        with self.__lock:
+            self.__bytes_before += size_before
+            self.__bytes_after += size_after
+            if compressed:
+                self.__compressed_bodies += 1
+            else:
+                self.__uncompressed_bodies += 1
+
+    def compress(self, body: bytes, record: bool = True) -> bytes:
+        """
+        Compresses a request body, unless it is smaller than the minimum size
+        :param body: Uncompressed request body
+        :param record: Whether to add the body to the compression statistics
+        :return: Request body to send
+        """
+        with StageTimings.measure('compress'):
+            if len(body) < self.__min_size:
+                result = body
+            else:
+                result = gzip.compress(body, self.__level)
+
+        if record:
+            self.record(len(body), len(result), result is not body)
+        return result
+
+    def prefetch(self, bodies: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Prepares the next body on a worker thread while the caller sends the current one, when the executor is 'thread'
+        :param bodies: Iterator that serializes and compresses request bodies
+        :return: Iterator of the same bodies
+        """
+        if self.__executor is None:
+            yield from bodies
+            return
+
+        # The worker runs in the caller's context so that its stages are timed with the request
+        executor = self.__getThreadPool()
+        context = contextvars.copy_context()
+        future = executor.submit(context.run, next, bodies, None)
+        while True:
+            body = future.result()
+            if body is None:
+                return
+            future = executor.submit(context.run, next, bodies, None)
+            yield body
+
+    def close(self):
+        """
+        Shuts down the worker threads. They are recreated if the policy is used again.
+        """
+        with self.__lock:
+            thread_pool, self.__thread_pool = self.__thread_pool, None
+
+        if thread_pool is not None:
+            thread_pool.shutdown()
+
+    @staticmethod
+    def isCompressed(body: bytes) -> bool:
+        """
+        Gets whether a request body is gzip compressed
+        :param body: Request body
+        :return:
+        """
+        return body[:2] == GZIP_MAGIC
+
+    @staticmethod
+    def uncompressedSize(body: bytes) -> int:
+        """
+        Gets the size of a request body before compression. The size of a gzip body is read from its trailer, which
+        holds it modulo 2**32, so the body does not need to be decompressed.
+        :param body: Request body
+        :return: Size in bytes
+        """
+        if not CompressionPolicy.isCompressed(body):
+            return len(body)
+        return int.from_bytes(body[-4:], 'little')
+
+    def __getThreadPool(self) -> Executor:
+        with self.__lock:
+            if self.__thread_pool is None:
+                self.__thread_pool = ThreadPoolExecutor(
+                    self.__max_workers, thread_name_prefix='OMFCompression'
+                )
+            return self.__thread_pool
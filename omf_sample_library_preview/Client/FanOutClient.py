@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import requests
+
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFLinkData import OMFLinkData
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from ..Models.OMFType import OMFType
+from .CompressionPolicy import CompressionPolicy
+from .OMFClient import OMFClient
+from .OMFError import OMFError
+from .PayloadBatcher import PayloadBatcher
+from .StageTimings import StageTimings
+from .StoreAndForwardQueue import StoreAndForwardQueue
+
+
+class FanOutClient(object):
+    """
+    Sends the same OMF messages to several endpoints, for example an EDS, a PI Web API and an ADH client. Messages are
+    serialized once and compressed once for every CompressionPolicy level and minimum size used by the clients, and
+    the bodies are put in one in-memory StoreAndForwardQueue per endpoint, which sends them in order from its own
+    thread with its own backoff, through the client so that its authentication applies. A slow or unavailable
+    endpoint only fills its own queue, whose drop policy applies once it reaches its quota, and does not hold up the
+    others.
+    Can be used in place of an OMFClient by the synchronous services.
+    """
+
+    def __init__(
+        self,
+        clients: list[OMFClient],
+        max_queue_bytes: int = 64 * 1024**2,
+        drop_policy: str = 'oldest',
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+    ):
+        """
+        :param clients: Clients of the endpoints, whose CompressionPolicy compresses their bodies and collects their
+            statistics, and which create the headers and send the bodies
+        :param max_queue_bytes: Maximum total size in bytes of the bodies waiting to be sent to each endpoint
+        :param drop_policy: What to do with a body that does not fit in the queue of an endpoint: 'oldest' drops queued
+            bodies until it fits, 'newest' drops the new body, and 'error' raises an OMFError once the body has been
+            queued for the other endpoints
+        :param retry_interval: Seconds to wait before resending to an endpoint after its first failed attempt
+        :param max_retry_interval: Maximum number of seconds between attempts while an endpoint is unavailable
+        """
+        if not clients:
+            raise ValueError('At least one client is required')
+
+        self.__clients = list(clients)
+        self.__max_payload_size = None
+        self.__queues = []
+        for client in self.__clients:
+            omf_queue = StoreAndForwardQueue(
+                ':memory:',
+                max_queue_bytes,
+                drop_policy,
+                retry_interval,
+                max_retry_interval,
+            )
+            omf_queue.start(client._sendStoredBody)
+            self.__queues.append(omf_queue)
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def Clients(self) -> list[OMFClient]:
+        """
+        Gets the clients of the endpoints
+        :return:
+        """
+        return list(self.__clients)
+
+    @property
+    def Queues(self) -> list[StoreAndForwardQueue]:
+        """
+        Gets the queue of each endpoint, in the order of the clients, whose Pending and Dropped properties show how
+        far behind each endpoint is
+        :return:
+        """
+        return list(self.__queues)
+
+    @property
+    def MaxPayloadSize(self) -> int | None:
+        """
+        Gets the target maximum compressed size of a request body in bytes. When set, messages are split into several
+        bodies that each fit under this size. None (the default) sends each request as one body.
+        :return:
+        """
+        return self.__max_payload_size
+
+    @MaxPayloadSize.setter
+    def MaxPayloadSize(self, value: int | None):
+        if value is not None and value < 0:
+            raise ValueError('Maximum payload size must be greater than zero')
+        self.__max_payload_size = value if value else None
+
+    @property
+    def Closed(self) -> bool:
+        """
+        Gets whether the client has been closed
+        :return:
+        """
+        return self.__closed
+
+    def verifySuccessfulResponse(
+        self, response, main_message: str, throw_on_bad: bool = True
+    ):
+        """
+        Verifies that a response was successful and optionally throws an exception on a bad response. Responses of
+        omfRequest are always successful, since the bodies are sent later.
+        :param response: Http response
+        :param main_message: Message to print in addition to response information
+        :param throw_on_bad: Optional parameter to throw an exception on a bad response
+        """
+        self.__clients[0].verifySuccessfulResponse(response, main_message, throw_on_bad)
+
+    def omfRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ) -> requests.Response:
+        """
+        Serializes and compresses OMF messages once per compression setting and queues the bodies for every endpoint
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param omf_message: OMF message
+        :return: Http response accepting the bodies
+        """
+        if type(omf_message) is not list:
+            raise TypeError('Omf messages must be a list')
+        if self.__closed:
+            raise OMFError('The fan-out client has been closed')
+
+        values = OMFClient.countValues(omf_message)
+        for client in self.__clients:
+            client.Metrics.recordMessages(
+                message_type, action, len(omf_message), values
+            )
+
+        with StageTimings.record(message_type, action):
+            bodies = self.__createBodies(omf_message)
+
+        # Every endpoint gets the bodies even when the queue of another one refuses them
+        errors = []
+        for client, omf_queue in zip(self.__clients, self.__queues):
+            compression_policy = client.CompressionPolicy
+            try:
+                for body in bodies[self.__settings(compression_policy)]:
+                    omf_queue.put(message_type, action, body)
+                    compression_policy.record(
+                        CompressionPolicy.uncompressedSize(body),
+                        len(body),
+                        CompressionPolicy.isCompressed(body),
+                    )
+            except OMFError as error:
+                errors.append(f'{client.Url}: {error}')
+        if errors:
+            raise OMFError(f'Failed to queue bodies. {"; ".join(errors)}')
+
+        response = requests.Response()
+        response.status_code = 202
+        response.reason = 'Accepted'
+        response._content = b''
+        return response
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until the queued bodies have been sent to every endpoint
+        :param timeout: Maximum number of seconds to wait
+        :return: Whether every queue is empty
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = True
+        for omf_queue in self.__queues:
+            remaining = (
+                None if deadline is None else max(0, deadline - time.monotonic())
+            )
+            flushed = omf_queue.flush(remaining) and flushed
+        return flushed
+
+    def close(self, timeout: float = 10.0):
+        """
+        Waits for the queued bodies to be sent and stops the queues. Bodies still queued when the timeout expires, for
+        example those of an unavailable endpoint, are dropped. The clients are not closed.
+        :param timeout: Maximum number of seconds to wait for the bodies to be sent
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        if not self.flush(timeout):
+            for client, omf_queue in zip(self.__clients, self.__queues):
+                if omf_queue.Pending:
+                    logging.warning(
+                        f'Dropping {omf_queue.Pending} bodies not sent to {client.Url}'
+                    )
+        for omf_queue in self.__queues:
+            omf_queue.close()
+
+    def __createBodies(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> dict[tuple[int, int], list[bytes]]:
+        # Clients whose policies have the same level and minimum size share their bodies, the statistics are recorded
+        # in the policy of each client once its bodies are queued
+        settings = {
+            self.__settings(client.CompressionPolicy) for client in self.__clients
+        }
+        if self.__max_payload_size is not None:
+            return {
+                (level, min_size): PayloadBatcher(
+                    self.__max_payload_size, CompressionPolicy(level, min_size)
+                ).batch(omf_message)
+                for level, min_size in settings
+            }
+
+        with StageTimings.measure('serialize'):
+            body = PayloadBatcher.join([obj.toJson() for obj in omf_message])
+        return {
+            (level, min_size): [
+                CompressionPolicy(level, min_size).compress(body, record=False)
+            ]
+            for level, min_size in settings
+        }
+
+    @staticmethod
+    def __settings(compression_policy: CompressionPolicy) -> tuple[int, int]:
+        return compression_policy.Level, compression_policy.MinSize
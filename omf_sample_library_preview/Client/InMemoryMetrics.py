@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import bisect
+import threading
+
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from .OMFMetrics import OMFMetrics
+
+# Upper bounds in seconds of the request latency histogram buckets, an overflow bucket is added after the last one
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+COUNTERS = (
+    'messages',
+    'values',
+    'raw_bytes',
+    'compressed_bytes',
+    'requests',
+    'retries',
+    'throttles',
+    'errors',
+)
+
+# Current values set by an AdaptiveBatcher, rather than totals
+GAUGES = ('batch_messages', 'batch_values', 'values_per_second')
+
+
+class InMemoryMetrics(OMFMetrics):
+    """
+    Keeps counters, a request latency histogram and the request size targets of an AdaptiveBatcher for every OMF
+    message type and action in memory. Throttles are 429 responses, and errors are responses outside of the 200s and
+    requests that failed without a response.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        :param buckets: Increasing upper bounds in seconds of the request latency histogram buckets
+        """
+        if list(buckets) != sorted(buckets):
+            raise ValueError('Histogram buckets must be increasing')
+
+        self.__buckets = tuple(buckets)
+        self.__lock = threading.Lock()
+        self.__series = {}
+
+    @property
+    def Buckets(self) -> tuple[float, ...]:
+        """
+        Gets the upper bounds in seconds of the request latency histogram buckets
+        :return:
+        """
+        return self.__buckets
+
+    def recordMessages(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        messages: int,
+        values: int,
+    ):
+        with self.__lock:
+            series = self.__getSeries(message_type, action)
+            series['messages'] += messages
+            series['values'] += values
+
+    def recordBody(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        raw_bytes: int,
+        compressed_bytes: int,
+    ):
+        with self.__lock:
+            series = self.__getSeries(message_type, action)
+            series['raw_bytes'] += raw_bytes
+            series['compressed_bytes'] += compressed_bytes
+
+    def recordRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        seconds: float,
+        status_code: int = None,
+    ):
+        bucket = bisect.bisect_left(self.__buckets, seconds)
+        with self.__lock:
+            series = self.__getSeries(message_type, action)
+            series['requests'] += 1
+            series['latency_seconds']['sum'] += seconds
+            series['latency_seconds']['buckets'][bucket] += 1
+            status = 'none' if status_code is None else str(status_code)
+            series['status_codes'][status] = series['status_codes'].get(status, 0) + 1
+            if status_code == 429:
+                series['throttles'] += 1
+            if status_code is None or status_code < 200 or status_code >= 300:
+                series['errors'] += 1
+
+    def recordRetry(self, message_type: OMFMessageType, action: OMFMessageAction):
+        with self.__lock:
+            self.__getSeries(message_type, action)['retries'] += 1
+
+    def recordBatchSize(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        messages: int,
+        values: int,
+        values_per_second: float,
+    ):
+        with self.__lock:
+            series = self.__getSeries(message_type, action)
+            series['batch_messages'] = messages
+            series['batch_values'] = values
+            series['values_per_second'] = values_per_second
+
+    def snapshot(self) -> dict[str, dict[str, dict]]:
+        """
+        Gets a copy of the metrics, by message type then by action. Histogram bucket counts are not cumulative, and
+        the last count is for requests slower than the last bucket.
+        :return: Dictionary of metrics
+        """
+        with self.__lock:
+            result = {}
+            for (message_type, action), series in self.__series.items():
+                copy = dict(series)
+                copy['status_codes'] = dict(series['status_codes'])
+                copy['latency_seconds'] = {
+                    'sum': series['latency_seconds']['sum'],
+                    'buckets': list(series['latency_seconds']['buckets']),
+                }
+                result.setdefault(message_type, {})[action] = copy
+            return result
+
+    def total(self, counter: str) -> int:
+        """
+        Gets the sum of a counter over every message type and action
+        :param counter: Name of the counter, one of messages, values, raw_bytes, compressed_bytes, requests, retries,
+            throttles or errors
+        :return:
+        """
+        if counter not in COUNTERS:
+            raise ValueError(f'Unknown counter {counter}')
+
+        with self.__lock:
+            return sum(series[counter] for series in self.__series.values())
+
+    def reset(self):
+        """
+        Clears every metric
+        """
+        with self.__lock:
+            self.__series.clear()
+
+    def __getSeries(
+        self, message_type: OMFMessageType, action: OMFMessageAction
+    ) -> dict:
+        # Must be called while holding the lock
+        key = (message_type.value, action.value)
+        series = self.__series.get(key)
+        if series is None:
+            series = dict.fromkeys(COUNTERS + GAUGES, 0)
+            series['status_codes'] = {}
+            series['latency_seconds'] = {
+                'sum': 0.0,
+                'buckets': [0] * (len(self.__buckets) + 1),
+            }
+            self.__series[key] = series
+        return series
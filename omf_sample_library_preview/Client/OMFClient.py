@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import gzip
-import json
 import logging
+import threading
 import time
+from typing import Callable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..Models.OMFContainer import OMFContainer
 from ..Models.OMFData import OMFData
@@ -13,7 +14,15 @@ from ..Models.OMFLinkData import OMFLinkData
 from ..Models.OMFMessageAction import OMFMessageAction
 from ..Models.OMFMessageType import OMFMessageType
 from ..Models.OMFType import OMFType
+from .CompressionPolicy import CompressionPolicy
 from .OMFError import OMFError
+from .OMFMetrics import OMFMetrics
+from .PayloadBatcher import PayloadBatcher
+from .RetryPolicy import RetryPolicy
+from .ShardSerializer import ShardSerializer
+from .StageTimings import StageTimings
+from .StoreAndForwardQueue import StoreAndForwardQueue
+from .StreamingEncoder import StreamingEncoder
 
 
 class OMFClient(object):
@@ -26,14 +35,53 @@ class OMFClient(object):
         verify_ssl: bool = True,
         logging_enabled: bool = False,
         max_retries: int = 10,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
     ):
         self.__url = url
         self.__omf_version = omf_version
         self.__verify_ssl = verify_ssl
         self.__logging_enabled = logging_enabled
         self.__omf_endpoint = f'{url}/omf'
-        self.__session = requests.Session()
-        self.__max_retries = max_retries
+        self.__retry_policy = RetryPolicy(max_retries)
+        self.__pool_connections = pool_connections
+        self.__pool_maxsize = pool_maxsize
+        self.__keep_alive = keep_alive
+        self.__compression_policy = CompressionPolicy()
+        self.__batcher = None
+        self.__streaming_encoder = None
+        self.__store_and_forward = None
+        self.__shard_serializer = None
+        self.__metrics = OMFMetrics()
+        self.__stage_timing_callback = None
+        self.__session = None
+        self.__session_lock = threading.Lock()
+        self.__closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the pooled http session and all of its connections. Requests made after the client is closed raise an OMFError.
+        """
+        # Stop sending stored bodies before the session they are sent with goes away
+        if self.__store_and_forward is not None:
+            self.__store_and_forward.close()
+
+        with self.__session_lock:
+            self.__closed = True
+            if self.__session is not None:
+                self.__session.close()
+                self.__session = None
+
+        self.__compression_policy.close()
+        if self.__shard_serializer is not None:
+            self.__shard_serializer.close()
 
     @property
     def Url(self) -> str:
@@ -65,23 +113,207 @@ class OMFClient(object):
         Whether logging is enabled (default False)
         :return:
         """
-        return self.LoggingEnabled
+        return self.__logging_enabled
 
     @LoggingEnabled.setter
-    def logging_enabled(self, value: bool):
-        self.LoggingEnabled = value
+    def LoggingEnabled(self, value: bool):
+        self.__logging_enabled = value
 
     @property
-    def MaxRetries(self) -> str:
+    def MaxRetries(self) -> int:
         """
         Gets the maximum number of retries used by default
         :return:
         """
-        return self.__max_retries
+        return self.__retry_policy.MaxRetries
 
     @MaxRetries.setter
     def MaxRetries(self, value: int):
-        self.__max_retries = value
+        self.__retry_policy.MaxRetries = value
+
+    @property
+    def RetryPolicy(self) -> RetryPolicy:
+        """
+        Gets the policy that decides whether and when failed requests are retried. The policy keeps a retry budget
+        shared by every request of this client, and can be shared between clients.
+        :return:
+        """
+        return self.__retry_policy
+
+    @RetryPolicy.setter
+    def RetryPolicy(self, value: RetryPolicy):
+        self.__retry_policy = value
+
+    @property
+    def Metrics(self) -> OMFMetrics:
+        """
+        Gets the hook receiving the latency of every request attempt and counts of the messages, values, bytes and
+        retries sent, by message type and action. Set it to an InMemoryMetrics to collect them.
+        :return:
+        """
+        return self.__metrics
+
+    @Metrics.setter
+    def Metrics(self, value: OMFMetrics | None):
+        self.__metrics = value if value is not None else OMFMetrics()
+
+    @property
+    def StageTimingCallback(self) -> Callable[[StageTimings], None] | None:
+        """
+        Gets the function called with the StageTimings of every omfRequest, breaking down the time spent serializing,
+        encoding, compressing, creating headers, on the network and waiting between retries. None to turn it off.
+        :return:
+        """
+        return self.__stage_timing_callback
+
+    @StageTimingCallback.setter
+    def StageTimingCallback(self, value: Callable[[StageTimings], None] | None):
+        self.__stage_timing_callback = value
+
+    @property
+    def CompressionPolicy(self) -> CompressionPolicy:
+        """
+        Gets the policy that controls the gzip level, the minimum size of compressed bodies, whether the next body of a
+        batched request is prepared while the previous one is sent, and that collects the bytes before and after
+        compression
+        :return:
+        """
+        return self.__compression_policy
+
+    @CompressionPolicy.setter
+    def CompressionPolicy(self, value: CompressionPolicy):
+        max_payload_size = self.MaxPayloadSize
+        streaming_chunk_size = self.StreamingChunkSize
+        # The worker threads of the replaced policy are recreated if it is still used elsewhere
+        if value is not self.__compression_policy:
+            self.__compression_policy.close()
+        self.__compression_policy = value
+        self.MaxPayloadSize = max_payload_size
+        self.StreamingChunkSize = streaming_chunk_size
+
+    @property
+    def MaxPayloadSize(self) -> int | None:
+        """
+        Gets the target maximum compressed size of a request body in bytes. When set, omfRequest automatically
+        splits messages into several requests that each fit under this size. None (the default) disables batching.
+        :return:
+        """
+        return self.__batcher.MaxPayloadSize if self.__batcher else None
+
+    @MaxPayloadSize.setter
+    def MaxPayloadSize(self, value: int | None):
+        self.__batcher = (
+            PayloadBatcher(value, self.__compression_policy) if value else None
+        )
+
+    @property
+    def StreamingChunkSize(self) -> int | None:
+        """
+        Gets the chunk size used to stream request bodies. When set, omfRequest compresses messages incrementally
+        and sends the body with chunked transfer encoding instead of building it in memory. Ignored when
+        MaxPayloadSize is set, since batching needs the size of each body. None (the default) disables streaming.
+        :return:
+        """
+        return self.__streaming_encoder.ChunkSize if self.__streaming_encoder else None
+
+    @StreamingChunkSize.setter
+    def StreamingChunkSize(self, value: int | None):
+        self.__streaming_encoder = (
+            StreamingEncoder(value, self.__compression_policy) if value else None
+        )
+
+    @property
+    def StoreAndForward(self) -> StoreAndForwardQueue | None:
+        """
+        Gets the queue that stores request bodies on disk before they are sent. When set, omfRequest stores the
+        compressed bodies and returns a 202 response right away, and the queue sends them in order from a background
+        thread. None (the default) sends every request before returning.
+        :return:
+        """
+        return self.__store_and_forward
+
+    @StoreAndForward.setter
+    def StoreAndForward(self, value: StoreAndForwardQueue | None):
+        if self.__store_and_forward is not None:
+            self.__store_and_forward.close()
+        self.__store_and_forward = value
+        if value is not None:
+            value.start(self._sendStoredBody)
+
+    @property
+    def ShardSerializer(self) -> ShardSerializer | None:
+        """
+        Gets the serializer that shards large message lists across a process pool. When set, omfRequest serializes and
+        compresses message lists with at least its MinValues values in worker processes, one body per shard or per
+        MaxPayloadSize batch within a shard, and sends the bodies in order. None (the default) serializes on the
+        calling thread.
+        :return:
+        """
+        return self.__shard_serializer
+
+    @ShardSerializer.setter
+    def ShardSerializer(self, value: ShardSerializer | None):
+        self.__shard_serializer = value
+
+    @property
+    def PoolConnections(self) -> int:
+        """
+        Gets the number of connection pools (one per host) kept by the session
+        :return:
+        """
+        return self.__pool_connections
+
+    @property
+    def PoolMaxSize(self) -> int:
+        """
+        Gets the maximum number of connections kept open per host
+        :return:
+        """
+        return self.__pool_maxsize
+
+    @property
+    def KeepAlive(self) -> bool:
+        """
+        Gets whether connections are kept alive between requests
+        :return:
+        """
+        return self.__keep_alive
+
+    @property
+    def Closed(self) -> bool:
+        """
+        Gets whether the client has been closed
+        :return:
+        """
+        return self.__closed
+
+    @property
+    def Session(self) -> requests.Session:
+        """
+        Gets the pooled http session, creating it on first use. The session is shared by all threads using this client.
+        :return:
+        """
+        session = self.__session
+        if session is not None:
+            return session
+
+        with self.__session_lock:
+            if self.__closed:
+                raise OMFError('The OMF client has been closed')
+
+            if self.__session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.__pool_connections,
+                    pool_maxsize=self.__pool_maxsize,
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                if not self.__keep_alive:
+                    session.headers['Connection'] = 'close'
+                self.__session = session
+
+            return self.__session
 
     @property
     def OMFEndpoint(self) -> str:
@@ -103,7 +335,7 @@ class OMFClient(object):
 
         if self.__logging_enabled:
             logging.info(
-                f'request executed in {response.elapsed.microseconds / 1000}ms - status code: {response.status_code}'
+                f'request executed in {response.elapsed.total_seconds() * 1000}ms - status code: {response.status_code}'
             )
             logging.debug(
                 f'{main_message}. Response: {response.status_code} {response.text}.'
@@ -149,7 +381,9 @@ class OMFClient(object):
         omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
     ) -> requests.Response:
         """
-        Base OMF request function
+        Base OMF request function. Requests are retried according to the RetryPolicy. When MaxPayloadSize is set the
+        messages may be sent as several requests, each one retried on its own, and the first unsuccessful response
+        (or else the last response) is returned.
         :param message_type: OMF message type
         :param action: OMF action
         :param omf_message: OMF message
@@ -159,21 +393,255 @@ class OMFClient(object):
         if type(omf_message) is not list:
             raise TypeError('Omf messages must be a list')
 
-        omf_message_json = [obj.toDictionary() for obj in omf_message]
-        body = json.dumps(omf_message_json)
-        logging.debug(f"omf body: {body}")
-        compressed_body = gzip.compress(bytes(body, 'utf-8'))
-        headers = self.getHeaders(message_type, action)
-
-        return self.request(
-            'POST',
-            self.OMFEndpoint,
-            headers=headers,
-            data=compressed_body,
-            verify=self.VerifySSL,
-            timeout=600,
+        with StageTimings.record(message_type, action, self.__stage_timing_callback):
+            return self.__omfRequest(message_type, action, omf_message)
+
+    def __omfRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ) -> requests.Response:
+        self.__metrics.recordMessages(
+            message_type, action, len(omf_message), self.countValues(omf_message)
         )
 
+        if self.__store_and_forward is not None:
+            return self._storeBodies(
+                message_type, action, self._createBodies(omf_message)
+            )
+
+        sharded = (
+            self.__shard_serializer is not None
+            and self.__shard_serializer.accepts(omf_message)
+        )
+
+        if sharded:
+            # The serializer keeps the workers busy with the next shards while the current body is sent
+            compressed_bodies = self.__shard_serializer.iterBodies(
+                omf_message, self.__compression_policy, self.MaxPayloadSize
+            )
+        elif self.__streaming_encoder is not None and self.__batcher is None:
+            # A streamed body can only be read once, so it is encoded again for every attempt
+            return self.__run(
+                message_type,
+                action,
+                lambda: self.__omfBodyRequest(
+                    message_type, action, self.__streaming_encoder.encode(omf_message)
+                ),
+            )
+        elif self.__batcher is None:
+            return self.__run(
+                message_type,
+                action,
+                self.__omfBodyRequest,
+                message_type,
+                action,
+                self._createBody(omf_message),
+            )
+        else:
+            # Each batch is retried on its own so that a transient failure does not resend the batches already
+            # accepted, and the next batch can be prepared on a worker while the current one is sent
+            compressed_bodies = self.__compression_policy.prefetch(
+                self.__batcher.iterBatches(omf_message)
+            )
+
+        for compressed_body in compressed_bodies:
+            response = self.__run(
+                message_type,
+                action,
+                self.__omfBodyRequest,
+                message_type,
+                action,
+                compressed_body,
+            )
+            if response.status_code < 200 or response.status_code >= 300:
+                return response
+
+        return response
+
+    def __omfBodyRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        body: bytes | Iterator[bytes],
+    ) -> requests.Response:
+        return self.__sendBody(self.request, message_type, action, body)
+
+    def __sendBody(
+        self,
+        request,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        body: bytes | Iterator[bytes],
+    ) -> requests.Response:
+        with StageTimings.measure('headers'):
+            headers = self.getHeaders(message_type, action)
+        if isinstance(body, bytes):
+            if not CompressionPolicy.isCompressed(body):
+                headers.pop('compression', None)
+            self.__metrics.recordBody(
+                message_type,
+                action,
+                CompressionPolicy.uncompressedSize(body),
+                len(body),
+            )
+        else:
+            body = self.__countChunks(message_type, action, body)
+
+        start = time.perf_counter()
+        try:
+            with StageTimings.measure('network'):
+                response = request(
+                    'POST',
+                    self.OMFEndpoint,
+                    headers=headers,
+                    data=body,
+                    verify=self.VerifySSL,
+                    timeout=600,
+                )
+        except Exception:
+            self.__metrics.recordRequest(
+                message_type, action, time.perf_counter() - start
+            )
+            raise
+
+        self.__metrics.recordRequest(
+            message_type, action, time.perf_counter() - start, response.status_code
+        )
+        return response
+
+    def __countChunks(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        chunks: Iterator[bytes],
+    ) -> Iterator[bytes]:
+        compressed_bytes = 0
+        trailer = b''
+        for chunk in chunks:
+            compressed_bytes += len(chunk)
+            trailer = (trailer + chunk)[-4:]
+            yield chunk
+
+        # Streamed bodies are always gzip compressed, and the gzip trailer ends with the uncompressed size
+        self.__metrics.recordBody(
+            message_type, action, int.from_bytes(trailer, 'little'), compressed_bytes
+        )
+
+    def __run(
+        self, message_type: OMFMessageType, action: OMFMessageAction, fn, *args
+    ) -> requests.Response:
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            if attempts:
+                self.__metrics.recordRetry(message_type, action)
+            attempts += 1
+            return fn(*args)
+
+        return self.__retry_policy.run(attempt)
+
+    def _storeBodies(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        bodies: list[bytes],
+    ) -> requests.Response:
+        """
+        Stores request bodies in the store and forward queue
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param bodies: Request bodies
+        :return: Http response accepting the bodies
+        """
+        for body in bodies:
+            self.__store_and_forward.put(message_type, action, body)
+
+        response = requests.Response()
+        response.status_code = 202
+        response.reason = 'Accepted'
+        response.url = self.OMFEndpoint
+        response._content = b''
+        return response
+
+    def _sendStoredBody(
+        self, message_type: OMFMessageType, action: OMFMessageAction, body: bytes
+    ) -> requests.Response:
+        """
+        Sends a body from the store and forward queue. Headers are created when the body is sent, so that
+        authentication is current. Called from the queue's thread, so the body is sent through _syncRequest.
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param body: Request body
+        :return: Http response
+        """
+        return self.__sendBody(self._syncRequest, message_type, action, body)
+
+    def _syncRequest(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executes a request from a background thread, such as the one of a store and forward queue. Goes through
+        request, so that the authentication added by subclasses applies. Subclasses whose request is not synchronous
+        override it.
+        :param method: Http method
+        :param url: Url
+        :return: Http response
+        """
+        return self.request(method, url, **kwargs)
+
+    @staticmethod
+    def countValues(
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ) -> int:
+        """
+        Counts the data values in a list of OMF messages
+        :param omf_message: OMF message
+        :return: Number of values
+        """
+        return sum(
+            len(message.Values)
+            for message in omf_message
+            if isinstance(message, OMFData) and message.Values is not None
+        )
+
+    def _createBodies(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> list[bytes]:
+        """
+        Serializes and compresses a list of OMF messages into one request body, or into several when a maximum payload
+        size is set or the messages are sharded
+        :param omf_message: OMF message
+        :return: Compressed request bodies
+        """
+        if self.__shard_serializer is not None and self.__shard_serializer.accepts(
+            omf_message
+        ):
+            return list(
+                self.__shard_serializer.iterBodies(
+                    omf_message, self.__compression_policy, self.MaxPayloadSize
+                )
+            )
+
+        if self.__batcher is None:
+            return [self._createBody(omf_message)]
+
+        return self.__batcher.batch(omf_message)
+
+    def _createBody(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> bytes:
+        """
+        Serializes and compresses a list of OMF messages into a request body. The json of every message is joined
+        as is, so messages with their own toJson, such as OMFArrayData, are never turned into dictionaries.
+        :param omf_message: OMF message
+        :return: Compressed request body
+        """
+        with StageTimings.measure('serialize'):
+            body = PayloadBatcher.join([obj.toJson() for obj in omf_message])
+        logging.debug('omf body: %s', body)
+        return self.__compression_policy.compress(body)
+
     def request(
         self,
         method: str,
@@ -215,26 +683,15 @@ class OMFClient(object):
                 else:
                     logging.debug(f'{header}: <redacted>')
 
-        with self.__session as requestSession:
-            return requestSession.request(
-                method, url, params=params, data=data, headers=headers, **kwargs
-                )
+        return self.Session.request(
+            method, url, params=params, data=data, headers=headers, **kwargs
+        )
 
     def retryWithBackoff(self, fn, *args, **kwargs) -> requests.Response:
-        success = False
-        failures = 0
-        while not success:
-            response = fn(*args, **kwargs)
-            if response.status_code == 504 or response.status_code == 503:
-                if failures >= 0 and failures >= self.__max_retries:
-                    logging.error('Server error. No more retries available.')
-                    return response
-                else:
-                    timeout = 3600 if failures >= 12 else 2**failures
-                    logging.warning('Server error. Retrying...')
-                    time.sleep(timeout)
-                    failures += 1
-            else:
-                success = True
-
-        return response
+        """
+        Calls a request function and retries it according to the RetryPolicy. omfRequest already retries its requests,
+        so this is only needed for other requests.
+        :param fn: Function sending the request
+        :return: Http response
+        """
+        return self.__retry_policy.run(fn, *args, **kwargs)
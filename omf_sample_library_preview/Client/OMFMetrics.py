@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+
+
+class OMFMetrics(object):
+    """
+    Receives measurements of the OMF requests made by an OMFClient. This base class ignores them, subclass it to forward
+    them to a monitoring system or use InMemoryMetrics. Methods are called from every thread sending requests, so
+    implementations must be thread safe and fast.
+    """
+
+    def recordMessages(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        messages: int,
+        values: int,
+    ):
+        """
+        Records OMF messages passed to omfRequest
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param messages: Number of OMF messages
+        :param values: Number of data values in the OMF messages
+        """
+
+    def recordBody(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        raw_bytes: int,
+        compressed_bytes: int,
+    ):
+        """
+        Records a request body sent to the OMF endpoint, once per attempt
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param raw_bytes: Size of the body before compression
+        :param compressed_bytes: Size of the body as sent
+        """
+
+    def recordRequest(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        seconds: float,
+        status_code: int = None,
+    ):
+        """
+        Records a completed request attempt
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param seconds: Duration of the request
+        :param status_code: Response status code, None if the request failed without a response
+        """
+
+    def recordRetry(self, message_type: OMFMessageType, action: OMFMessageAction):
+        """
+        Records that a request is sent again after a failed attempt
+        :param message_type: OMF message type
+        :param action: OMF action
+        """
+
+    def recordBatchSize(
+        self,
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        messages: int,
+        values: int,
+        values_per_second: float,
+    ):
+        """
+        Records the current request size targets of an AdaptiveBatcher
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param messages: Target number of OMFData messages per request
+        :param values: Target number of values per request
+        :param values_per_second: Values per second of the last successful request
+        """
@@ -21,11 +21,22 @@ class PIOMFClient(OMFClient):
         password: str,
         omf_version: str = '1.2',
         logging_enabled: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
     ):
         self.__resource = resource
         self.__basic = HTTPBasicAuth(username, password)
 
-        super().__init__(resource, omf_version, True, logging_enabled)
+        super().__init__(
+            resource,
+            omf_version,
+            True,
+            logging_enabled,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+        )
 
     def fromAppsettings(path: str = None):
         if not path:
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+from collections import deque
+from typing import Iterator
+
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFLinkData import OMFLinkData
+from ..Models.OMFType import OMFType
+from ..Models.Serializeable import Serializeable
+from .CompressionPolicy import CompressionPolicy
+from .StageTimings import StageTimings
+
+# Leave some headroom below the limit since the compression ratio of the next batch is only an estimate
+SAFETY_FACTOR = 0.95
+
+
+class PayloadBatcher(object):
+    """
+    Splits a list of OMF messages into compressed request bodies that each fit under a target compressed size.
+    Batches are packed as close to the limit as possible, and OMFData messages with too many values are split into
+    several OMFData messages with the same TypeId and ContainerId.
+    """
+
+    def __init__(
+        self,
+        max_payload_size: int,
+        compression_policy: CompressionPolicy = None,
+    ):
+        """
+        :param max_payload_size: Target maximum size of a compressed request body in bytes
+        :param compression_policy: Policy used to compress the request bodies
+        """
+        if max_payload_size <= 0:
+            raise ValueError('Maximum payload size must be greater than zero')
+
+        self.__max_payload_size = max_payload_size
+        self.__compression_policy = compression_policy or CompressionPolicy()
+
+    @property
+    def MaxPayloadSize(self) -> int:
+        """
+        Gets the target maximum size of a compressed request body in bytes
+        :return:
+        """
+        return self.__max_payload_size
+
+    def batch(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> list[bytes]:
+        """
+        Serializes, batches and compresses a list of OMF messages
+        :param omf_message: OMF message
+        :return: List of compressed request bodies
+        """
+        return list(self.iterBatches(omf_message))
+
+    def iterBatches(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> Iterator[bytes]:
+        """
+        Serializes, batches and compresses a list of OMF messages, one request body at a time
+        :param omf_message: OMF message
+        :return: Iterator of compressed request bodies
+        """
+        with StageTimings.measure('serialize'):
+            pieces = [_Piece.fromMessage(message) for message in omf_message]
+        ratio = self.__estimateRatio(pieces)
+
+        batch = []
+        batch_size = 2
+        queue = deque(pieces)
+        while queue:
+            piece = queue.popleft()
+            size = len(piece.Text) + 2
+            budget = self.__max_payload_size * SAFETY_FACTOR / ratio
+
+            if size + 2 > budget and piece.CanSplit:
+                parts = max(2, math.ceil(size / budget))
+                queue.extendleft(reversed(piece.split(parts)))
+                continue
+
+            if batch and batch_size + size > budget:
+                ratio = yield from self.__emit(batch)
+                batch = []
+                batch_size = 2
+
+            batch.append(piece)
+            batch_size += size
+
+        if batch:
+            yield from self.__emit(batch)
+
+    @staticmethod
+    def join(texts: list[str]) -> bytes:
+        """
+        Joins serialized OMF messages into the body of a single request
+        :param texts: Json strings of the OMF messages
+        :return: Uncompressed request body
+        """
+        return ('[' + ', '.join(texts) + ']').encode('utf-8')
+
+    def __estimateRatio(self, pieces: list[_Piece]) -> float:
+        # Compress a sample of the messages to estimate how well this payload compresses
+        sample = []
+        sample_size = 0
+        for piece in pieces:
+            sample.append(piece.Text)
+            sample_size += len(piece.Text)
+            if sample_size >= self.__max_payload_size:
+                break
+
+        if sample_size == 0:
+            return 1.0
+
+        raw = self.join(sample)
+        compressed = self.__compression_policy.compress(raw, record=False)
+        return max(len(compressed) / len(raw), 0.001)
+
+    def __emit(self, batch: list[_Piece]) -> Iterator[bytes]:
+        """
+        Compresses a batch, splitting it when it is still over the limit, and returns the observed compression ratio
+        """
+        raw = self.join([piece.Text for piece in batch])
+        body = self.__compression_policy.compress(raw, record=False)
+
+        if len(body) > self.__max_payload_size:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                yield from self.__emit(batch[:middle])
+                return (yield from self.__emit(batch[middle:]))
+
+            if batch[0].CanSplit:
+                ratio = None
+                for piece in batch[0].split(2):
+                    ratio = yield from self.__emit([piece])
+                return ratio
+
+            logging.warning(
+                f'OMF message of {len(body)} compressed bytes cannot be split below the maximum payload size of {self.__max_payload_size} bytes'
+            )
+
+        self.__compression_policy.record(len(raw), len(body), body is not raw)
+        yield body
+        return max(len(body) / len(raw), 0.001)
+
+
+class _Piece(object):
+    """
+    A serialized OMF message. OMFData keeps its values serialized one by one so that it can be split without
+    serializing the values again.
+    """
+
+    def __init__(
+        self, text: str, message=None, values: list[str] = None, rest: str = ''
+    ):
+        self.Text = text
+        self.__message = message
+        self.__values = values
+        self.__rest = rest
+
+    @staticmethod
+    def fromMessage(message: OMFType | OMFContainer | OMFData | OMFLinkData) -> _Piece:
+        if not isinstance(message, OMFData):
+            return _Piece(message.toJson())
+
+        if (
+            type(message).toJson is not Serializeable.toJson
+            or type(message).toDictionary is not Serializeable.toDictionary
+        ):
+            # Custom serialization, used as is and split by slicing the message itself
+            return _Piece(message.toJson(), message=message)
+
+        dictionary = message.toDictionary()
+        values = dictionary.pop('Values', None)
+        if not values:
+            return _Piece(json.dumps(dictionary))
+
+        # Values is the first field of OMFData, so this is exactly what json.dumps would produce for the whole message
+        rest = ', ' + json.dumps(dictionary)[1:-1] if dictionary else ''
+        return _Piece.fromValues([json.dumps(value) for value in values], rest)
+
+    @staticmethod
+    def fromValues(values: list[str], rest: str) -> _Piece:
+        return _Piece(
+            '{"Values": [' + ', '.join(values) + ']' + rest + '}',
+            values=values,
+            rest=rest,
+        )
+
+    @property
+    def CanSplit(self) -> bool:
+        if self.__values is not None:
+            return len(self.__values) > 1
+        return self.__message is not None and len(self.__message.Values) > 1
+
+    def split(self, parts: int) -> list[_Piece]:
+        count = (
+            len(self.__values)
+            if self.__values is not None
+            else len(self.__message.Values)
+        )
+        parts = min(parts, count)
+        step = math.ceil(count / parts)
+        if self.__values is not None:
+            return [
+                _Piece.fromValues(self.__values[start : start + step], self.__rest)
+                for start in range(0, count, step)
+            ]
+
+        result = []
+        for start in range(0, count, step):
+            message = self.__message.slice(start, start + step)
+            result.append(_Piece(message.toJson(), message=message))
+        return result
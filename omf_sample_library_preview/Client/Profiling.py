@@ -0,0 +1,80 @@
+"""
+Opt-in profiling of a block of sends. Both context managers write a text report to a file when the block exits, or log
+it at the info level when no path is given. They slow the block down noticeably, so only use them while investigating.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def profileCalls(
+    path: str = None, sort_by: str = 'cumulative', limit: int = 50
+) -> Iterator[cProfile.Profile]:
+    """
+    Profiles the calls made in a block with cProfile
+    :param path: File the report is written to, None to log it
+    :param sort_by: pstats sort key of the report, for example cumulative or tottime
+    :param limit: Number of functions in the report
+    :return: Context manager giving the profiler, whose dump_stats method saves the raw profile
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(sort_by).print_stats(limit)
+        _writeReport(stream.getvalue(), path)
+
+
+@contextmanager
+def traceAllocations(
+    path: str = None, limit: int = 25, key_type: str = 'lineno', frames: int = 1
+) -> Iterator[None]:
+    """
+    Traces the memory allocated in a block with tracemalloc and reports the lines that allocated the most, and the peak
+    memory traced
+    :param path: File the report is written to, None to log it
+    :param limit: Number of allocation sites in the report
+    :param key_type: tracemalloc grouping of the allocations, lineno, filename or traceback
+    :param frames: Number of frames stored for each allocation, when tracemalloc is not already tracing
+    :return: Context manager
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        differences = after.filter_traces(ignore).compare_to(
+            before.filter_traces(ignore), key_type
+        )
+        lines = [f'Peak traced memory: {peak / 1024:.1f} KiB']
+        lines.extend(str(difference) for difference in differences[:limit])
+        _writeReport('\n'.join(lines) + '\n', path)
+
+
+def _writeReport(report: str, path: str = None):
+    if path is None:
+        logging.info(report)
+        return
+
+    with open(path, 'w') as file:
+        file.write(report)
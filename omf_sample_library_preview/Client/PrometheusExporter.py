@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .InMemoryMetrics import InMemoryMetrics
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTER_HELP = {
+    'messages': 'OMF messages sent',
+    'values': 'Data values sent',
+    'raw_bytes': 'Request body bytes before compression',
+    'compressed_bytes': 'Request body bytes sent',
+    'retries': 'Requests sent again after a failed attempt',
+    'throttles': 'Requests throttled with a 429 response',
+    'errors': 'Requests that failed or were answered outside of the 200s',
+}
+
+GAUGE_HELP = {
+    'batch_messages': 'Target OMFData messages per request of the adaptive batcher',
+    'batch_values': 'Target values per request of the adaptive batcher',
+    'values_per_second': 'Values per second of the last request of the adaptive batcher',
+}
+
+
+class PrometheusExporter(object):
+    """
+    Exposes the metrics of an InMemoryMetrics in the Prometheus text format, either as a string or on a /metrics http
+    endpoint that Prometheus can scrape
+    """
+
+    def __init__(self, metrics: InMemoryMetrics, namespace: str = 'omf'):
+        """
+        :param metrics: Metrics to expose
+        :param namespace: Prefix of the metric names
+        """
+        self.__metrics = metrics
+        self.__namespace = namespace
+        self.__server = None
+        self.__thread = None
+
+    @property
+    def Metrics(self) -> InMemoryMetrics:
+        """
+        Gets the metrics exposed
+        :return:
+        """
+        return self.__metrics
+
+    @property
+    def Url(self) -> str | None:
+        """
+        Gets the url of the metrics endpoint, None if it is not started
+        :return:
+        """
+        if self.__server is None:
+            return None
+        host, port = self.__server.server_address[:2]
+        return f'http://{host}:{port}/metrics'
+
+    def render(self) -> str:
+        """
+        Renders the current metrics in the Prometheus text exposition format
+        :return: Metrics text
+        """
+        snapshot = self.__metrics.snapshot()
+        series = [
+            (f'message_type="{message_type}",action="{action}"', values)
+            for message_type, actions in sorted(snapshot.items())
+            for action, values in sorted(actions.items())
+        ]
+
+        lines = []
+        for counter, help in COUNTER_HELP.items():
+            name = f'{self.__namespace}_{counter}_total'
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} counter')
+            for labels, values in series:
+                lines.append(f'{name}{{{labels}}} {values[counter]}')
+
+        for gauge, help in GAUGE_HELP.items():
+            name = f'{self.__namespace}_{gauge}'
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} gauge')
+            for labels, values in series:
+                lines.append(f'{name}{{{labels}}} {values[gauge]}')
+
+        name = f'{self.__namespace}_requests_total'
+        lines.append(f'# HELP {name} Request attempts by response status code')
+        lines.append(f'# TYPE {name} counter')
+        for labels, values in series:
+            for status_code, count in sorted(values['status_codes'].items()):
+                lines.append(f'{name}{{{labels},status_code="{status_code}"}} {count}')
+
+        name = f'{self.__namespace}_request_duration_seconds'
+        lines.append(f'# HELP {name} Duration of the request attempts')
+        lines.append(f'# TYPE {name} histogram')
+        bounds = [f'{bucket:g}' for bucket in self.__metrics.Buckets] + ['+Inf']
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(bounds, values['latency_seconds']['buckets']):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {values["latency_seconds"]["sum"]}')
+            lines.append(f'{name}_count{{{labels}}} {values["requests"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def start(self, host: str = '0.0.0.0', port: int = 9100):
+        """
+        Starts serving the metrics on /metrics from a background thread
+        :param host: Host name or address to listen on
+        :param port: Port to listen on, 0 to pick a free port
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+
+                content = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer((host, port), Handler)
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, name='PrometheusExporter', daemon=True
+        )
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops serving the metrics
+        """
+        if self.__server is None:
+            return
+
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__server = None
+        self.__thread = None
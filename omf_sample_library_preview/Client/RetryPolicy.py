@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable
+
+import requests
+
+from .StageTimings import StageTimings
+
+# Status codes worth retrying: throttling, and gateway or server errors that are usually transient
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Errors raised by requests when no response was received, which are worth retrying
+RETRY_EXCEPTIONS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+
+class RetryPolicy(object):
+    """
+    Decides whether and when a failed OMF request is retried. Delays grow exponentially with full jitter, a Retry-After
+    header sent by the server takes precedence, and a retry budget shared by every request using the policy stops
+    retries when most requests are failing, so that many clients do not overwhelm a recovering server.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 10,
+        base_delay: float = 1.0,
+        max_delay: float = 3600.0,
+        max_elapsed_time: float = None,
+        jitter: bool = True,
+        retry_status_codes: tuple[int, ...] = RETRY_STATUS_CODES,
+        retry_budget: float = 10.0,
+        budget_ratio: float = 0.1,
+    ):
+        """
+        :param max_retries: Maximum number of retries of a single request
+        :param base_delay: Delay in seconds before the first retry, doubled for every retry after it
+        :param max_delay: Maximum delay in seconds between two attempts, also applied to Retry-After
+        :param max_elapsed_time: Maximum number of seconds spent on a request including retries, None for no limit
+        :param jitter: Whether to wait a random delay between zero and the exponential delay (full jitter)
+        :param retry_status_codes: Response status codes that are retried
+        :param retry_budget: Maximum number of retries that can be made in a burst, None to disable the budget
+        :param budget_ratio: Retries added to the budget by every request that did not need a retry
+        """
+        self.__max_retries = max_retries
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+        self.__max_elapsed_time = max_elapsed_time
+        self.__jitter = jitter
+        self.__retry_status_codes = frozenset(retry_status_codes)
+        self.__retry_budget = retry_budget
+        self.__budget_ratio = budget_ratio
+        self.__budget = retry_budget
+        self.__lock = threading.Lock()
+
+    @property
+    def MaxRetries(self) -> int:
+        """
+        Gets the maximum number of retries of a single request
+        :return:
+        """
+        return self.__max_retries
+
+    @MaxRetries.setter
+    def MaxRetries(self, value: int):
+        self.__max_retries = value
+
+    @property
+    def MaxElapsedTime(self) -> float | None:
+        """
+        Gets the maximum number of seconds spent on a request including retries
+        :return:
+        """
+        return self.__max_elapsed_time
+
+    @property
+    def RetryStatusCodes(self) -> frozenset[int]:
+        """
+        Gets the response status codes that are retried
+        :return:
+        """
+        return self.__retry_status_codes
+
+    @property
+    def Budget(self) -> float | None:
+        """
+        Gets the number of retries currently left in the retry budget
+        :return:
+        """
+        return self.__budget
+
+    def run(self, fn: Callable[..., requests.Response], *args, **kwargs) -> Any:
+        """
+        Calls a request function, retrying it while it fails with a retryable status code or transport error
+        :param fn: Function sending the request
+        :return: The last response. The last transport error is raised if no response was received.
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = fn(*args, **kwargs)
+                error = None
+            except RETRY_EXCEPTIONS as exception:
+                error = exception
+
+            delay = self.nextDelay(attempt, start, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+
+            with StageTimings.measure('backoff'):
+                time.sleep(delay)
+            attempt += 1
+
+    async def runAsync(
+        self, fn: Callable[..., Awaitable[requests.Response]], *args, **kwargs
+    ) -> Any:
+        """
+        Awaits a request coroutine function, retrying it while it fails with a retryable status code or transport error
+        :param fn: Coroutine function sending the request
+        :return: The last response. The last transport error is raised if no response was received.
+        """
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await fn(*args, **kwargs)
+                error = None
+            except RETRY_EXCEPTIONS as exception:
+                error = exception
+
+            delay = self.nextDelay(attempt, start, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+
+            with StageTimings.measure('backoff'):
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    def isRetryable(
+        self, response: requests.Response = None, error: Exception = None
+    ) -> bool:
+        """
+        Gets whether a response or transport error should be retried
+        :param response: Http response
+        :param error: Error raised instead of a response
+        :return:
+        """
+        if error is not None:
+            return isinstance(error, RETRY_EXCEPTIONS)
+        return response.status_code in self.__retry_status_codes
+
+    def nextDelay(
+        self,
+        attempt: int,
+        start: float,
+        response: requests.Response = None,
+        error: Exception = None,
+    ) -> float | None:
+        """
+        Gets how long to wait before retrying a request, and takes the retry from the retry budget
+        :param attempt: Number of retries already made
+        :param start: Value of time.monotonic() when the first attempt was made
+        :param response: Http response of the last attempt
+        :param error: Error raised by the last attempt instead of a response
+        :return: Delay in seconds, or None if the request should not be retried
+        """
+        if not self.isRetryable(response, error):
+            self.__deposit()
+            return None
+
+        reason = error if error is not None else f'status code {response.status_code}'
+        if attempt >= self.__max_retries:
+            logging.error(f'Server error ({reason}). No more retries available.')
+            return None
+
+        delay = self.__getRetryAfter(response)
+        if delay is None:
+            delay = min(self.__max_delay, self.__base_delay * 2 ** min(attempt, 62))
+            if self.__jitter:
+                delay = random.uniform(0, delay)
+
+        if (
+            self.__max_elapsed_time is not None
+            and time.monotonic() - start + delay > self.__max_elapsed_time
+        ):
+            logging.error(f'Server error ({reason}). Maximum retry time exceeded.')
+            return None
+
+        if not self.__withdraw():
+            logging.error(f'Server error ({reason}). Retry budget exhausted.')
+            return None
+
+        logging.warning(f'Server error ({reason}). Retrying in {delay:.2f}s...')
+        return delay
+
+    def __getRetryAfter(self, response: requests.Response) -> float | None:
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_time = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if retry_time.tzinfo is None:
+                retry_time = retry_time.replace(tzinfo=timezone.utc)
+            delay = (retry_time - datetime.now(timezone.utc)).total_seconds()
+
+        return min(max(delay, 0), self.__max_delay)
+
+    def __deposit(self):
+        if self.__retry_budget is None:
+            return
+
+        with self.__lock:
+            self.__budget = min(
+                self.__retry_budget, self.__budget + self.__budget_ratio
+            )
+
+    def __withdraw(self) -> bool:
+        if self.__retry_budget is None:
+            return True
+
+        with self.__lock:
+            if self.__budget < 1:
+                return False
+            self.__budget -= 1
+            return True
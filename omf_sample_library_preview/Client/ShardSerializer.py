@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterator
+
+from ..Models.OMFArrayData import OMFArrayData
+from ..Models.OMFColumns import OMFColumns
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFLinkData import OMFLinkData
+from ..Models.OMFType import OMFType
+from .CompressionPolicy import CompressionPolicy
+from .PayloadBatcher import PayloadBatcher
+from .StageTimings import StageTimings
+
+# Message lists being serialized by forked workers, which inherit them instead of receiving them pickled
+_inherited = {}
+_keys = itertools.count()
+
+
+class ShardSerializer(object):
+    """
+    Serializes and compresses large lists of OMF messages in a process pool, so that toJson and gzip use several cores
+    instead of one. Messages are cut into shards of about shard_values values, OMFData messages with
+    more values being split into several messages with the same TypeId and ContainerId, and the bodies are returned
+    in the order of the messages.
+    By default the shards are pickled to a pool kept between message lists, started with forkserver where it is
+    available and spawn elsewhere. Only values held in columns, by OMFColumnData or OMFArrayData, count towards
+    min_values in this mode: their shards pickle as a few array buffers, while values held as objects take about as
+    long to pickle as to serialize, so lists of them are serialized on the calling thread instead. Other messages in a
+    sharded list are pickled with the shards, which needs the classes of their values to be importable by the workers.
+    With the fork start method a pool is forked for every message list instead, so the workers inherit the messages and
+    only receive the ranges of values to serialize, and throughput scales with the number of workers. Forking copies
+    the locks held by the other threads of the process, such as those of the store and forward queue or the http
+    connection pools, and a worker would deadlock on any of them. The workers only serialize the messages and
+    compress them with objects of their own, and the only inherited locks they can take, those of the logging module,
+    are reinitialized after a fork, so fork is safe as long as the messages do not serialize themselves with code
+    taking other locks. Python 3.12 and later warn when a process with several threads forks.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        shard_values: int = 50000,
+        min_values: int = 100000,
+        start_method: str = None,
+    ):
+        """
+        :param max_workers: Number of worker processes, None for the number of cores
+        :param shard_values: Number of values serialized by a worker at a time, and sent in one request body unless a
+            maximum payload size splits it further
+        :param min_values: Smaller message lists are serialized on the calling thread, since sharding them costs more
+            than it saves. Unless the workers are forked, only values held in columns are counted.
+        :param start_method: multiprocessing start method of the workers, None for forkserver where it is available
+            and spawn elsewhere. 'fork' forks the workers for every message list, see above.
+        """
+        if shard_values <= 0:
+            raise ValueError('Shard values must be greater than zero')
+
+        if start_method is None:
+            start_method = (
+                'forkserver'
+                if 'forkserver' in multiprocessing.get_all_start_methods()
+                else 'spawn'
+            )
+        self.__context = multiprocessing.get_context(start_method)
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__shard_values = shard_values
+        self.__min_values = min_values
+        self.__pool = None
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def MaxWorkers(self) -> int:
+        """
+        Gets the number of worker processes
+        :return:
+        """
+        return self.__max_workers
+
+    @property
+    def ShardValues(self) -> int:
+        """
+        Gets the number of values serialized by a worker at a time
+        :return:
+        """
+        return self.__shard_values
+
+    @property
+    def MinValues(self) -> int:
+        """
+        Gets the number of values below which message lists are not sharded
+        :return:
+        """
+        return self.__min_values
+
+    @property
+    def StartMethod(self) -> str:
+        """
+        Gets the multiprocessing start method of the workers
+        :return:
+        """
+        return self.__context.get_start_method()
+
+    def accepts(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> bool:
+        """
+        Gets whether a list of OMF messages holds enough values that sharding it saves time
+        :param omf_message: OMF message
+        :return:
+        """
+        forked = self.StartMethod == 'fork'
+        values = 0
+        for message in omf_message:
+            if (
+                isinstance(message, OMFData)
+                and message.Values is not None
+                and (forked or _isColumnar(message))
+            ):
+                values += len(message.Values)
+                if values >= self.__min_values:
+                    return True
+        return False
+
+    def shard(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> Iterator[list[OMFType | OMFContainer | OMFData | OMFLinkData]]:
+        """
+        Cuts a list of OMF messages into shards of about ShardValues values, other messages counting as one value
+        :param omf_message: OMF message
+        :return: Iterator of lists of OMF messages
+        """
+        for ranges in self.__ranges(omf_message):
+            yield _select(omf_message, ranges)
+
+    def iterBodies(
+        self,
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+        compression_policy: CompressionPolicy = None,
+        max_payload_size: int = None,
+    ) -> Iterator[bytes]:
+        """
+        Serializes and compresses OMF messages in the process pool, keeping up to two shards per worker in flight
+        :param omf_message: OMF message
+        :param compression_policy: Policy whose level and minimum size are used, and which records the bodies
+        :param max_payload_size: Target maximum size of a compressed request body in bytes, None for one body per
+            shard
+        :return: Iterator of compressed request bodies, in the order of the messages
+        """
+        compression_policy = compression_policy or CompressionPolicy()
+        settings = (
+            compression_policy.Level,
+            compression_policy.MinSize,
+            max_payload_size,
+        )
+
+        if self.StartMethod != 'fork':
+            shards = (
+                _Shard(None, None, _select(omf_message, ranges), *settings)
+                for ranges in self.__ranges(omf_message)
+            )
+            yield from self.__serialize(self.__getPool(), shards, compression_policy)
+            return
+
+        # The messages must be registered before the workers are forked, the pool is forked when the first shard is
+        # submitted
+        key = next(_keys)
+        _inherited[key] = omf_message
+        pool = ProcessPoolExecutor(self.__max_workers, mp_context=self.__context)
+        try:
+            shards = (
+                _Shard(key, ranges, None, *settings)
+                for ranges in self.__ranges(omf_message)
+            )
+            yield from self.__serialize(pool, shards, compression_policy)
+        finally:
+            pool.shutdown(cancel_futures=True)
+            del _inherited[key]
+
+    def close(self):
+        """
+        Shuts down the worker processes kept between message lists. They are recreated if the serializer is used again.
+        """
+        with self.__lock:
+            pool, self.__pool = self.__pool, None
+
+        if pool is not None:
+            pool.shutdown()
+
+    def __ranges(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> Iterator[list[tuple[int, int, int]]]:
+        # Yields the index, first value and value after the last of the messages of every shard
+        ranges = []
+        size = 0
+        for index, message in enumerate(omf_message):
+            count = (
+                len(message.Values)
+                if isinstance(message, OMFData) and message.Values is not None
+                else 1
+            )
+            start = 0
+            while start < count:
+                stop = min(count, start + self.__shard_values - size)
+                ranges.append((index, start, stop))
+                size += stop - start
+                start = stop
+                if size >= self.__shard_values:
+                    yield ranges
+                    ranges = []
+                    size = 0
+
+        if ranges:
+            yield ranges
+
+    def __serialize(
+        self,
+        pool: Executor,
+        shards: Iterator[_Shard],
+        compression_policy: CompressionPolicy,
+    ) -> Iterator[bytes]:
+        pending = deque()
+        for shard in shards:
+            pending.append(pool.submit(serializeShard, shard))
+            if len(pending) >= 2 * self.__max_workers:
+                yield from self.__receive(pending.popleft(), compression_policy)
+
+        while pending:
+            yield from self.__receive(pending.popleft(), compression_policy)
+
+    @staticmethod
+    def __receive(future, compression_policy: CompressionPolicy) -> list[bytes]:
+        with StageTimings.measure('serialize'):
+            bodies = future.result()
+        for body in bodies:
+            compression_policy.record(
+                CompressionPolicy.uncompressedSize(body),
+                len(body),
+                CompressionPolicy.isCompressed(body),
+            )
+        return bodies
+
+    def __getPool(self) -> Executor:
+        with self.__lock:
+            if self.__pool is None:
+                self.__pool = ProcessPoolExecutor(
+                    self.__max_workers, mp_context=self.__context
+                )
+            return self.__pool
+
+
+class _Shard(object):
+    """
+    Messages serialized by a worker process, either as ranges of a message list inherited from the parent process or
+    pickled, with the compression settings to use
+    """
+
+    __slots__ = ('Key', 'Ranges', 'Messages', 'Level', 'MinSize', 'MaxPayloadSize')
+
+    def __init__(
+        self,
+        key: int | None,
+        ranges: list[tuple[int, int, int]] | None,
+        messages: list[OMFType | OMFContainer | OMFData | OMFLinkData] | None,
+        level: int,
+        min_size: int,
+        max_payload_size: int = None,
+    ):
+        self.Key = key
+        self.Ranges = ranges
+        self.Messages = messages
+        self.Level = level
+        self.MinSize = min_size
+        self.MaxPayloadSize = max_payload_size
+
+
+def serializeShard(shard: _Shard) -> list[bytes]:
+    """
+    Serializes and compresses a shard of OMF messages, in a worker process
+    :param shard: Messages and compression settings
+    :return: Compressed request bodies
+    """
+    messages = shard.Messages
+    if messages is None:
+        messages = _select(_inherited[shard.Key], shard.Ranges)
+
+    compression_policy = CompressionPolicy(shard.Level, shard.MinSize)
+    if shard.MaxPayloadSize:
+        return PayloadBatcher(shard.MaxPayloadSize, compression_policy).batch(messages)
+
+    body = PayloadBatcher.join([message.toJson() for message in messages])
+    return [compression_policy.compress(body)]
+
+
+def _isColumnar(message: OMFData) -> bool:
+    # Columns pickle as a few buffers, values held as objects are pickled one by one
+    return isinstance(message, OMFArrayData) or isinstance(message.Values, OMFColumns)
+
+
+def _select(
+    omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ranges: list[tuple[int, int, int]],
+) -> list[OMFType | OMFContainer | OMFData | OMFLinkData]:
+    result = []
+    for index, start, stop in ranges:
+        message = omf_message[index]
+        if start == 0 and (
+            not isinstance(message, OMFData)
+            or message.Values is None
+            or stop == len(message.Values)
+        ):
+            result.append(message)
+        else:
+            result.append(message.slice(start, stop))
+    return result
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+
+# Stages of an omfRequest, in the order they happen
+STAGES = ('serialize', 'compress', 'headers', 'network', 'backoff')
+
+# Timings of the omfRequest running in the current context, None when stage timing is off
+_current = contextvars.ContextVar('omf_stage_timings', default=None)
+
+# Lists collecting the timings of every omfRequest made in the current context
+_collectors = contextvars.ContextVar('omf_stage_timing_collectors', default=())
+
+
+class StageTimings(object):
+    """
+    Time spent in each stage of a single omfRequest, in seconds: serialize (toJson and joining the json of the
+    messages into bodies), compress (gzip), headers (getHeaders, including token acquisition), network (http
+    requests) and backoff (sleeping between retries). Streamed bodies are serialized and compressed while they are
+    sent, so that time is part of network, and shards are compressed by the ShardSerializer workers, so that time is
+    part of serialize.
+    """
+
+    def __init__(self, message_type: OMFMessageType, action: OMFMessageAction):
+        """
+        :param message_type: OMF message type
+        :param action: OMF action
+        """
+        self.__message_type = message_type
+        self.__action = action
+        self.__seconds = dict.fromkeys(STAGES, 0.0)
+        self.__counts = dict.fromkeys(STAGES, 0)
+        self.__start = time.perf_counter()
+        self.__total = None
+
+    def __repr__(self) -> str:
+        stages = ', '.join(
+            f'{stage}={seconds * 1000:.2f}ms'
+            for stage, seconds in self.__seconds.items()
+        )
+        return (
+            f'StageTimings({self.__message_type.value} {self.__action.value}: {stages})'
+        )
+
+    @property
+    def MessageType(self) -> OMFMessageType:
+        """
+        Gets the OMF message type of the request
+        :return:
+        """
+        return self.__message_type
+
+    @property
+    def Action(self) -> OMFMessageAction:
+        """
+        Gets the OMF action of the request
+        :return:
+        """
+        return self.__action
+
+    @property
+    def Seconds(self) -> dict[str, float]:
+        """
+        Gets the seconds spent in each stage
+        :return:
+        """
+        return dict(self.__seconds)
+
+    @property
+    def Counts(self) -> dict[str, int]:
+        """
+        Gets the number of times each stage ran, for example the number of http requests made
+        :return:
+        """
+        return dict(self.__counts)
+
+    @property
+    def Total(self) -> float:
+        """
+        Gets the seconds spent in omfRequest, including time not attributed to any stage
+        :return:
+        """
+        if self.__total is None:
+            return time.perf_counter() - self.__start
+        return self.__total
+
+    def add(self, stage: str, seconds: float):
+        """
+        Adds time spent in a stage
+        :param stage: Name of the stage
+        :param seconds: Seconds spent
+        """
+        self.__seconds[stage] = self.__seconds.get(stage, 0.0) + seconds
+        self.__counts[stage] = self.__counts.get(stage, 0) + 1
+
+    def toDictionary(self) -> dict:
+        return {
+            'MessageType': self.__message_type.value,
+            'Action': self.__action.value,
+            'Total': self.Total,
+            'Seconds': self.Seconds,
+            'Counts': self.Counts,
+        }
+
+    @staticmethod
+    def measure(stage: str) -> _Stage:
+        """
+        Times a block of code as a stage of the omfRequest running in the current context. Does nothing when stage
+        timing is off.
+        :param stage: Name of the stage
+        :return: Context manager
+        """
+        return _Stage(stage)
+
+    @staticmethod
+    @contextmanager
+    def collect() -> Iterator[list[StageTimings]]:
+        """
+        Collects the timings of every omfRequest made in the current context, including requests made by the services
+        :return: Context manager giving the list the timings are added to
+        """
+        timings = []
+        token = _collectors.set(_collectors.get() + (timings,))
+        try:
+            yield timings
+        finally:
+            _collectors.reset(token)
+
+    @staticmethod
+    @contextmanager
+    def record(
+        message_type: OMFMessageType,
+        action: OMFMessageAction,
+        callback: Callable[[StageTimings], None] = None,
+    ) -> Iterator[StageTimings | None]:
+        """
+        Times the stages of an omfRequest when a callback is given or the timings are being collected
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param callback: Function called with the timings when the request completes
+        :return: Context manager giving the timings, or None when stage timing is off
+        """
+        collectors = _collectors.get()
+        if callback is None and not collectors:
+            yield None
+            return
+
+        timings = StageTimings(message_type, action)
+        token = _current.set(timings)
+        try:
+            yield timings
+        finally:
+            _current.reset(token)
+            timings.__total = time.perf_counter() - timings.__start
+            for collector in collectors:
+                collector.append(timings)
+            if callback is not None:
+                callback(timings)
+
+
+class _Stage(object):
+    __slots__ = ('name', 'timings', 'start')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = _current.get()
+        if self.timings is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.start)
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from typing import Callable
+
+import requests
+
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from .OMFError import OMFError
+
+DROP_POLICIES = ('oldest', 'newest', 'error')
+
+
+class StoreAndForwardQueue(object):
+    """
+    Stores compressed OMF request bodies in a SQLite file and sends them in order from a background thread, so that
+    producers keep running while the endpoint is unavailable and no data is lost when the process restarts.
+    Bodies are stored exactly as they are sent and are never serialized again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_disk_bytes: int = 1024**3,
+        drop_policy: str = 'oldest',
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 60.0,
+    ):
+        """
+        :param path: SQLite file holding the stored bodies, ':memory:' to keep them in memory only
+        :param max_disk_bytes: Maximum total size in bytes of the stored bodies
+        :param drop_policy: What to do with a body that does not fit under the quota: 'oldest' drops stored bodies
+            until it fits, 'newest' drops the new body, and 'error' raises an OMFError
+        :param retry_interval: Seconds to wait before resending after the first failed attempt
+        :param max_retry_interval: Maximum number of seconds between attempts while the endpoint is unavailable
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f'Drop policy must be one of {DROP_POLICIES}')
+
+        self.__path = path
+        self.__max_disk_bytes = max_disk_bytes
+        self.__drop_policy = drop_policy
+        self.__retry_interval = retry_interval
+        self.__max_retry_interval = max_retry_interval
+        self.__lock = threading.Lock()
+        self.__changed = threading.Condition(self.__lock)
+        self.__dropped = 0
+        self.__send = None
+        self.__sender = None
+        self.__running = False
+        self.__stopping = False
+        self.__closed = False
+
+        self.__connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self.__connection.execute('PRAGMA journal_mode=WAL')
+        self.__connection.execute(
+            'CREATE TABLE IF NOT EXISTS messages ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'message_type TEXT NOT NULL, '
+            'action TEXT NOT NULL, '
+            'body BLOB NOT NULL, '
+            'size INTEGER NOT NULL)'
+        )
+        count, size = self.__connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM messages'
+        ).fetchone()
+        self.__pending = count
+        self.__pending_bytes = size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def Path(self) -> str:
+        """
+        Gets the SQLite file holding the stored bodies
+        :return:
+        """
+        return self.__path
+
+    @property
+    def MaxDiskBytes(self) -> int:
+        """
+        Gets the maximum total size in bytes of the stored bodies
+        :return:
+        """
+        return self.__max_disk_bytes
+
+    @property
+    def DropPolicy(self) -> str:
+        """
+        Gets what happens to a body that does not fit under the quota: 'oldest', 'newest' or 'error'
+        :return:
+        """
+        return self.__drop_policy
+
+    @property
+    def Pending(self) -> int:
+        """
+        Gets the number of bodies waiting to be sent
+        :return:
+        """
+        return self.__pending
+
+    @property
+    def PendingBytes(self) -> int:
+        """
+        Gets the total size in bytes of the bodies waiting to be sent
+        :return:
+        """
+        return self.__pending_bytes
+
+    @property
+    def Dropped(self) -> int:
+        """
+        Gets the number of bodies dropped because of the quota or rejected by the endpoint
+        :return:
+        """
+        return self.__dropped
+
+    def put(self, message_type: OMFMessageType, action: OMFMessageAction, body: bytes):
+        """
+        Stores a request body to be sent after the bodies stored before it
+        :param message_type: OMF message type
+        :param action: OMF action
+        :param body: Request body, compressed or not
+        """
+        with self.__changed:
+            if self.__stopping:
+                raise OMFError('The store and forward queue has been closed')
+
+            if self.__pending_bytes + len(body) > self.__max_disk_bytes:
+                if self.__drop_policy == 'error' or len(body) > self.__max_disk_bytes:
+                    raise OMFError(
+                        f'Storing {len(body)} bytes would exceed the quota of {self.__max_disk_bytes} bytes'
+                    )
+                if self.__drop_policy == 'newest':
+                    self.__dropped += 1
+                    logging.warning('Store and forward quota exceeded, dropping body')
+                    return
+                self.__dropOldest(len(body))
+
+            self.__connection.execute(
+                'INSERT INTO messages (message_type, action, body, size) VALUES (?, ?, ?, ?)',
+                (message_type.value, action.value, body, len(body)),
+            )
+            self.__pending += 1
+            self.__pending_bytes += len(body)
+            self.__changed.notify_all()
+
+    def start(
+        self,
+        send: Callable[[OMFMessageType, OMFMessageAction, bytes], requests.Response],
+    ):
+        """
+        Starts sending the stored bodies from a background thread
+        :param send: Function sending one stored body and returning the response
+        """
+        with self.__changed:
+            if self.__closed:
+                raise OMFError('The store and forward queue has been closed')
+            if self.__sender is not None:
+                raise OMFError('The store and forward queue has already been started')
+
+            self.__send = send
+            self.__stopping = False
+            self.__running = True
+            self.__sender = threading.Thread(
+                target=self.__run, name='StoreAndForwardQueue', daemon=True
+            )
+            self.__sender.start()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until every stored body has been sent
+        :param timeout: Maximum number of seconds to wait
+        :return: Whether the queue is empty
+        """
+        with self.__changed:
+            return self.__changed.wait_for(lambda: self.__pending == 0, timeout)
+
+    def close(self, timeout: float = None):
+        """
+        Stops the background thread and closes the SQLite file. Bodies that were not sent stay stored and are sent
+        once a queue using the same file is started again.
+        :param timeout: Maximum number of seconds to wait for the body being sent
+        """
+        with self.__changed:
+            self.__stopping = True
+            sender, self.__sender = self.__sender, None
+            self.__changed.notify_all()
+
+        if sender is not None:
+            sender.join(timeout)
+
+        # A sender still waiting on a response after the timeout closes the connection itself once it exits
+        with self.__lock:
+            self.__closed = True
+            if not self.__running:
+                self.__connection.close()
+
+    def __dropOldest(self, size: int):
+        rows = self.__connection.execute(
+            'SELECT id, size FROM messages ORDER BY id'
+        ).fetchall()
+        last_id = None
+        for id, row_size in rows:
+            if self.__pending_bytes + size <= self.__max_disk_bytes:
+                break
+            last_id = id
+            self.__pending -= 1
+            self.__pending_bytes -= row_size
+            self.__dropped += 1
+
+        if last_id is not None:
+            logging.warning('Store and forward quota exceeded, dropping oldest bodies')
+            self.__connection.execute('DELETE FROM messages WHERE id <= ?', (last_id,))
+
+    def __remove(self, id: int, size: int):
+        with self.__changed:
+            deleted = self.__connection.execute(
+                'DELETE FROM messages WHERE id = ?', (id,)
+            ).rowcount
+            # The body may already have been dropped to make room for newer ones
+            if deleted:
+                self.__pending -= 1
+                self.__pending_bytes -= size
+            self.__changed.notify_all()
+
+    def __run(self):
+        try:
+            self.__sendStored()
+        finally:
+            with self.__lock:
+                self.__running = False
+                if self.__closed:
+                    self.__connection.close()
+
+    def __sendStored(self):
+        failures = 0
+        while True:
+            with self.__changed:
+                self.__changed.wait_for(lambda: self.__stopping or self.__pending > 0)
+                if self.__stopping:
+                    return
+                id, message_type, action, body, size = self.__connection.execute(
+                    'SELECT id, message_type, action, body, size FROM messages ORDER BY id LIMIT 1'
+                ).fetchone()
+
+            try:
+                response = self.__send(
+                    OMFMessageType(message_type), OMFMessageAction(action), body
+                )
+                status_code = response.status_code
+            except Exception as error:
+                # Any error, such as a failed token refresh, is retried so that the thread keeps sending the bodies
+                logging.warning(f'Failed to send stored body: {error}')
+                status_code = None
+
+            if status_code is not None and 200 <= status_code < 300:
+                failures = 0
+                self.__remove(id, size)
+                continue
+
+            if (
+                status_code is not None
+                and 400 <= status_code < 500
+                and status_code not in (408, 429)
+            ):
+                # Resending a rejected body cannot succeed and would block every body stored after it
+                logging.error(
+                    f'Stored body rejected by the endpoint. Response: {status_code} {response.text}.'
+                )
+                with self.__lock:
+                    self.__dropped += 1
+                self.__remove(id, size)
+                continue
+
+            interval = min(
+                self.__retry_interval * 2 ** min(failures, 30),
+                self.__max_retry_interval,
+            )
+            failures += 1
+            with self.__changed:
+                self.__changed.wait_for(lambda: self.__stopping, interval)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import replace
+from enum import Enum
+from typing import Iterator
+
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFLinkData import OMFLinkData
+from ..Models.OMFType import OMFType
+from ..Models.Serializeable import Serializeable, serializeValue
+from .CompressionPolicy import CompressionPolicy
+
+
+class StreamingEncoder(object):
+    """
+    Serializes OMF messages straight into an incremental gzip compressor and yields the compressed body in chunks,
+    so that peak memory is bounded by the chunk size instead of a multiple of the payload size.
+    """
+
+    def __init__(
+        self, chunk_size: int = 65536, compression_policy: CompressionPolicy = None
+    ):
+        """
+        :param chunk_size: Number of serialized characters buffered before they are compressed
+        :param compression_policy: Policy providing the compression level and collecting the statistics
+        """
+        if chunk_size <= 0:
+            raise ValueError('Chunk size must be greater than zero')
+
+        self.__chunk_size = chunk_size
+        self.__compression_policy = compression_policy or CompressionPolicy()
+
+    @property
+    def ChunkSize(self) -> int:
+        """
+        Gets the number of serialized characters buffered before they are compressed
+        :return:
+        """
+        return self.__chunk_size
+
+    def encode(
+        self, omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData]
+    ) -> Iterator[bytes]:
+        """
+        Serializes and compresses a list of OMF messages. The concatenation of the chunks is a gzip file holding
+        the same json as the non streaming request body.
+        :param omf_message: OMF message
+        :return: Iterator of compressed chunks
+        """
+        compressor = zlib.compressobj(
+            self.__compression_policy.Level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+        size_before = 0
+        size_after = 0
+        buffer = []
+        buffered = 0
+        for fragment in self.fragments(omf_message):
+            buffer.append(fragment)
+            buffered += len(fragment)
+            if buffered >= self.__chunk_size:
+                chunk = ''.join(buffer).encode('utf-8')
+                compressed = compressor.compress(chunk)
+                size_before += len(chunk)
+                size_after += len(compressed)
+                buffer = []
+                buffered = 0
+                if compressed:
+                    yield compressed
+
+        chunk = ''.join(buffer).encode('utf-8')
+        compressed = compressor.compress(chunk) + compressor.flush()
+        size_before += len(chunk)
+        size_after += len(compressed)
+        self.__compression_policy.record(size_before, size_after)
+        yield compressed
+
+    @staticmethod
+    def fragments(
+        omf_message: list[OMFType | OMFContainer | OMFData | OMFLinkData],
+    ) -> Iterator[str]:
+        """
+        Serializes a list of OMF messages into json fragments, one value at a time for OMFData
+        :param omf_message: OMF message
+        :return: Iterator of json fragments
+        """
+        yield '['
+        for index, message in enumerate(omf_message):
+            if index:
+                yield ', '
+            yield from StreamingEncoder.messageFragments(message)
+        yield ']'
+
+    @staticmethod
+    def messageFragments(
+        message: OMFType | OMFContainer | OMFData | OMFLinkData,
+    ) -> Iterator[str]:
+        """
+        Serializes a single OMF message into json fragments, one value at a time for OMFData
+        :param message: OMF message
+        :return: Iterator of json fragments
+        """
+        if (
+            not isinstance(message, OMFData)
+            or type(message).toJson is not Serializeable.toJson
+            or type(message).toDictionary is not Serializeable.toDictionary
+            or not message.Values
+            or isinstance(message.Values[0], Enum)
+        ):
+            yield message.toJson()
+            return
+
+        # Values is the first field of OMFData, so this is exactly what json.dumps would produce for the whole message
+        envelope = replace(message, Values=None).toDictionary()
+        yield '{"Values": ['
+        for index, value in enumerate(message.Values):
+            if index:
+                yield ', '
+            yield json.dumps(serializeValue(value))
+        yield ']'
+        if envelope:
+            yield ', ' + json.dumps(envelope)[1:-1]
+        yield '}'
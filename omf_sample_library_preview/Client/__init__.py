@@ -1,4 +1,5 @@
 from .ADHOMFClient import ADHOMFClient
+from .AsyncOMFClient import AsyncOMFClient
 from .Authentication import Authentication
 from .OMFClient import OMFClient
 from .OMFError import OMFError
@@ -1,12 +1,22 @@
+import copy
+import importlib
+import inspect
+import pkgutil
+import threading
+import weakref
 from dataclasses import dataclass
 from datetime import datetime
-from types import FunctionType, NoneType, UnionType
-from typing import Any, get_args, get_origin, get_type_hints
+from types import FunctionType, ModuleType, NoneType, UnionType
+from typing import Any, Iterable, get_args, get_origin, get_type_hints
 
 from ..Models import (OMFClassification, OMFExtrapolationMode, OMFFormatCode,
                       OMFInterpolationMode, OMFType, OMFTypeCode,
                       OMFTypeProperty, OMFTypeType)
 
+# Converted types by class. Classes are weakly referenced so that converting a class does not keep it alive.
+_converted_types = weakref.WeakKeyDictionary()
+_converted_types_lock = threading.Lock()
+
 
 def getOMFTypeFromPythonType(type_hint: type) -> OMFTypeProperty:
     if type_hint is NoneType:
@@ -64,7 +74,8 @@ def getOMFTypePropertyPythonProperty(prop: property) -> OMFTypeProperty:
     type_property = getOMFTypeFromPythonType(type_hint)
 
     if hasattr(prop.fget, '__omf_type_property'):
-        user_type_property = getattr(prop.fget, '__omf_type_property')
+        # Copy the decorator's property so that converting a class does not change it
+        user_type_property = copyTypeProperty(getattr(prop.fget, '__omf_type_property'))
 
         # We don't want to use the generated type property if RefType was included
         if user_type_property.RefTypeId:
@@ -88,11 +99,123 @@ def convert(omf_class: type) -> OMFType:
     Converts a python class into an OMFType.
     Properties flagged by the @property decorator get automatically added to the OMF Type as OMF Type Properties.
     To customize the returned OMFType, use the @omf_type and @omf_type_property decorators.
+    The conversion of each class is cached, and every call returns a new copy that can be changed freely. Call
+    invalidate if a class is changed after it was converted.
     :param omf_class: The python class to be converted into an OMFType
     :returns: OMFType object
     """
+    with _converted_types_lock:
+        omf_type = _converted_types.get(omf_class)
+        if omf_type is None:
+            omf_type = _convertClass(omf_class)
+            _converted_types[omf_class] = omf_type
+
+    return copyType(omf_type)
+
+
+def convertClasses(omf_classes: Iterable[type]) -> list[OMFType]:
+    """
+    Converts python classes into a list of OMFTypes without duplicates, ready to be created by the TypeService
+    :param omf_classes: The python classes to be converted
+    :returns: OMFTypes in the order of their first class
+    """
+    omf_types = {}
+    for omf_class in omf_classes:
+        omf_type = convert(omf_class)
+        existing = omf_types.get(omf_type.Id)
+        if existing is None:
+            omf_types[omf_type.Id] = omf_type
+        elif existing != omf_type:
+            raise ValueError(
+                f'Invalid OMF Type: {omf_class.__qualname__} and another class define different types with id {omf_type.Id}'
+            )
+    return list(omf_types.values())
+
+
+def convertModule(module: ModuleType | str, recursive: bool = True) -> list[OMFType]:
+    """
+    Converts the classes decorated with @omf_type in a module, or in a package and its sub packages, into a list of
+    OMFTypes without duplicates
+    :param module: Module or package, or its name
+    :param recursive: Whether to also convert the classes of the modules of a package
+    :returns: OMFTypes ordered by module, then by order of definition
+    """
+    if isinstance(module, str):
+        module = importlib.import_module(module)
+
+    modules = [module]
+    if recursive and hasattr(module, '__path__'):
+        for module_info in pkgutil.walk_packages(
+            module.__path__, f'{module.__name__}.'
+        ):
+            modules.append(importlib.import_module(module_info.name))
+
+    omf_classes = []
+    for current in modules:
+        omf_classes.extend(
+            member
+            for member in vars(current).values()
+            if inspect.isclass(member)
+            and member.__module__ == current.__name__
+            and '__omf_type' in vars(member)
+        )
+    return convertClasses(omf_classes)
+
+
+def invalidate(omf_class: type = None):
+    """
+    Removes a class from the conversion cache, so that changes made to it after it was converted are picked up
+    :param omf_class: The python class, None to clear the whole cache
+    """
+    with _converted_types_lock:
+        if omf_class is None:
+            _converted_types.clear()
+        else:
+            _converted_types.pop(omf_class, None)
+
+
+def copyType(omf_type: OMFType) -> OMFType:
+    """
+    Copies an OMFType and everything it holds that can be changed, much faster than copy.deepcopy
+    :param omf_type: OMFType to copy
+    :returns: Copy of the OMFType
+    """
+    result = copy.copy(omf_type)
+    if omf_type.Tags is not None:
+        result.Tags = list(omf_type.Tags)
+    if omf_type.Metadata is not None:
+        result.Metadata = copy.deepcopy(omf_type.Metadata)
+    if omf_type.Enum is not None:
+        result.Enum = copy.deepcopy(omf_type.Enum)
+    if omf_type.Properties is not None:
+        result.Properties = {
+            id: copyTypeProperty(prop) for id, prop in omf_type.Properties.items()
+        }
+    return result
+
+
+def copyTypeProperty(type_property: OMFTypeProperty) -> OMFTypeProperty:
+    """
+    Copies an OMFTypeProperty and the properties it holds
+    :param type_property: OMFTypeProperty to copy
+    :returns: Copy of the OMFTypeProperty
+    """
+    result = copy.copy(type_property)
+    if isinstance(type_property.Type, list):
+        result.Type = list(type_property.Type)
+    if type_property.Items is not None:
+        result.Items = copyTypeProperty(type_property.Items)
+    if type_property.AdditionalProperties is not None:
+        result.AdditionalProperties = copyTypeProperty(
+            type_property.AdditionalProperties
+        )
+    return result
+
+
+def _convertClass(omf_class: type) -> OMFType:
+    # The type set by the @omf_type decorator is copied so that it is never changed by the conversion
     if hasattr(omf_class, '__omf_type'):
-        omf_type = getattr(omf_class, '__omf_type')
+        omf_type = copyType(getattr(omf_class, '__omf_type'))
     else:
         omf_type = OMFType(omf_class.__name__, OMFClassification.Dynamic)
 
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from ..Models import (OMFArrayData, OMFClassification, OMFContainer,
+                      OMFFormatCode, OMFType, OMFTypeCode, OMFTypeProperty,
+                      OMFTypeType)
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:
+    np = None
+    pd = None
+
+# Formats of the NumPy numeric dtypes, OMF has no 8 bit formats so those are widened to 16 bits
+NUMBER_FORMATS = {
+    'f8': OMFFormatCode.Float64,
+    'f4': OMFFormatCode.Float32,
+    'f2': OMFFormatCode.Float16,
+    'i8': OMFFormatCode.Int64,
+    'i4': OMFFormatCode.Int32,
+    'i2': OMFFormatCode.Int16,
+    'i1': OMFFormatCode.Int16,
+    'u8': OMFFormatCode.Uint64,
+    'u4': OMFFormatCode.Uint32,
+    'u2': OMFFormatCode.Uint16,
+    'u1': OMFFormatCode.Uint16,
+}
+
+
+def requirePandas():
+    if pd is None:
+        raise ImportError(
+            'DataFrame conversion requires pandas, install it with: pip install omf_sample_library_preview[pandas]'
+        )
+
+
+def getOMFTypePropertyFromDtype(dtype, nullable: bool = False) -> OMFTypeProperty:
+    """
+    Converts a pandas or NumPy dtype into an OMFTypeProperty
+    :param dtype: The dtype of a column
+    :param nullable: Whether the column can hold null values
+    :returns: OMFTypeProperty object
+    """
+    requirePandas()
+    dtype = getattr(dtype, 'numpy_dtype', dtype)
+    if pd.api.types.is_bool_dtype(dtype):
+        result = OMFTypeProperty(OMFTypeCode.Boolean)
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        result = OMFTypeProperty(OMFTypeCode.String, OMFFormatCode.DateTime)
+    elif pd.api.types.is_integer_dtype(dtype):
+        result = OMFTypeProperty(
+            OMFTypeCode.Integer, NUMBER_FORMATS.get(np.dtype(dtype).str[1:])
+        )
+    elif pd.api.types.is_float_dtype(dtype):
+        result = OMFTypeProperty(
+            OMFTypeCode.Number, NUMBER_FORMATS.get(np.dtype(dtype).str[1:])
+        )
+    else:
+        result = OMFTypeProperty(OMFTypeCode.String)
+
+    if nullable:
+        result.Type = [result.Type, OMFTypeCode.Null]
+    return result
+
+
+def convertDataFrame(
+    data_frame: pd.DataFrame,
+    type_id: str,
+    index: str = None,
+    per_column: bool = False,
+    classification: OMFClassification = OMFClassification.Dynamic,
+) -> list[OMFType]:
+    """
+    Converts the columns of a DataFrame into OMFTypes.
+    Columns that are nullable or hold missing values become nullable properties.
+    :param data_frame: The DataFrame to be converted
+    :param type_id: Id of the OMFType, or prefix of the type ids when per_column is set
+    :param index: Column holding the index, defaults to the index of the DataFrame
+    :param per_column: Whether to create one OMFType per value column instead of one for the DataFrame
+    :param classification: Classification of the OMFTypes
+    :returns: List of OMFType objects
+    """
+    requirePandas()
+    columns = _getColumns(data_frame, index)
+    index_name, index_column = next(iter(columns.items()))
+    index_property = getOMFTypePropertyFromDtype(index_column.dtype)
+    index_property.IsIndex = True
+    properties = {
+        name: getOMFTypePropertyFromDtype(column.dtype, _isNullable(column))
+        for name, column in columns.items()
+        if name != index_name
+    }
+
+    if not per_column:
+        return [
+            OMFType(
+                type_id,
+                classification,
+                OMFTypeType.Object,
+                Properties={index_name: index_property, **properties},
+            )
+        ]
+
+    return [
+        OMFType(
+            f'{type_id}.{name}',
+            classification,
+            OMFTypeType.Object,
+            Properties={index_name: index_property, name: type_property},
+        )
+        for name, type_property in properties.items()
+    ]
+
+
+def getDataFrameContainers(
+    data_frame: pd.DataFrame,
+    container_id: str,
+    type_id: str,
+    index: str = None,
+    per_column: bool = False,
+) -> list[OMFContainer]:
+    """
+    Gets the OMFContainers that hold the values of a DataFrame
+    :param data_frame: The DataFrame holding the values
+    :param container_id: Id of the OMFContainer, or prefix of the container ids when per_column is set
+    :param type_id: Id of the OMFType, or prefix of the type ids when per_column is set
+    :param index: Column holding the index, defaults to the index of the DataFrame
+    :param per_column: Whether to create one OMFContainer per value column instead of one for the DataFrame
+    :returns: List of OMFContainer objects
+    """
+    requirePandas()
+    if not per_column:
+        return [OMFContainer(container_id, type_id)]
+
+    names = list(_getColumns(data_frame, index))[1:]
+    return [
+        OMFContainer(f'{container_id}.{name}', f'{type_id}.{name}') for name in names
+    ]
+
+
+def getDataFrameData(
+    data_frame: pd.DataFrame,
+    container_id: str,
+    index: str = None,
+    per_column: bool = False,
+    chunk_size: int = 100000,
+) -> Iterator[list[OMFArrayData]]:
+    """
+    Converts the rows of a DataFrame into OMFData, one chunk of rows at a time.
+    Columns are converted to NumPy arrays and encoded as a whole, never row by row.
+    :param data_frame: The DataFrame holding the values
+    :param container_id: Id of the OMFContainer, or prefix of the container ids when per_column is set
+    :param index: Column holding the index, defaults to the index of the DataFrame
+    :param per_column: Whether to send each value column to its own OMFContainer
+    :param chunk_size: Maximum number of rows in a chunk
+    :returns: Iterator of lists of OMFData, one list per chunk
+    """
+    requirePandas()
+    if chunk_size <= 0:
+        raise ValueError('Chunk size must be greater than zero')
+
+    columns = _getColumns(data_frame, index)
+    arrays = {name: _toNumpy(column) for name, column in columns.items()}
+    index_name = next(iter(arrays))
+    for start in range(0, len(data_frame), chunk_size):
+        chunk = {
+            name: array[start : start + chunk_size] for name, array in arrays.items()
+        }
+        if not per_column:
+            yield [OMFArrayData.fromArrays(container_id=container_id, **chunk)]
+            continue
+
+        yield [
+            OMFArrayData.fromArrays(
+                container_id=f'{container_id}.{name}',
+                **{index_name: chunk[index_name], name: array},
+            )
+            for name, array in chunk.items()
+            if name != index_name
+        ]
+
+
+def sendDataFrame(
+    data_service,
+    data_frame: pd.DataFrame,
+    container_id: str,
+    index: str = None,
+    per_column: bool = False,
+    chunk_size: int = 100000,
+):
+    """
+    Sends the rows of a DataFrame to existing OMFContainers, one chunk of rows per createData call
+    :param data_service: DataService used to send the values
+    :param data_frame: The DataFrame holding the values
+    :param container_id: Id of the OMFContainer, or prefix of the container ids when per_column is set
+    :param index: Column holding the index, defaults to the index of the DataFrame
+    :param per_column: Whether to send each value column to its own OMFContainer
+    :param chunk_size: Maximum number of rows sent per createData call
+    """
+    for omf_data in getDataFrameData(
+        data_frame, container_id, index, per_column, chunk_size
+    ):
+        data_service.createData(omf_data)
+
+
+def _getColumns(data_frame: pd.DataFrame, index: str = None) -> dict[str, pd.Series]:
+    # The index column always comes first
+    if index is None:
+        if data_frame.index.name is None:
+            raise ValueError(
+                'The DataFrame index must be named, or the index column must be given'
+            )
+        index = data_frame.index.name
+        index_column = data_frame.index.to_series()
+    else:
+        index_column = data_frame[index]
+
+    columns = {str(index): index_column}
+    for name, column in data_frame.items():
+        if name != index:
+            columns[str(name)] = column
+    return columns
+
+
+def _isNullable(column: pd.Series) -> bool:
+    dtype = column.dtype
+    if isinstance(dtype, pd.api.extensions.ExtensionDtype) and not isinstance(
+        dtype, pd.DatetimeTZDtype
+    ):
+        return True
+    return bool(column.isna().any())
+
+
+def _toNumpy(column: pd.Series) -> np.ndarray:
+    dtype = column.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        # OMF timestamps are UTC
+        return column.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufM':
+        return column.to_numpy()
+
+    numpy_dtype = getattr(dtype, 'numpy_dtype', None)
+    if numpy_dtype is not None and not column.hasnans:
+        return column.to_numpy(dtype=numpy_dtype)
+    if numpy_dtype is not None and numpy_dtype.kind == 'f':
+        return column.to_numpy(dtype=numpy_dtype, na_value=np.nan)
+
+    # Strings and columns with missing integers or booleans are encoded value by value
+    return column.to_numpy(dtype=object, na_value=None)
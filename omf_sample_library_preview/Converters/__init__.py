@@ -1 +1,6 @@
-from .ClassToOMFTypeConverter import convert, omf_type, omf_type_property
+from .ClassToOMFTypeConverter import (convert, convertClasses, convertModule,
+                                      omf_type, omf_type_property)
+from .DataFrameToOMFConverter import (convertDataFrame, getDataFrameContainers,
+                                      getDataFrameData,
+                                      getOMFTypePropertyFromDtype,
+                                      sendDataFrame)
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .OMFRejection import OMFRejection
+
+MESSAGE_TYPES = ('type', 'container', 'data')
+ACTIONS = ('create', 'update', 'delete')
+OMF_VERSIONS = ('1.0', '1.1', '1.2')
+
+
+class OMFEmulator(object):
+    """
+    Local emulator of an OMF endpoint for load and soak testing. It validates the OMF headers, decompresses and parses
+    the bodies, keeps track of the types and containers created, and rejects data sent to unknown containers like a
+    real endpoint. Latency, throttling, body size limits and server errors can be injected.
+    Only the number of values per container is kept unless store_values is set, so memory use stays flat in long runs.
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        max_body_size: int = None,
+        max_requests_per_second: float = None,
+        store_values: bool = False,
+        seed: int = None,
+    ):
+        """
+        :param host: Host name or address to listen on
+        :param port: Port to listen on, 0 to pick a free port
+        :param latency: Seconds to wait before answering each request
+        :param latency_jitter: Maximum number of random seconds added to the latency
+        :param error_rate: Fraction of the requests answered with 503 Service Unavailable
+        :param max_body_size: Bodies larger than this many bytes, as sent, are answered with 413 Payload Too Large
+        :param max_requests_per_second: Requests over this rate are answered with 429 Too Many Requests and a
+            Retry-After header, None for no limit
+        :param store_values: Whether to keep the values sent to each container
+        :param seed: Seed of the random generator used for the latency jitter and the errors
+        """
+        self.Latency = latency
+        self.LatencyJitter = latency_jitter
+        self.ErrorRate = error_rate
+        self.MaxBodySize = max_body_size
+        self.MaxRequestsPerSecond = max_requests_per_second
+        self.StoreValues = store_values
+
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__tokens = max_requests_per_second or 0
+        self.__last_refill = time.monotonic()
+        self.__types = {}
+        self.__containers = {}
+        self.__value_counts = {}
+        self.__values = {}
+        self.__requests = 0
+        self.__bytes_received = 0
+        self.__status_codes = {}
+
+        self.__server = ThreadingHTTPServer((host, port), self.__createHandler())
+        self.__server.daemon_threads = True
+        self.__thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def Url(self) -> str:
+        """
+        Gets the base url to give to an OMFClient, which sends its requests to this url followed by /omf
+        :return:
+        """
+        host, port = self.__server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def Types(self) -> dict[str, dict]:
+        """
+        Gets the types created, by id
+        :return:
+        """
+        with self.__lock:
+            return dict(self.__types)
+
+    @property
+    def Containers(self) -> dict[str, dict]:
+        """
+        Gets the containers created, by id
+        :return:
+        """
+        with self.__lock:
+            return dict(self.__containers)
+
+    @property
+    def ValueCounts(self) -> dict[str, int]:
+        """
+        Gets the number of values received by each container
+        :return:
+        """
+        with self.__lock:
+            return dict(self.__value_counts)
+
+    @property
+    def Values(self) -> dict[str, list]:
+        """
+        Gets the values received by each container, when store_values is set
+        :return:
+        """
+        with self.__lock:
+            return {id: list(values) for id, values in self.__values.items()}
+
+    def stats(self) -> dict:
+        """
+        Gets a snapshot of the request statistics
+        :return: Dictionary of statistics
+        """
+        with self.__lock:
+            return {
+                'requests': self.__requests,
+                'bytes_received': self.__bytes_received,
+                'status_codes': dict(self.__status_codes),
+                'types': len(self.__types),
+                'containers': len(self.__containers),
+                'values': sum(self.__value_counts.values()),
+            }
+
+    def reset(self):
+        """
+        Forgets every type, container, value and statistic
+        """
+        with self.__lock:
+            self.__types.clear()
+            self.__containers.clear()
+            self.__value_counts.clear()
+            self.__values.clear()
+        self.resetStats()
+
+    def resetStats(self):
+        """
+        Resets the request statistics, keeping the types, containers and values
+        """
+        with self.__lock:
+            self.__requests = 0
+            self.__bytes_received = 0
+            self.__status_codes.clear()
+
+    def start(self):
+        """
+        Starts answering requests on a background thread
+        """
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, name='OMFEmulator', daemon=True
+        )
+        self.__thread.start()
+
+    def serveForever(self):
+        """
+        Answers requests on the calling thread until it is interrupted
+        """
+        self.__server.serve_forever()
+
+    def stop(self):
+        """
+        Stops answering requests and releases the port
+        """
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def respond(
+        self, path: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, dict[str, str], bytes]:
+        """
+        Waits for the configured latency, handles one OMF request and records it in the statistics
+        :param path: Path of the request
+        :param headers: Request headers with lower case names
+        :param body: Request body as received
+        :return: Status code, headers and body of the response
+        """
+        delay = self.Latency
+        if self.LatencyJitter:
+            with self.__lock:
+                delay += self.__random.uniform(0, self.LatencyJitter)
+        if delay:
+            time.sleep(delay)
+
+        try:
+            status_code = self.handle(path, headers, body)
+            response_headers = {}
+            content = b''
+        except OMFRejection as rejection:
+            status_code = rejection.StatusCode
+            response_headers = rejection.Headers
+            content = json.dumps({'Message': str(rejection)}).encode('utf-8')
+
+        with self.__lock:
+            self.__requests += 1
+            self.__bytes_received += len(body)
+            self.__status_codes[status_code] = (
+                self.__status_codes.get(status_code, 0) + 1
+            )
+        return status_code, response_headers, content
+
+    def handle(self, path: str, headers: dict[str, str], body: bytes) -> int:
+        """
+        Handles one OMF request and throws an OMFRejection when it is rejected
+        :param path: Path of the request
+        :param headers: Request headers with lower case names
+        :param body: Request body as received
+        :return: Status code of the successful response
+        """
+        self.__throttle()
+        with self.__lock:
+            failed = self.ErrorRate and self.__random.random() < self.ErrorRate
+        if failed:
+            raise OMFRejection(503, 'Service unavailable')
+        if not path.rstrip('/').lower().endswith('/omf'):
+            raise OMFRejection(404, f'Unknown path {path}')
+        if self.MaxBodySize is not None and len(body) > self.MaxBodySize:
+            raise OMFRejection(413, f'Body of {len(body)} bytes is too large')
+
+        message_type = headers.get('messagetype', '').lower()
+        action = headers.get('action', '').lower()
+        if message_type not in MESSAGE_TYPES:
+            raise OMFRejection(400, f'Invalid messagetype header: {message_type}')
+        if action not in ACTIONS:
+            raise OMFRejection(400, f'Invalid action header: {action}')
+        if headers.get('omfversion') not in OMF_VERSIONS:
+            raise OMFRejection(
+                400, f'Unsupported omfversion header: {headers.get("omfversion")}'
+            )
+        if headers.get('messageformat', 'json').lower() != 'json':
+            raise OMFRejection(400, 'Only the JSON message format is supported')
+
+        messages = self.__parse(headers, body)
+        with self.__lock:
+            if message_type == 'type':
+                self.__handleTypes(action, messages)
+            elif message_type == 'container':
+                self.__handleContainers(action, messages)
+            else:
+                self.__handleData(action, messages)
+        return 204 if action == 'delete' else 202
+
+    def __throttle(self):
+        if not self.MaxRequestsPerSecond:
+            return
+
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(
+                self.MaxRequestsPerSecond,
+                self.__tokens + (now - self.__last_refill) * self.MaxRequestsPerSecond,
+            )
+            self.__last_refill = now
+            if self.__tokens < 1:
+                retry_after = math.ceil((1 - self.__tokens) / self.MaxRequestsPerSecond)
+                raise OMFRejection(
+                    429, 'Too many requests', {'Retry-After': str(retry_after)}
+                )
+            self.__tokens -= 1
+
+    @staticmethod
+    def __parse(headers: dict[str, str], body: bytes) -> list[dict]:
+        if headers.get('compression', '').lower() == 'gzip':
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error) as error:
+                raise OMFRejection(400, f'Invalid gzip body: {error}')
+
+        try:
+            messages = json.loads(body)
+        except ValueError as error:
+            raise OMFRejection(400, f'Invalid JSON body: {error}')
+
+        if not isinstance(messages, list) or not all(
+            isinstance(message, dict) for message in messages
+        ):
+            raise OMFRejection(400, 'The body must be a JSON array of objects')
+
+        # OMF property names are case insensitive
+        return [
+            {key.lower(): value for key, value in message.items()}
+            for message in messages
+        ]
+
+    def __handleTypes(self, action: str, messages: list[dict]):
+        for message in messages:
+            if not message.get('id'):
+                raise OMFRejection(400, 'Type is missing its id')
+            existing = self.__types.get(message['id'])
+            if action == 'create' and existing is not None and existing != message:
+                raise OMFRejection(
+                    409,
+                    f'Type {message["id"]} already exists with a different definition',
+                )
+
+        for message in messages:
+            if action == 'delete':
+                self.__types.pop(message['id'], None)
+            else:
+                self.__types[message['id']] = message
+
+    def __handleContainers(self, action: str, messages: list[dict]):
+        for message in messages:
+            if not message.get('id'):
+                raise OMFRejection(400, 'Container is missing its id')
+            if action != 'delete' and message.get('typeid') not in self.__types:
+                raise OMFRejection(
+                    400,
+                    f'Container {message["id"]} references unknown type {message.get("typeid")}',
+                )
+            existing = self.__containers.get(message['id'])
+            if action == 'create' and existing is not None and existing != message:
+                raise OMFRejection(
+                    409,
+                    f'Container {message["id"]} already exists with a different definition',
+                )
+
+        for message in messages:
+            if action == 'delete':
+                self.__containers.pop(message['id'], None)
+                self.__value_counts.pop(message['id'], None)
+                self.__values.pop(message['id'], None)
+            else:
+                self.__containers[message['id']] = message
+
+    def __handleData(self, action: str, messages: list[dict]):
+        for message in messages:
+            container_id = message.get('containerid')
+            # Link data is sent to the built in __Link type instead of a container
+            if container_id is None and str(message.get('typeid', '')).startswith('__'):
+                continue
+            if container_id not in self.__containers:
+                raise OMFRejection(400, f'Unknown container {container_id}')
+            if not isinstance(message.get('values'), list):
+                raise OMFRejection(
+                    400, f'Data for container {container_id} is missing its values'
+                )
+
+        for message in messages:
+            container_id = message.get('containerid')
+            if container_id is None:
+                continue
+            values = message['values']
+            if action == 'delete':
+                continue
+            self.__value_counts[container_id] = self.__value_counts.get(
+                container_id, 0
+            ) + len(values)
+            if self.StoreValues:
+                self.__values.setdefault(container_id, []).extend(values)
+
+    def __createHandler(self):
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.readBody()
+                headers = {name.lower(): value for name, value in self.headers.items()}
+                status_code, response_headers, content = emulator.respond(
+                    self.path, headers, body
+                )
+
+                self.send_response(status_code)
+                for name, value in response_headers.items():
+                    self.send_header(name, value)
+                if content:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+            def readBody(self) -> bytes:
+                if self.headers.get('Transfer-Encoding', '').lower() != 'chunked':
+                    return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b';')[0], 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        return b''.join(chunks)
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+
+        return Handler
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+
+class OMFRejection(Exception):
+    """
+    Raised by the OMF emulator to answer a request with an error status code
+    """
+
+    def __init__(self, status_code: int, message: str, headers: dict[str, str] = None):
+        super().__init__(message)
+        self.StatusCode = status_code
+        self.Headers = headers or {}
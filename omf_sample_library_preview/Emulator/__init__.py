@@ -0,0 +1,2 @@
+from .OMFEmulator import OMFEmulator
+from .OMFRejection import OMFRejection
@@ -0,0 +1,38 @@
+"""
+Runs the OMF emulator until interrupted and prints its statistics on exit.
+Run with: python -m omf_sample_library_preview.Emulator --port 5000
+"""
+
+import argparse
+import json
+
+from .OMFEmulator import OMFEmulator
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-body-size', type=int, default=None)
+    parser.add_argument('--max-requests-per-second', type=float, default=None)
+    args = parser.parse_args()
+
+    emulator = OMFEmulator(
+        args.host,
+        args.port,
+        args.latency,
+        args.latency_jitter,
+        args.error_rate,
+        args.max_body_size,
+        args.max_requests_per_second,
+    )
+    print(f'OMF emulator listening on {emulator.Url}/omf')
+    try:
+        emulator.serveForever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+        print(json.dumps(emulator.stats(), indent=2))
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .OMFData import OMFData
+from .OMFType import OMFType
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Datetime units from the coarsest to the finest, used to format timestamps without trailing zeros
+TIME_UNITS = ['s', 'ms', 'us', 'ns']
+
+
+def requireNumpy():
+    if np is None:
+        raise ImportError(
+            'OMFArrayData requires numpy, install it with: pip install omf_sample_library_preview[numpy]'
+        )
+
+
+def encodeColumn(column: np.ndarray) -> np.ndarray:
+    """
+    Encodes every value of a NumPy column to json at once. NaN, infinities and NaT are encoded as null, since json
+    has no representation for them.
+    :param column: Column of values
+    :return: Array of json byte strings
+    """
+    kind = column.dtype.kind
+    null = None
+    if kind == 'M':
+        null = np.isnat(column)
+        unit = np.datetime_data(column.dtype)[0]
+        units = (
+            TIME_UNITS[: TIME_UNITS.index(unit) + 1] if unit in TIME_UNITS else [unit]
+        )
+        valid = column[~null]
+        for unit in units:
+            if unit == units[-1] or np.all(
+                valid.astype(f'datetime64[{unit}]') == valid
+            ):
+                break
+        encoded = np.char.add(
+            np.char.add(b'"', np.datetime_as_string(column, unit=unit).astype('S')),
+            b'"',
+        )
+    elif kind == 'f':
+        null = ~np.isfinite(column)
+        encoded = column.astype('S')
+    elif kind in 'iu':
+        encoded = column.astype('S')
+    elif kind == 'b':
+        encoded = np.where(column, b'true', b'false')
+    else:
+        # Strings and objects need json escaping, which NumPy cannot do in bulk
+        encoded = np.array([json.dumps(value) for value in column.tolist()], dtype='S')
+
+    if null is not None and null.any():
+        encoded = np.where(null, b'null', encoded)
+    return encoded
+
+
+@dataclass
+class OMFArrayData(OMFData):
+    """
+    OMFData whose values are held in a NumPy structured array with one field per OMF type property.
+    Values are encoded to json column by column without creating a Python object per value.
+    """
+
+    def toJson(self) -> str:
+        envelope = replace(self, Values=None)
+        rest = OMFData.toDictionary(envelope)
+        rest = ', ' + json.dumps(rest)[1:-1] if rest else ''
+        if len(self.Values) == 0:
+            return '{' + rest[2:] + '}'
+
+        # Build every row as a fixed width byte string, padded with null bytes that are removed afterwards
+        names = self.Values.dtype.names
+        rows = None
+        for index, name in enumerate(names):
+            prefix = ('{' if index == 0 else ', ') + json.dumps(name) + ': '
+            column = np.char.add(
+                prefix.encode('ascii'), encodeColumn(self.Values[name])
+            )
+            rows = column if rows is None else np.char.add(rows, column)
+        rows = np.char.add(rows, b'}, ')
+        values = rows.tobytes().replace(b'\x00', b'')[:-2].decode('ascii')
+
+        return '{"Values": [' + values + ']' + rest + '}'
+
+    def toDictionary(self) -> dict[str, Any]:
+        return json.loads(self.toJson())
+
+    @staticmethod
+    def fromArrays(
+        omf_type: OMFType = None,
+        container_id: str = None,
+        type_id: str = None,
+        **columns: np.ndarray,
+    ) -> OMFArrayData:
+        """
+        Creates OMFData from parallel NumPy arrays, one per OMF type property
+        :param omf_type: Optional OMF type, used to order and validate the columns and as the type id
+        :param container_id: Id of the container the values belong to
+        :param type_id: Id of the type of the values, defaults to the id of omf_type
+        :param columns: Arrays of values keyed by property name
+        :return: OMFArrayData
+        """
+        requireNumpy()
+        arrays = {name: np.asarray(column) for name, column in columns.items()}
+        lengths = {len(column) for column in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError('All columns must have the same length')
+
+        names = OMFArrayData.__propertyNames(omf_type, list(arrays))
+        values = np.rec.fromarrays([arrays[name] for name in names], names=names)
+        return OMFArrayData.fromStructuredArray(
+            values.view(np.ndarray), omf_type, container_id, type_id
+        )
+
+    @staticmethod
+    def fromStructuredArray(
+        values: np.ndarray,
+        omf_type: OMFType = None,
+        container_id: str = None,
+        type_id: str = None,
+    ) -> OMFArrayData:
+        """
+        Creates OMFData from a NumPy structured array whose field names are the OMF type property names
+        :param values: Structured array of values
+        :param omf_type: Optional OMF type, used to order and validate the fields and as the type id
+        :param container_id: Id of the container the values belong to
+        :param type_id: Id of the type of the values, defaults to the id of omf_type
+        :return: OMFArrayData
+        """
+        requireNumpy()
+        if values.dtype.names is None:
+            raise ValueError('Values must be a structured array')
+
+        names = OMFArrayData.__propertyNames(omf_type, list(values.dtype.names))
+        if list(values.dtype.names) != names:
+            values = values[names]
+        if type_id is None and omf_type is not None:
+            type_id = omf_type.Id
+
+        return OMFArrayData(values, type_id, container_id)
+
+    @staticmethod
+    def __propertyNames(omf_type: OMFType, names: list[str]) -> list[str]:
+        if omf_type is None or not omf_type.Properties:
+            return names
+
+        unknown = set(names) - set(omf_type.Properties)
+        if unknown:
+            raise ValueError(
+                f'Columns {sorted(unknown)} are not properties of type {omf_type.Id}'
+            )
+        return [name for name in omf_type.Properties if name in names]
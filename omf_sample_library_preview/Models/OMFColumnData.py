@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, replace
+from typing import Any, Iterable
+
+from .OMFColumns import OMFColumns
+from .OMFData import OMFData
+from .OMFType import OMFType
+
+
+@dataclass
+class OMFColumnData(OMFData):
+    """
+    OMFData whose values are held in OMFColumns, using a few bytes per property instead of a Python object per
+    value, for collectors that buffer millions of values. Serializes to the same json as OMFData holding the values.
+    """
+
+    def toDictionary(self) -> dict[str, Any]:
+        # Values is the first field of OMFData, so it comes first like in the serialized OMFData
+        result = {'Values': self.Values.toRows()} if len(self.Values) else {}
+        result.update(OMFData.toDictionary(replace(self, Values=None)))
+        return result
+
+    def toJson(self) -> str:
+        return json.dumps(self.toDictionary())
+
+    def append(self, value: Any):
+        """
+        Adds a value
+        :param value: Object with one attribute per property, dictionary or tuple in the order of the properties
+        """
+        self.Values.append(value)
+
+    def extend(self, values: Iterable[Any]):
+        """
+        Adds several values
+        :param values: Objects with one attribute per property, dictionaries or tuples in the order of the properties
+        """
+        self.Values.extend(values)
+
+    @staticmethod
+    def fromValues(
+        omf_type: OMFType,
+        values: Iterable[Any] = (),
+        container_id: str = None,
+        type_id: str = None,
+    ) -> OMFColumnData:
+        """
+        Creates OMFData holding values column by column
+        :param omf_type: OMF type of the values, whose properties are the columns
+        :param values: Values to add, as objects with one attribute per property, dictionaries or tuples
+        :param container_id: Id of the container the values belong to
+        :param type_id: Id of the type of the values, defaults to the id of omf_type
+        :return: OMFColumnData
+        """
+        if type_id is None:
+            type_id = omf_type.Id
+        return OMFColumnData(OMFColumns(omf_type, values), type_id, container_id)
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator
+
+from .OMFFormatCode import OMFFormatCode
+from .OMFType import OMFType
+from .OMFTypeCode import OMFTypeCode
+from .OMFTypeProperty import OMFTypeProperty
+from .Serializeable import convertField, serializeValue
+
+EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class OMFColumns(object):
+    """
+    Compact sequence of OMF values holding one column per OMF type property. Numbers, integers, booleans and
+    timestamps are kept in stdlib arrays of 8 bytes or less per value instead of a Python object per value. Other
+    properties, and columns receiving a value their array cannot hold exactly, such as an int in a Number column or
+    a NaN in a nullable one, are kept in lists.
+    Rows read back are dictionaries without their falsy properties, like the values of a dataclass serialized by
+    OMFData, so that both serialize to the same json.
+    """
+
+    def __init__(self, omf_type: OMFType, rows: Iterable[Any] = ()):
+        """
+        :param omf_type: OMF type of the values, whose properties are the columns
+        :param rows: Values to add, as objects with one attribute per property, dictionaries or tuples
+        """
+        if not omf_type.Properties:
+            raise ValueError(f'Type {omf_type.Id} has no properties')
+
+        self.__omf_type = omf_type
+        self.__names = list(omf_type.Properties)
+        self.__columns = [
+            _Column.fromTypeProperty(type_property)
+            for type_property in omf_type.Properties.values()
+        ]
+        self.__getter = attrgetter(*self.__names)
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return len(self.__columns[0].Values)
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | OMFColumns:
+        if isinstance(index, slice):
+            result = OMFColumns.__new__(OMFColumns)
+            result.__omf_type = self.__omf_type
+            result.__names = self.__names
+            result.__columns = [column.slice(index) for column in self.__columns]
+            result.__getter = self.__getter
+            return result
+
+        values = [column.decode(column.Values[index]) for column in self.__columns]
+        return {name: value for name, value in zip(self.__names, values) if value}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        names = self.__names
+        for values in self.iterValues():
+            yield {name: value for name, value in zip(names, values) if value}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, OMFColumns):
+            return NotImplemented
+        return self.__names == other.__names and list(self) == list(other)
+
+    @property
+    def OMFType(self) -> OMFType:
+        """
+        Gets the OMF type of the values
+        :return:
+        """
+        return self.__omf_type
+
+    @property
+    def Names(self) -> list[str]:
+        """
+        Gets the property names, in the order of the columns
+        :return:
+        """
+        return list(self.__names)
+
+    @property
+    def ItemSize(self) -> int:
+        """
+        Gets the number of bytes used per row by the array columns. List columns use a pointer per row plus the
+        size of their values.
+        :return:
+        """
+        return sum(column.ItemSize for column in self.__columns)
+
+    def append(self, row: Any):
+        """
+        Adds a value
+        :param row: Object with one attribute per property, dictionary or tuple in the order of the properties
+        """
+        if isinstance(row, dict):
+            values = [row.get(name) for name in self.__names]
+        elif isinstance(row, (tuple, list)):
+            values = row
+        else:
+            values = self.__getter(row)
+            if len(self.__names) == 1:
+                values = (values,)
+
+        if len(values) != len(self.__columns):
+            raise ValueError(
+                f'Expected {len(self.__columns)} values per row, got {len(values)}'
+            )
+        for column, value in zip(self.__columns, values):
+            column.append(value)
+
+    def extend(self, rows: Iterable[Any]):
+        """
+        Adds several values
+        :param rows: Objects with one attribute per property, dictionaries or tuples in the order of the properties
+        """
+        for row in rows:
+            self.append(row)
+
+    def iterValues(self) -> Iterator[tuple]:
+        """
+        Gets the serialized values of every row, including the falsy ones that rows leave out
+        :return: Iterator of tuples in the order of the properties
+        """
+        return zip(*[column.decodeAll() for column in self.__columns])
+
+    def toRows(self) -> list[dict[str, Any]]:
+        """
+        Gets the values as serialized dictionaries
+        :return: List of dictionaries
+        """
+        return list(self)
+
+
+class _Column(object):
+    """
+    Values of one property, in an array when the property has a fixed size type, with the functions converting a
+    value to its stored form and back to its json form
+    """
+
+    def __init__(
+        self,
+        values: array | list,
+        encode: Callable[[Any], Any] = None,
+        decode: Callable[[Any], Any] = None,
+        date_time: bool = False,
+    ):
+        self.Values = values
+        self.encode = encode
+        self.decode = decode or _decodeObject
+        self.DateTime = date_time
+
+    @staticmethod
+    def fromTypeProperty(type_property: OMFTypeProperty) -> _Column:
+        codes = (
+            type_property.Type
+            if isinstance(type_property.Type, list)
+            else [type_property.Type]
+        )
+        nullable = OMFTypeCode.Null in codes
+        codes = [code for code in codes if code is not OMFTypeCode.Null]
+        code = codes[0] if len(codes) == 1 else None
+
+        if code is OMFTypeCode.Number:
+            if nullable:
+                return _Column(array('d'), _encodeNullableNumber, _decodeNullableNumber)
+            return _Column(array('d'), _encodeNumber, _decodeNumber)
+        if code is OMFTypeCode.Integer and not nullable:
+            typecode = 'Q' if type_property.Format is OMFFormatCode.Uint64 else 'q'
+            return _Column(array(typecode), _encodeInteger, _decodeInteger)
+        if code is OMFTypeCode.Boolean and not nullable:
+            return _Column(array('b'), _encodeBoolean, bool)
+        if (
+            code is OMFTypeCode.String
+            and type_property.Format is OMFFormatCode.DateTime
+        ):
+            return _Column(array('q'), date_time=True)
+        return _Column([])
+
+    @property
+    def ItemSize(self) -> int:
+        return self.Values.itemsize if isinstance(self.Values, array) else 0
+
+    def append(self, value: Any):
+        if isinstance(self.Values, list):
+            self.Values.append(value)
+            return
+
+        if self.DateTime:
+            self.__appendDateTime(value)
+            return
+
+        try:
+            self.Values.append(value if self.encode is None else self.encode(value))
+        except (TypeError, OverflowError):
+            self.__toList()
+            self.Values.append(value)
+
+    def decodeAll(self) -> Iterable[Any]:
+        if self.decode is _decodeNumber or self.decode is _decodeInteger:
+            return self.Values
+        return map(self.decode, self.Values)
+
+    def slice(self, index: slice) -> _Column:
+        return _Column(self.Values[index], self.encode, self.decode, self.DateTime)
+
+    def __appendDateTime(self, value: Any):
+        # The first timestamp decides whether the column holds naive or UTC timestamps, the text of others could not
+        # be reproduced from a number so they turn the column into a list
+        if value.__class__ is datetime:
+            if value.tzinfo is None:
+                if self.encode in (None, _encodeNaive):
+                    self.encode, self.decode = _encodeNaive, _decodeNaive
+                    self.Values.append(_encodeNaive(value))
+                    return
+            elif value.utcoffset() == timedelta(0):
+                if self.encode in (None, _encodeUTC):
+                    self.encode, self.decode = _encodeUTC, _decodeUTC
+                    self.Values.append(_encodeUTC(value))
+                    return
+
+        self.__toList()
+        self.Values.append(value)
+
+    def __toList(self):
+        decode = self.decode
+        self.Values = [decode(value) for value in self.Values]
+        self.encode = None
+        self.decode = _decodeObject
+        self.DateTime = False
+
+
+def _decodeObject(value: Any) -> Any:
+    return convertField(serializeValue(value))
+
+
+def _decodeNumber(value: float) -> float:
+    return value
+
+
+def _decodeInteger(value: int) -> int:
+    return value
+
+
+def _encodeNumber(value: float) -> float:
+    # Ints and bools would come back as floats, so only floats are stored in the array
+    if not isinstance(value, float):
+        raise TypeError(f'{value!r} is not a float')
+    return value
+
+
+def _encodeNullableNumber(value: float | None) -> float:
+    # NaN marks the missing values, so a NaN value could not be told apart from None
+    if value is None:
+        return math.nan
+    if not isinstance(value, float) or value != value:
+        raise TypeError(f'{value!r} is not a float other than NaN')
+    return value
+
+
+def _encodeInteger(value: int) -> int:
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError(f'{value!r} is not an int')
+    return value
+
+
+def _encodeBoolean(value: bool) -> bool:
+    if value is not True and value is not False:
+        raise TypeError(f'{value!r} is not a bool')
+    return value
+
+
+def _decodeNullableNumber(value: float) -> float | None:
+    return None if value != value else value
+
+
+def _encodeNaive(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _decodeNaive(value: int) -> str:
+    return (EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def _encodeUTC(value: datetime) -> int:
+    return (value - UTC_EPOCH) // timedelta(microseconds=1)
+
+
+def _decodeUTC(value: int) -> str:
+    return (UTC_EPOCH + timedelta(microseconds=value)).isoformat()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any, Generic, TypeVar
 
 from .Serializeable import Serializeable
@@ -14,3 +14,12 @@ class OMFData(Generic[T], Serializeable):
     TypeId: str = None
     ContainerId: str = None
     Properties: dict[str, Any] = None
+
+    def slice(self, start: int, stop: int) -> OMFData[T]:
+        """
+        Creates a copy of this message containing only a range of its values
+        :param start: Index of the first value
+        :param stop: Index after the last value
+        :return: OMFData with the same TypeId, ContainerId and Properties
+        """
+        return replace(self, Values=self.Values[start:stop])
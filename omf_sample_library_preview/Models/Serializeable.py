@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import copy
 import json
-from dataclasses import asdict
+from dataclasses import fields, is_dataclass
 from datetime import datetime
 from enum import Enum
-from types import UnionType
-from typing import Any, get_args, get_origin, get_type_hints
+from types import NoneType, UnionType
+from typing import (Any, Callable, TypeVar, Union, get_args, get_origin,
+                    get_type_hints)
+
+# Types that copy.deepcopy returns unchanged and that dictionaryFactory keeps as is
+SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Serializers compiled by getSerializer, keyed by dataclass
+serializers: dict[type, Callable[[Any], dict]] = {}
+
+# Decoders compiled by getDecoder, keyed by Serializeable class
+decoders: dict[type, Callable[[dict], Any]] = {}
 
 
 def dictionaryFactory(data):
@@ -29,6 +40,133 @@ def dictionaryFactory(data):
     return dict(new_list)
 
 
+def serializeValue(value):
+    """
+    Converts a value nested in a dataclass the same way dataclasses.asdict does with dictionaryFactory
+    :param value: Value to convert
+    :return: Converted value
+    """
+    value_type = type(value)
+    if value_type in SCALAR_TYPES:
+        return value
+
+    serializer = serializers.get(value_type)
+    if serializer is not None:
+        return serializer(value)
+
+    if value_type is list:
+        return [serializeValue(item) for item in value]
+
+    if value_type is dict:
+        return {serializeValue(k): serializeValue(v) for k, v in value.items()}
+
+    if isinstance(value, Enum) or value_type is datetime:
+        return value
+
+    if is_dataclass(value) and not isinstance(value, type):
+        return getSerializer(value_type)(value)
+
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        return value_type(*[serializeValue(item) for item in value])
+
+    if isinstance(value, (list, tuple)):
+        return value_type(serializeValue(item) for item in value)
+
+    if isinstance(value, dict):
+        if hasattr(value_type, 'default_factory'):
+            result = value_type(value.default_factory)
+            for k, v in value.items():
+                result[serializeValue(k)] = serializeValue(v)
+            return result
+        return value_type(
+            (serializeValue(k), serializeValue(v)) for k, v in value.items()
+        )
+
+    return copy.deepcopy(value)
+
+
+def convertField(value):
+    """
+    Converts the value of a dataclass field, already converted by serializeValue, the same way dictionaryFactory does
+    :param value: Value of the field
+    :return: Converted value
+    """
+    value_type = type(value)
+    if value_type is datetime:
+        return value.isoformat()
+    if value_type is list and isinstance(value[0], Enum):
+        return [item.value.lower() for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def compileSerializer(cls: type) -> Callable[[Any], dict]:
+    """
+    Generates a function that converts an instance of a dataclass to a dictionary.
+    The result is the same as dataclasses.asdict with dictionaryFactory, without the recursive deep copy.
+    :param cls: Dataclass to compile a serializer for
+    :return: Serializer function
+    """
+    try:
+        type_hints = get_type_hints(cls)
+    except Exception:
+        type_hints = {}
+
+    namespace = {
+        'serializeValue': serializeValue,
+        'convertField': convertField,
+        'scalar_types': SCALAR_TYPES,
+        'datetime': datetime,
+    }
+    lines = ['def serialize(obj):', '    result = {}']
+    for index, field in enumerate(fields(cls)):
+        key = repr(field.name)
+        lines.append(f'    value = obj.{field.name}')
+        lines.append('    if value:')
+
+        # Fast path for the kind of value the type hint promises, anything else takes the generic path
+        type_hint = type_hints.get(field.name)
+        if type_hint in SCALAR_TYPES:
+            fast_path = ('value.__class__ in scalar_types', 'value')
+        elif type_hint is datetime:
+            fast_path = ('value.__class__ is datetime', 'value.isoformat()')
+        elif isinstance(type_hint, type) and issubclass(type_hint, Enum):
+            namespace[f'enum_{index}'] = type_hint
+            fast_path = (f'value.__class__ is enum_{index}', 'value.value')
+        else:
+            fast_path = None
+
+        indent = '        '
+        if fast_path:
+            lines.append(f'        if {fast_path[0]}:')
+            lines.append(f'            result[{key}] = {fast_path[1]}')
+            lines.append('        else:')
+            indent = '            '
+        lines.append(f'{indent}value = serializeValue(value)')
+        lines.append(f'{indent}if value:')
+        lines.append(f'{indent}    result[{key}] = convertField(value)')
+    lines.append('    return result')
+
+    exec('\n'.join(lines), namespace)
+    return namespace['serialize']
+
+
+def getSerializer(cls: type) -> Callable[[Any], dict]:
+    """
+    Gets the compiled serializer of a dataclass, compiling it on first use
+    :param cls: Dataclass
+    :return: Serializer function
+    """
+    serializer = serializers.get(cls)
+    if serializer is None:
+        if not is_dataclass(cls):
+            raise TypeError('toDictionary() should be called on dataclass instances')
+        serializer = compileSerializer(cls)
+        serializers[cls] = serializer
+    return serializer
+
+
 def deserialize(field_type, field_value):
     if isinstance(field_type, UnionType):
         args = get_args(field_type)
@@ -36,7 +174,7 @@ def deserialize(field_type, field_value):
         for arg in args:
             try:
                 return deserialize(arg, field_value)
-            except:
+            except Exception:
                 pass
 
         return result
@@ -64,18 +202,210 @@ def deserialize(field_type, field_value):
     return field_type(field_value)
 
 
+def compileValueDecoder(type_hint) -> Callable[[Any], Any] | None:
+    """
+    Generates a function that converts a json value to the python type of a field, resolving everything that
+    deserialize works out on every call ahead of time
+    :param type_hint: Type hint of the field
+    :return: Decoder function, or None when the json value is used as is
+    """
+    if type_hint is Any or type_hint is NoneType or isinstance(type_hint, TypeVar):
+        return None
+
+    if isinstance(type_hint, UnionType) or get_origin(type_hint) is Union:
+        return compileUnionDecoder(type_hint)
+
+    origin = get_origin(type_hint)
+    if origin is list:
+        item_decoder = compileValueDecoder(get_args(type_hint)[0])
+        if item_decoder is None:
+            return list
+        return lambda value: [item_decoder(item) for item in value]
+
+    if origin is dict:
+        key_type, value_type = get_args(type_hint)
+        key_decoder = compileValueDecoder(key_type) or (lambda key: key)
+        value_decoder = compileValueDecoder(value_type) or (lambda item: item)
+        return lambda value: {
+            key_decoder(key): value_decoder(item) for key, item in value.items()
+        }
+
+    if not isinstance(type_hint, type):
+        return lambda value: deserialize(type_hint, value)
+
+    if issubclass(type_hint, Serializeable):
+        if type_hint.fromJson.__func__ is not Serializeable.fromJson.__func__:
+            return type_hint.fromJson
+        # Looked up on use, since classes can refer to themselves
+        return lambda value: getDecoder(type_hint)(value)
+
+    if issubclass(type_hint, Enum):
+        return compileEnumDecoder(type_hint)
+
+    if type_hint is datetime:
+        return lambda value: (
+            datetime.fromisoformat(value) if value.__class__ is str else value
+        )
+
+    return lambda value: value if value.__class__ is type_hint else type_hint(value)
+
+
+def getEnumMembers(enum_type: type[Enum]) -> dict[Any, Enum]:
+    """
+    Gets the members of an enumeration by value, and by lower case value since lists of type codes are serialized in
+    lower case
+    :param enum_type: Enumeration
+    :return: Members by value
+    """
+    members = dict(enum_type._value2member_map_)
+    for value, member in enum_type._value2member_map_.items():
+        if isinstance(value, str):
+            members.setdefault(value.lower(), member)
+    return members
+
+
+def compileEnumDecoder(enum_type: type[Enum]) -> Callable[[Any], Enum]:
+    """
+    Generates a function that converts a json value to a member of an enumeration, ignoring the case of the value
+    :param enum_type: Enumeration
+    :return: Decoder function
+    """
+    members = getEnumMembers(enum_type)
+
+    def decode(value):
+        if value.__class__ is str:
+            member = members.get(value) or members.get(value.lower())
+            if member is not None:
+                return member
+        return enum_type(value)
+
+    return decode
+
+
+def compileUnionDecoder(type_hint) -> Callable[[Any], Any]:
+    """
+    Generates a function that converts a json value to the first member of a union whose kind matches the value,
+    without trying every member. Values that match no member take the slower deserialize path.
+    :param type_hint: Union type hint
+    :return: Decoder function
+    """
+    branches = []
+    for arg in get_args(type_hint):
+        predicate = compilePredicate(arg)
+        if predicate is not None:
+            branches.append((predicate, compileValueDecoder(arg) or (lambda v: v)))
+
+    def decode(value):
+        for predicate, decoder in branches:
+            if predicate(value):
+                return decoder(value)
+        return deserialize(type_hint, value)
+
+    return decode
+
+
+def compilePredicate(type_hint) -> Callable[[Any], bool] | None:
+    """
+    Gets a function telling whether a json value has the kind of a member of a union
+    :param type_hint: Type hint of the union member
+    :return: Predicate function, or None when the member cannot be recognized from the value
+    """
+    if type_hint is NoneType:
+        return lambda value: value is None
+    if type_hint is Any or isinstance(type_hint, TypeVar):
+        return lambda value: True
+
+    origin = get_origin(type_hint)
+    if origin is list:
+        return lambda value: value.__class__ is list
+    if origin is dict:
+        return lambda value: value.__class__ is dict
+    if not isinstance(type_hint, type):
+        return None
+
+    if issubclass(type_hint, Serializeable):
+        return lambda value: value.__class__ is dict
+    if issubclass(type_hint, Enum):
+        members = getEnumMembers(type_hint)
+        return lambda value: value.__class__ is str and (
+            value in members or value.lower() in members
+        )
+    if type_hint is bool:
+        return lambda value: value.__class__ is bool
+    if type_hint is int:
+        return lambda value: value.__class__ is int
+    if type_hint is float:
+        return lambda value: value.__class__ is float or value.__class__ is int
+    if type_hint is str or type_hint is datetime:
+        return lambda value: value.__class__ is str
+    return lambda value: isinstance(value, type_hint)
+
+
+def compileDecoder(cls: type) -> Callable[[dict], Any]:
+    """
+    Generates a function that creates an instance of a Serializeable class from a dictionary, with the type hints of
+    its fields resolved once
+    :param cls: Serializeable class to compile a decoder for
+    :return: Decoder function
+    """
+    namespace = {'cls': cls}
+    lines = ['def decode(content):', '    kwargs = {}']
+    for index, (field, type_hint) in enumerate(get_type_hints(cls).items()):
+        key = repr(field)
+        decoder = compileValueDecoder(type_hint)
+        if decoder is None:
+            lines.append(f'    if {key} in content:')
+            lines.append(f'        kwargs[{key}] = content[{key}]')
+            continue
+
+        namespace[f'decoder_{index}'] = decoder
+        lines.append(f'    if {key} in content:')
+        lines.append(f'        value = content[{key}]')
+
+        # Fast path for scalars that already have the type of the field
+        if type_hint in SCALAR_TYPES:
+            namespace[f'type_{index}'] = type_hint
+            lines.append(
+                f'        kwargs[{key}] = value if value.__class__ is type_{index} else decoder_{index}(value)'
+            )
+        else:
+            lines.append(f'        kwargs[{key}] = decoder_{index}(value)')
+    lines.append('    return cls(**kwargs)')
+
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
+
+
+def getDecoder(cls: type) -> Callable[[dict], Any]:
+    """
+    Gets the compiled decoder of a Serializeable class, compiling it on first use
+    :param cls: Serializeable class
+    :return: Decoder function
+    """
+    decoder = decoders.get(cls)
+    if decoder is None:
+        decoder = compileDecoder(cls)
+        decoders[cls] = decoder
+    return decoder
+
+
 class Serializeable:
     def toDictionary(self):
-        return asdict(self, dict_factory=dictionaryFactory)
+        return getSerializer(type(self))(self)
 
     def toJson(self):
         return json.dumps(self.toDictionary())
 
     @classmethod
     def fromJson(cls, content: dict[str, Any]):
-        test = {}
-        for field, field_type in get_type_hints(cls).items():
-            if field in content:
-                test.update({field: deserialize(field_type, content[field])})
+        return getDecoder(cls)(content)
 
-        return cls(**test)
+    @classmethod
+    def fromJsonMany(cls, contents: list[dict[str, Any]]) -> list:
+        """
+        Creates an instance for each dictionary of a list, for example the messages of a captured OMF request body
+        :param contents: Dictionaries
+        :return: Instances of the class
+        """
+        decoder = getDecoder(cls)
+        return [decoder(content) for content in contents]
@@ -1,4 +1,7 @@
+from .OMFArrayData import OMFArrayData
 from .OMFClassification import OMFClassification
+from .OMFColumnData import OMFColumnData
+from .OMFColumns import OMFColumns
 from .OMFContainer import OMFContainer
 from .OMFData import OMFData
 from .OMFEnum import OMFEnum
@@ -0,0 +1,49 @@
+from ..Client.AsyncOMFClient import AsyncOMFClient
+from ..Models.OMFData import OMFData
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+
+
+class AsyncDataService:
+    def __init__(self, omf_client: AsyncOMFClient):
+        self.__omf_client = omf_client
+
+    @property
+    def OMFClient(self) -> AsyncOMFClient:
+        return self.__omf_client
+
+    async def createData(self, omf_data: list[OMFData]):
+        """
+        Creates OMF Data and throws error on failure
+        :param omf_data: List of OMF Data
+        """
+        response = await self.__omf_client.omfRequest(
+            OMFMessageType.Data,
+            OMFMessageAction.Create,
+            omf_data,
+        )
+        self.__omf_client.verifySuccessfulResponse(response, 'Failed to create data')
+
+    async def updateData(self, omf_data: list[OMFData]):
+        """
+        Updates OMF Data and throws error on failure
+        :param omf_data: List of OMF Data
+        """
+        response = await self.__omf_client.omfRequest(
+            OMFMessageType.Data,
+            OMFMessageAction.Update,
+            omf_data,
+        )
+        self.__omf_client.verifySuccessfulResponse(response, 'Failed to update data')
+
+    async def deleteData(self, omf_data: list[OMFData]):
+        """
+        Deletes OMF Data and throws error on failure
+        :param omf_data: List of OMF Data
+        """
+        response = await self.__omf_client.omfRequest(
+            OMFMessageType.Data,
+            OMFMessageAction.Delete,
+            omf_data,
+        )
+        self.__omf_client.verifySuccessfulResponse(response, 'Failed to delete data')
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from ..Client.AsyncOMFClient import AsyncOMFClient
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from ..Models.OMFType import OMFType
+from .AsyncContainerService import AsyncContainerService
+from .AsyncDataService import AsyncDataService
+from .AsyncTypeService import AsyncTypeService
+from .DefinitionRegistry import DefinitionRegistry
+
+
+class AsyncGeneralService:
+    def __init__(
+        self,
+        omf_client: AsyncOMFClient,
+        max_workers: int = 1,
+        chunk_size: int = 1000,
+        registry: DefinitionRegistry = None,
+    ):
+        """
+        :param omf_client: OMF client used to send the messages
+        :param max_workers: Number of requests in flight within each phase, 1 sends each phase as a single request
+        :param chunk_size: Number of OMF objects per request when sending concurrently
+        :param registry: Optional registry of the types and containers already created, used to skip unchanged ones
+        """
+        self.__omf_client = omf_client
+        self.__max_workers = max_workers
+        self.__chunk_size = chunk_size
+        self.__container_service = AsyncContainerService(omf_client, registry)
+        self.__data_service = AsyncDataService(omf_client)
+        self.__type_service = AsyncTypeService(omf_client, registry)
+
+    @property
+    def OMFClient(self) -> AsyncOMFClient:
+        return self.__omf_client
+
+    @property
+    def MaxWorkers(self) -> int:
+        return self.__max_workers
+
+    @property
+    def ChunkSize(self) -> int:
+        return self.__chunk_size
+
+    @property
+    def ContainerService(self) -> AsyncContainerService:
+        return self.__container_service
+
+    @property
+    def DataService(self) -> AsyncDataService:
+        return self.__data_service
+
+    @property
+    def TypeService(self) -> AsyncTypeService:
+        return self.__type_service
+
+    @staticmethod
+    def __split_omf_objects(
+        omf_objects: list[OMFType | OMFContainer | OMFData],
+    ) -> (list[OMFType], list[OMFContainer], list[OMFData]):
+        types = []
+        containers = []
+        data = []
+        for omf_object in omf_objects:
+            if isinstance(omf_object, OMFType):
+                types.append(omf_object)
+            elif isinstance(omf_object, OMFContainer):
+                containers.append(omf_object)
+            elif isinstance(omf_object, OMFData):
+                data.append(omf_object)
+            else:
+                raise TypeError('Invalid OMF Object type')
+
+        return types, containers, data
+
+    async def __dispatch(
+        self, send: Callable[[list], Awaitable[None]], omf_objects: list
+    ):
+        """
+        Sends one phase of OMF objects, concurrently in chunks when more than one worker is configured.
+        Returns only once every chunk of the phase has been sent. On the first error the other chunks are cancelled,
+        and the error is thrown.
+        """
+        if len(omf_objects) == 0:
+            return
+
+        if self.__max_workers <= 1 or len(omf_objects) <= self.__chunk_size:
+            await send(omf_objects)
+            return
+
+        chunks = [
+            omf_objects[i : i + self.__chunk_size]
+            for i in range(0, len(omf_objects), self.__chunk_size)
+        ]
+        semaphore = asyncio.Semaphore(self.__max_workers)
+
+        async def sendChunk(chunk: list):
+            async with semaphore:
+                await send(chunk)
+
+        tasks = [asyncio.ensure_future(sendChunk(chunk)) for chunk in chunks]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in tasks:
+            if task in done:
+                task.result()
+
+    async def create(self, omf_objects: list[OMFType | OMFContainer | OMFData]):
+        """
+        Creates OMF Objects and throws error on failure.
+        Types are created before containers, and containers before data.
+        :param omf_objects: List of OMF Objects
+        """
+        types, containers, data = self.__split_omf_objects(omf_objects)
+        await self.__dispatch(self.TypeService.createTypes, types)
+        await self.__dispatch(self.ContainerService.createContainers, containers)
+        await self.__dispatch(self.DataService.createData, data)
+
+    async def update(self, omf_objects: list[OMFType | OMFContainer | OMFData]):
+        """
+        Updates OMF Objects and throws error on failure.
+        Types are updated before containers, and containers before data.
+        :param omf_objects: List of OMF Objects
+        """
+        types, containers, data = self.__split_omf_objects(omf_objects)
+        await self.__dispatch(self.TypeService.updateTypes, types)
+        await self.__dispatch(self.ContainerService.updateContainers, containers)
+        await self.__dispatch(self.DataService.updateData, data)
+
+    async def delete(self, omf_objects: list[OMFType | OMFContainer | OMFData]):
+        """
+        Deletes OMF Objects and throws error on failure.
+        Data is deleted before containers, and containers before types.
+        :param omf_objects: List of OMF Objects
+        """
+        types, containers, data = self.__split_omf_objects(omf_objects)
+        await self.__dispatch(self.DataService.deleteData, data)
+        await self.__dispatch(self.ContainerService.deleteContainers, containers)
+        await self.__dispatch(self.TypeService.deleteTypes, types)
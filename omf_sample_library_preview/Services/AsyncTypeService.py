@@ -0,0 +1,73 @@
+from ..Client.AsyncOMFClient import AsyncOMFClient
+from ..Models.OMFMessageAction import OMFMessageAction
+from ..Models.OMFMessageType import OMFMessageType
+from ..Models.OMFType import OMFType
+from .DefinitionRegistry import DefinitionRegistry
+
+
+class AsyncTypeService:
+    def __init__(self, omf_client: AsyncOMFClient, registry: DefinitionRegistry = None):
+        """
+        :param omf_client: OMF client used to send the messages
+        :param registry: Optional registry of the types already created, used to skip unchanged types
+        """
+        self.__omf_client = omf_client
+        self.__registry = registry
+
+    @property
+    def OMFClient(self) -> AsyncOMFClient:
+        return self.__omf_client
+
+    @property
+    def Registry(self) -> DefinitionRegistry:
+        return self.__registry
+
+    async def createTypes(self, omf_types: list[OMFType]):
+        """
+        Creates OMF Types and throws error on failure.
+        Types registered unchanged in the registry are skipped.
+        :param omf_types: List of OMF Types
+        """
+        if self.__registry is not None:
+            omf_types = self.__registry.filterChanged(OMFMessageType.Type, omf_types)
+            if len(omf_types) == 0:
+                return
+
+        response = await self.__omf_client.omfRequest(
+            OMFMessageType.Type,
+            OMFMessageAction.Create,
+            omf_types,
+        )
+        self.__omf_client.verifySuccessfulResponse(response, 'Failed to create types')
+        if self.__registry is not None:
+            self.__registry.register(OMFMessageType.Type, omf_types)
+
+    async def updateTypes(self, omf_types: list[OMFType]):
+        """
+        Updates OMF Types and throws error on failure
+        :param omf_types: List of OMF Types
+        """
+        response = await self.__omf_client.omfRequest(
+            OMFMessageType.Type,
+            OMFMessageAction.Update,
+            omf_types,
+        )
+        self.__omf_client.verifySuccessfulResponse(response, 'Failed to update types')
+        if self.__registry is not None:
+            self.__registry.register(OMFMessageType.Type, omf_types)
+
+    async def deleteTypes(self, omf_types: list[OMFType]):
+        """
+        Deletes OMF Types and throws error on failure
+        :param omf_types: List of OMF Types
+        """
+        response = await self.__omf_client.omfRequest(
+            OMFMessageType.Type,
+            OMFMessageAction.Delete,
+            omf_types,
+        )
+        self.__omf_client.verifySuccessfulResponse(response, 'Failed to delete types')
+        if self.__registry is not None:
+            self.__registry.invalidate(
+                OMFMessageType.Type, [definition.Id for definition in omf_types]
+            )
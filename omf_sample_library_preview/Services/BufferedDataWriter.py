@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from typing import Any
+
+from ..Client.OMFError import OMFError
+from ..Models.OMFColumnData import OMFColumnData
+from ..Models.OMFColumns import OMFColumns
+from ..Models.OMFData import OMFData
+from ..Models.OMFType import OMFType
+from ..Models.Serializeable import dictionaryFactory
+from .DataService import DataService
+
+
+class _Flush(object):
+    def __init__(self):
+        self.Event = threading.Event()
+
+
+class _Stop(_Flush):
+    pass
+
+
+class BufferedDataWriter:
+    """
+    Buffers values per container and sends them through a DataService from a background thread.
+    Buffered values are sent as OMFData messages when the number of values, the estimated payload size or the age
+    of the oldest value reaches its limit, when flush is called, or when the writer is closed.
+    """
+
+    def __init__(
+        self,
+        data_service: DataService,
+        max_values: int = 10000,
+        max_bytes: int = 1000000,
+        max_latency: float = 1.0,
+        max_queue_size: int = 0,
+        omf_types: list[OMFType] = None,
+    ):
+        """
+        :param data_service: Data service used to send the buffered values
+        :param max_values: Number of buffered values that triggers a send
+        :param max_bytes: Estimated uncompressed size of the buffered values in bytes that triggers a send
+        :param max_latency: Maximum number of seconds a value is buffered before it is sent
+        :param max_queue_size: Maximum number of values written but not yet taken by the background thread, 0 for no
+            limit. Writes that would go over it raise an OMFError.
+        :param omf_types: Types whose values are buffered in compact OMFColumns instead of as objects, for values
+            written with the id of one of these types
+        """
+        self.__data_service = data_service
+        self.__max_values = max_values
+        self.__max_bytes = max_bytes
+        self.__max_latency = max_latency
+        self.__max_queue_size = max_queue_size
+        self.__queue = queue.Queue()
+        self.__queued_values = 0
+        self.__queue_lock = threading.Lock()
+        self.__value_sizes = {}
+        self.__omf_types = {omf_type.Id: omf_type for omf_type in omf_types or []}
+        self.__error = None
+        self.__closed = False
+        self.__worker = threading.Thread(
+            target=self.__run, name='BufferedDataWriter', daemon=True
+        )
+        self.__worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def DataService(self) -> DataService:
+        return self.__data_service
+
+    @property
+    def MaxValues(self) -> int:
+        return self.__max_values
+
+    @property
+    def MaxBytes(self) -> int:
+        return self.__max_bytes
+
+    @property
+    def MaxLatency(self) -> float:
+        return self.__max_latency
+
+    @property
+    def MaxQueueSize(self) -> int:
+        return self.__max_queue_size
+
+    @property
+    def QueuedValues(self) -> int:
+        return self.__queued_values
+
+    @property
+    def Closed(self) -> bool:
+        return self.__closed
+
+    def write(self, container_id: str, value: Any, type_id: str = None):
+        """
+        Adds a value to the buffer of a container without waiting for it to be sent
+        :param container_id: Id of the container the value belongs to
+        :param value: Value to send
+        :param type_id: Optional type id of the container
+        """
+        self.writeMany(container_id, [value], type_id)
+
+    def writeMany(self, container_id: str, values: list[Any], type_id: str = None):
+        """
+        Adds several values to the buffer of a container without waiting for them to be sent
+        :param container_id: Id of the container the values belong to
+        :param values: Values to send
+        :param type_id: Optional type id of the container
+        """
+        # The closed check and the put share the lock taken by close, so no values are queued after the stop request
+        with self.__queue_lock:
+            if self.__closed:
+                raise OMFError('The buffered data writer has been closed')
+
+            # The queue is limited in values rather than in calls, a single writeMany can hold millions of values
+            if (
+                self.__max_queue_size
+                and self.__queued_values + len(values) > self.__max_queue_size
+            ):
+                raise OMFError('The buffered data writer queue is full')
+            self.__queued_values += len(values)
+            self.__queue.put_nowait(((container_id, type_id), values))
+
+    def flush(self, timeout: float = None):
+        """
+        Sends every value written before this call and throws the last send error, if any
+        :param timeout: Maximum number of seconds to wait for the values to be sent
+        """
+        request = _Flush()
+        with self.__queue_lock:
+            if self.__closed:
+                raise OMFError('The buffered data writer has been closed')
+            self.__queue.put_nowait(request)
+        if not request.Event.wait(timeout):
+            raise OMFError('Timed out waiting for the buffered data to be sent')
+        self.__raiseError()
+
+    def close(self, timeout: float = None):
+        """
+        Sends the remaining buffered values, stops the background thread and throws the last send error, if any
+        :param timeout: Maximum number of seconds to wait for the values to be sent
+        """
+        with self.__queue_lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__queue.put_nowait(_Stop())
+
+        self.__worker.join(timeout)
+        self.__raiseError()
+
+    def __raiseError(self):
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def __run(self):
+        buffer = {}
+        count = 0
+        size = 0
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, _Flush):
+                self.__send(buffer)
+                buffer, count, size, deadline = {}, 0, 0, None
+                item.Event.set()
+                if isinstance(item, _Stop):
+                    return
+                continue
+
+            if item is not None:
+                key, values = item
+                with self.__queue_lock:
+                    self.__queued_values -= len(values)
+                if key not in buffer:
+                    omf_type = self.__omf_types.get(key[1])
+                    buffer[key] = [] if omf_type is None else OMFColumns(omf_type)
+                buffer[key].extend(values)
+                count += len(values)
+                size += len(values) * self.__estimateSize(key, values)
+                if deadline is None:
+                    deadline = time.monotonic() + self.__max_latency
+
+            if (
+                count >= self.__max_values
+                or size >= self.__max_bytes
+                or (deadline is not None and time.monotonic() >= deadline)
+            ):
+                self.__send(buffer)
+                buffer, count, size, deadline = {}, 0, 0, None
+
+    def __estimateSize(self, key: tuple[str, str], values: list[Any]) -> int:
+        # Serialize the first value of each container once and assume the others are about the same size
+        size = self.__value_sizes.get(key)
+        if size is None and values:
+            value = values[0]
+            if is_dataclass(value):
+                value = asdict(value, dict_factory=dictionaryFactory)
+            try:
+                size = len(json.dumps(value)) + 2
+            except TypeError:
+                # Values json cannot serialize are estimated from their string form on every call, a failed
+                # estimate is not cached so that max_bytes keeps applying to the container
+                return len(json.dumps(value, default=str)) + 2
+            self.__value_sizes[key] = size
+        return size or 0
+
+    def __send(self, buffer: dict[tuple[str, str], list[Any] | OMFColumns]):
+        if not buffer:
+            return
+
+        omf_data = [
+            (OMFColumnData if isinstance(values, OMFColumns) else OMFData)(
+                values, TypeId=type_id, ContainerId=container_id
+            )
+            for (container_id, type_id), values in buffer.items()
+        ]
+        try:
+            self.__data_service.createData(omf_data)
+        except Exception as error:
+            logging.error(f'Failed to send buffered data: {error}')
+            self.__error = error
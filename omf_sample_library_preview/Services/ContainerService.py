@@ -2,23 +2,40 @@ from ..Client.OMFClient import OMFClient
 from ..Models.OMFContainer import OMFContainer
 from ..Models.OMFMessageAction import OMFMessageAction
 from ..Models.OMFMessageType import OMFMessageType
+from .DefinitionRegistry import DefinitionRegistry
 
 
 class ContainerService:
-    def __init__(self, omf_client: OMFClient):
+    def __init__(self, omf_client: OMFClient, registry: DefinitionRegistry = None):
+        """
+        :param omf_client: OMF client used to send the messages
+        :param registry: Optional registry of the containers already created, used to skip unchanged containers
+        """
         self.__omf_client = omf_client
+        self.__registry = registry
 
     @property
     def OMFClient(self) -> OMFClient:
         return self.__omf_client
 
+    @property
+    def Registry(self) -> DefinitionRegistry:
+        return self.__registry
+
     def createContainers(self, omf_containers: list[OMFContainer]):
         """
-        Creates OMF Containers and throws error on failure
+        Creates OMF Containers and throws error on failure.
+        Containers registered unchanged in the registry are skipped.
         :param omf_containers: List of OMF Containers
         """
-        response = self.__omf_client.retryWithBackoff(
-            self.__omf_client.omfRequest,
+        if self.__registry is not None:
+            omf_containers = self.__registry.filterChanged(
+                OMFMessageType.Container, omf_containers
+            )
+            if len(omf_containers) == 0:
+                return
+
+        response = self.__omf_client.omfRequest(
             OMFMessageType.Container,
             OMFMessageAction.Create,
             omf_containers,
@@ -26,14 +43,15 @@ class ContainerService:
         self.__omf_client.verifySuccessfulResponse(
             response, 'Failed to create container'
         )
+        if self.__registry is not None:
+            self.__registry.register(OMFMessageType.Container, omf_containers)
 
     def updateContainers(self, omf_containers: list[OMFContainer]):
         """
         Updates OMF Containers and throws error on failure
         :param omf_containers: List of OMF Containers
         """
-        response = self.__omf_client.retryWithBackoff(
-            self.__omf_client.omfRequest,
+        response = self.__omf_client.omfRequest(
             OMFMessageType.Container,
             OMFMessageAction.Update,
             omf_containers,
@@ -41,14 +59,15 @@ class ContainerService:
         self.__omf_client.verifySuccessfulResponse(
             response, 'Failed to update container'
         )
+        if self.__registry is not None:
+            self.__registry.register(OMFMessageType.Container, omf_containers)
 
     def deleteContainers(self, omf_containers: list[OMFContainer]):
         """
         Deletes OMF Containers and throws error on failure
         :param omf_containers: List of OMF Containers
         """
-        response = self.__omf_client.retryWithBackoff(
-            self.__omf_client.omfRequest,
+        response = self.__omf_client.omfRequest(
             OMFMessageType.Container,
             OMFMessageAction.Delete,
             omf_containers,
@@ -56,3 +75,8 @@ class ContainerService:
         self.__omf_client.verifySuccessfulResponse(
             response, 'Failed to delete container'
         )
+        if self.__registry is not None:
+            self.__registry.invalidate(
+                OMFMessageType.Container,
+                [definition.Id for definition in omf_containers],
+            )
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any
+
+from ..Models.OMFArrayData import OMFArrayData
+from ..Models.OMFColumns import OMFColumns
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFData import OMFData
+from ..Models.OMFType import OMFType
+from ..Models.OMFTypeCode import OMFTypeCode
+
+EPOCH = datetime(1970, 1, 1)
+
+SETTINGS = ('deadband', 'deadband_percent', 'compression', 'max_seconds')
+
+
+class DataFilter(object):
+    """
+    Drops data values that add little information before they are sent, keeping a separate state for every container.
+    Values go through two optional stages. The deadband stage passes a value when a number moved by more than the
+    deadband since the last value passed, or any other property changed, and then also passes the last value held
+    before it, so that the change is drawn at the right time. The swinging door compression stage then sends a value
+    only when a straight line from the last value sent can no longer stay within the compression deviation of every
+    value since. Both stages pass a value at least every max_seconds of the index.
+    The index is the IsIndex property of the type of the container, as a datetime, an ISO 8601 string or a number.
+    Messages whose type is unknown or has no index, and OMFArrayData messages, are sent unfiltered.
+    """
+
+    def __init__(
+        self,
+        omf_types: list[OMFType],
+        containers: list[OMFContainer] = None,
+        deadband: float = None,
+        deadband_percent: float = None,
+        compression: float = None,
+        max_seconds: float = None,
+    ):
+        """
+        :param omf_types: Types of the filtered containers, whose IsIndex property orders the values
+        :param containers: Containers of OMFData messages sent without a TypeId
+        :param deadband: Change of a number that passes the deadband stage, None to skip the stage
+        :param deadband_percent: Change of a number, in percent of the last value passed, that passes the deadband
+            stage. When both deadbands are set the larger one applies.
+        :param compression: Deviation of a number from the line between the values sent allowed by the swinging door
+            compression stage, None to skip the stage
+        :param max_seconds: Longest time in seconds, or in index units for numeric indexes, between values passed by
+            either stage, None for no limit
+        """
+        self.__omf_types = {omf_type.Id: omf_type for omf_type in omf_types}
+        self.__container_types = {
+            container.Id: container.TypeId for container in containers or []
+        }
+        self.__defaults = dict(
+            zip(SETTINGS, (deadband, deadband_percent, compression, max_seconds))
+        )
+        self.__settings = {}
+        self.__filters = {}
+
+    def configure(self, container_id: str, **settings):
+        """
+        Overrides the filter settings of a container, and restarts its filter
+        :param container_id: Id of the container
+        :param settings: deadband, deadband_percent, compression and max_seconds, as for the constructor
+        """
+        unknown = set(settings) - set(SETTINGS)
+        if unknown:
+            raise ValueError(f'Unknown filter settings {sorted(unknown)}')
+
+        self.__settings.setdefault(container_id, {}).update(settings)
+        self.__filters.pop(container_id, None)
+
+    def filter(self, omf_data: list[OMFData]) -> list[OMFData]:
+        """
+        Filters the values of OMF Data messages
+        :param omf_data: List of OMF Data
+        :return: List of OMF Data holding the values to send, without the messages left empty
+        """
+        result = []
+        for message in omf_data:
+            container_filter = self.__getFilter(message)
+            if container_filter is None or message.Values is None:
+                result.append(message)
+                continue
+
+            values = []
+            if isinstance(message.Values, OMFColumns):
+                # Rows of compact messages leave out their falsy properties, so the filter reads every property from
+                # the columns and sends the rows
+                names = message.Values.Names
+                for row in message.Values.iterValues():
+                    fields = dict(zip(names, row))
+                    values.extend(
+                        container_filter.add(
+                            fields,
+                            {name: value for name, value in fields.items() if value},
+                        )
+                    )
+            else:
+                for row in message.Values:
+                    values.extend(container_filter.add(row))
+            if values:
+                result.append(self.__copy(message, values))
+        return result
+
+    def flush(self) -> list[OMFData]:
+        """
+        Gets the values held by the filters of every container, for example before closing
+        :return: List of OMF Data holding the held values
+        """
+        result = []
+        for container_id, container_filter in self.__filters.items():
+            values = container_filter.flush()
+            if values:
+                result.append(
+                    OMFData(
+                        values,
+                        TypeId=container_filter.OMFType.Id,
+                        ContainerId=container_id,
+                    )
+                )
+        return result
+
+    def reset(self, container_id: str = None):
+        """
+        Forgets the values held and sent by the filter of a container
+        :param container_id: Id of the container, None for every container
+        """
+        if container_id is None:
+            self.__filters.clear()
+        else:
+            self.__filters.pop(container_id, None)
+
+    def __getFilter(self, message: OMFData) -> _ContainerFilter | None:
+        if isinstance(message, OMFArrayData) or message.ContainerId is None:
+            return None
+
+        container_filter = self.__filters.get(message.ContainerId)
+        if container_filter is None:
+            type_id = message.TypeId or self.__container_types.get(message.ContainerId)
+            omf_type = self.__omf_types.get(type_id)
+            if omf_type is None:
+                return None
+
+            settings = dict(self.__defaults)
+            settings.update(self.__settings.get(message.ContainerId, {}))
+            container_filter = _ContainerFilter.fromType(omf_type, **settings)
+            if container_filter is None:
+                return None
+            self.__filters[message.ContainerId] = container_filter
+        return container_filter
+
+    @staticmethod
+    def __copy(message: OMFData, values: list[Any]) -> OMFData:
+        # Compact messages hold their values in columns, the values kept are sent as rows
+        return OMFData(
+            values,
+            TypeId=message.TypeId,
+            ContainerId=message.ContainerId,
+            Properties=message.Properties,
+        )
+
+
+class _ContainerFilter(object):
+    """
+    Deadband and swinging door state of one container. Points are tuples of the index as a number, the property values
+    and the original value.
+    """
+
+    def __init__(
+        self,
+        omf_type: OMFType,
+        index: str,
+        names: list[str],
+        numeric: list[bool],
+        deadband: float = None,
+        deadband_percent: float = None,
+        compression: float = None,
+        max_seconds: float = None,
+    ):
+        self.OMFType = omf_type
+        self.Index = index
+        self.Names = names
+        self.Numeric = numeric
+        self.Deadband = deadband
+        self.DeadbandPercent = deadband_percent
+        self.Compression = compression
+        self.MaxSeconds = max_seconds
+        # Deadband stage: last point passed and last point held since
+        self.Passed = None
+        self.Held = None
+        # Compression stage: last point sent, last point received since, and the slopes of the door
+        self.Sent = None
+        self.Snapshot = None
+        self.Upper = None
+        self.Lower = None
+
+    @staticmethod
+    def fromType(omf_type: OMFType, **settings) -> _ContainerFilter | None:
+        index = None
+        names = []
+        numeric = []
+        for name, type_property in (omf_type.Properties or {}).items():
+            if type_property.IsIndex:
+                index = name
+                continue
+
+            codes = (
+                type_property.Type
+                if isinstance(type_property.Type, list)
+                else [type_property.Type]
+            )
+            names.append(name)
+            numeric.append(
+                not type_property.IsQuality
+                and any(
+                    code in (OMFTypeCode.Number, OMFTypeCode.Integer) for code in codes
+                )
+            )
+
+        if index is None:
+            return None
+        return _ContainerFilter(omf_type, index, names, numeric, **settings)
+
+    def add(self, row: Any, value: Any = None) -> list[Any]:
+        # The properties are read from row, and value, which defaults to row, is what is sent
+        point = (
+            _toNumber(_getValue(row, self.Index)),
+            tuple(_getValue(row, name) for name in self.Names),
+            row if value is None else value,
+        )
+
+        if self.Deadband is None and self.DeadbandPercent is None:
+            passed = [point]
+        else:
+            passed = self.__deadband(point)
+
+        if self.Compression is None:
+            return [point[2] for point in passed]
+
+        sent = []
+        for point in passed:
+            sent.extend(self.__compress(point))
+        return sent
+
+    def flush(self) -> list[Any]:
+        held = [self.Held] if self.Held is not None else []
+        if held:
+            self.Passed, self.Held = self.Held, None
+        if self.Compression is None:
+            return [point[2] for point in held]
+
+        sent = []
+        for point in held:
+            sent.extend(self.__compress(point))
+        if self.Snapshot is not None:
+            sent.append(self.Snapshot[2])
+            self.Sent, self.Snapshot = self.Snapshot, None
+        return sent
+
+    def __deadband(self, point: tuple) -> list[tuple]:
+        if self.Passed is None or point[0] <= self.Passed[0]:
+            self.Passed = point
+            return [point]
+
+        if self.__exceedsDeadband(point):
+            passed = [self.Held, point] if self.Held is not None else [point]
+            self.Passed, self.Held = point, None
+            return passed
+
+        if self.__expired(self.Passed, point):
+            self.Passed, self.Held = point, None
+            return [point]
+
+        self.Held = point
+        return []
+
+    def __exceedsDeadband(self, point: tuple) -> bool:
+        for numeric, last, value in zip(self.Numeric, self.Passed[1], point[1]):
+            if not numeric or last is None or value is None:
+                if last != value:
+                    return True
+                continue
+
+            deadband = max(
+                self.Deadband or 0,
+                abs(last) * (self.DeadbandPercent or 0) / 100,
+            )
+            if abs(value - last) > deadband:
+                return True
+        return False
+
+    def __compress(self, point: tuple) -> list[Any]:
+        if self.Sent is None or point[0] <= self.Sent[0]:
+            self.Sent, self.Snapshot = point, None
+            return [point[2]]
+
+        sent = []
+        if self.Snapshot is not None and (
+            self.__expired(self.Sent, point) or not self.__narrowDoor(point)
+        ):
+            # The door closed, or the last point sent is too old: the last point held is sent and the door restarts
+            # from it
+            sent.append(self.Snapshot[2])
+            self.Sent, self.Snapshot = self.Snapshot, None
+
+        if self.Snapshot is None:
+            self.Upper = [math.inf] * len(self.Names)
+            self.Lower = [-math.inf] * len(self.Names)
+            if not self.__narrowDoor(point) or self.__expired(self.Sent, point):
+                sent.append(point[2])
+                self.Sent = point
+                return sent
+
+        self.Snapshot = point
+        return sent
+
+    def __narrowDoor(self, point: tuple) -> bool:
+        # Narrows the slopes of the door to keep the point within the compression deviation, returns whether it is
+        # still open
+        elapsed = point[0] - self.Sent[0]
+        if elapsed <= 0:
+            return False
+
+        for i, (numeric, start, value) in enumerate(
+            zip(self.Numeric, self.Sent[1], point[1])
+        ):
+            if not numeric or start is None or value is None:
+                if start != value:
+                    return False
+                continue
+
+            self.Upper[i] = min(
+                self.Upper[i], (value + self.Compression - start) / elapsed
+            )
+            self.Lower[i] = max(
+                self.Lower[i], (value - self.Compression - start) / elapsed
+            )
+            if self.Lower[i] > self.Upper[i]:
+                return False
+        return True
+
+    def __expired(self, last: tuple, point: tuple) -> bool:
+        return self.MaxSeconds is not None and point[0] - last[0] >= self.MaxSeconds
+
+
+def _getValue(row: Any, name: str) -> Any:
+    if isinstance(row, dict):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+def _toNumber(index: Any) -> float:
+    if isinstance(index, str):
+        index = datetime.fromisoformat(index.replace('Z', '+00:00'))
+    if isinstance(index, datetime):
+        if index.tzinfo is None:
+            return (index - EPOCH).total_seconds()
+        return index.timestamp()
+    return index
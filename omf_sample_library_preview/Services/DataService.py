@@ -1,52 +1,130 @@
+import time
+
+from ..Client.AdaptiveBatcher import AdaptiveBatcher
 from ..Client.OMFClient import OMFClient
 from ..Models.OMFData import OMFData
 from ..Models.OMFMessageAction import OMFMessageAction
 from ..Models.OMFMessageType import OMFMessageType
+from .DataFilter import DataFilter
 
 
 class DataService:
-    def __init__(self, omf_client: OMFClient):
+    def __init__(
+        self,
+        omf_client: OMFClient,
+        batcher: AdaptiveBatcher = None,
+        data_filter: DataFilter = None,
+    ):
+        """
+        :param omf_client: OMF client used to send the messages
+        :param batcher: Optional adaptive batcher splitting the data into requests whose size adapts to the endpoint
+        :param data_filter: Optional deadband and compression filter applied to the data created
+        """
         self.__omf_client = omf_client
+        self.__batcher = batcher
+        self.__data_filter = data_filter
 
     @property
     def OMFClient(self) -> OMFClient:
         return self.__omf_client
 
+    @property
+    def Batcher(self) -> AdaptiveBatcher:
+        return self.__batcher
+
+    @property
+    def DataFilter(self) -> DataFilter:
+        return self.__data_filter
+
     def createData(self, omf_data: list[OMFData]):
         """
-        Creates OMF Data and throws error on failure
+        Creates OMF Data and throws error on failure. Values dropped by the data filter, if any, are not sent.
         :param omf_data: List of OMF Data
         """
-        response = self.__omf_client.retryWithBackoff(
-            self.__omf_client.omfRequest,
-            OMFMessageType.Data,
-            OMFMessageAction.Create,
-            omf_data,
-        )
-        self.__omf_client.verifySuccessfulResponse(response, 'Failed to create data')
+        if self.__data_filter is not None:
+            omf_data = self.__data_filter.filter(omf_data)
+            if not omf_data:
+                return
+
+        self.__send(OMFMessageAction.Create, omf_data, 'Failed to create data')
+
+    def flushData(self):
+        """
+        Creates the values held by the data filter, for example before closing, and throws error on failure
+        """
+        if self.__data_filter is None:
+            return
+
+        omf_data = self.__data_filter.flush()
+        if omf_data:
+            self.__send(OMFMessageAction.Create, omf_data, 'Failed to create data')
 
     def updateData(self, omf_data: list[OMFData]):
         """
         Updates OMF Data and throws error on failure
         :param omf_data: List of OMF Data
         """
-        response = self.__omf_client.retryWithBackoff(
-            self.__omf_client.omfRequest,
-            OMFMessageType.Data,
-            OMFMessageAction.Update,
-            omf_data,
-        )
-        self.__omf_client.verifySuccessfulResponse(response, 'Failed to update data')
+        self.__send(OMFMessageAction.Update, omf_data, 'Failed to update data')
 
     def deleteData(self, omf_data: list[OMFData]):
         """
         Deletes OMF Data and throws error on failure
         :param omf_data: List of OMF Data
         """
-        response = self.__omf_client.retryWithBackoff(
-            self.__omf_client.omfRequest,
+        self.__send(OMFMessageAction.Delete, omf_data, 'Failed to delete data')
+
+    def __send(
+        self, action: OMFMessageAction, omf_data: list[OMFData], main_message: str
+    ):
+        if self.__batcher is None:
+            response = self.__omf_client.omfRequest(
+                OMFMessageType.Data,
+                action,
+                omf_data,
+            )
+            self.__omf_client.verifySuccessfulResponse(response, main_message)
+            return
+
+        for batch in self.__batcher.split(omf_data):
+            self.__sendBatch(action, batch, main_message)
+
+    def __sendBatch(
+        self, action: OMFMessageAction, omf_data: list[OMFData], main_message: str
+    ):
+        values = OMFClient.countValues(omf_data)
+        start = time.perf_counter()
+        try:
+            response = self.__omf_client.omfRequest(
+                OMFMessageType.Data,
+                action,
+                omf_data,
+            )
+        except Exception:
+            self.__batcher.record(
+                OMFMessageType.Data,
+                action,
+                len(omf_data),
+                values,
+                time.perf_counter() - start,
+            )
+            raise
+
+        self.__batcher.record(
             OMFMessageType.Data,
-            OMFMessageAction.Delete,
-            omf_data,
+            action,
+            len(omf_data),
+            values,
+            time.perf_counter() - start,
+            response.status_code,
         )
-        self.__omf_client.verifySuccessfulResponse(response, 'Failed to delete data')
+
+        # A payload too large response rejects the whole request, so it is sent again in smaller requests
+        if response.status_code == 413:
+            batches = list(self.__batcher.split(omf_data))
+            if len(batches) > 1:
+                response.close()
+                for batch in batches:
+                    self.__sendBatch(action, batch, main_message)
+                return
+
+        self.__omf_client.verifySuccessfulResponse(response, main_message)
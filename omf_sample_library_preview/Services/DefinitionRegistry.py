@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+
+from ..Models.OMFContainer import OMFContainer
+from ..Models.OMFMessageType import OMFMessageType
+from ..Models.OMFType import OMFType
+
+
+class DefinitionRegistry(object):
+    """
+    Remembers a content hash of every type and container definition sent to an endpoint, so that definitions
+    which already exist unchanged are not sent again. Use one registry per endpoint.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        :param path: Optional json file the hashes are loaded from and saved to, so they survive restarts
+        """
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__hashes = {
+            OMFMessageType.Type: {},
+            OMFMessageType.Container: {},
+        }
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            for message_type, hashes in self.__hashes.items():
+                hashes.update(content.get(message_type.value, {}))
+
+    @property
+    def Path(self) -> str | None:
+        """
+        Gets the json file the hashes are persisted to
+        :return:
+        """
+        return self.__path
+
+    def filterChanged(
+        self,
+        message_type: OMFMessageType,
+        definitions: list[OMFType | OMFContainer],
+    ) -> list[OMFType | OMFContainer]:
+        """
+        Gets the definitions that are new or differ from the last definition registered with the same Id
+        :param message_type: Type or Container
+        :param definitions: List of OMF Types or OMF Containers
+        :return: List of the definitions that need to be sent
+        """
+        hashes = self.__getHashes(message_type)
+        result = []
+        pending = {}
+        with self.__lock:
+            for definition in definitions:
+                content_hash = self.hash(definition)
+                if (
+                    hashes.get(definition.Id) != content_hash
+                    and pending.get(definition.Id) != content_hash
+                ):
+                    pending[definition.Id] = content_hash
+                    result.append(definition)
+        return result
+
+    def register(
+        self,
+        message_type: OMFMessageType,
+        definitions: list[OMFType | OMFContainer],
+    ):
+        """
+        Records definitions that were successfully sent
+        :param message_type: Type or Container
+        :param definitions: List of OMF Types or OMF Containers
+        """
+        hashes = self.__getHashes(message_type)
+        with self.__lock:
+            for definition in definitions:
+                hashes[definition.Id] = self.hash(definition)
+            self.__save()
+
+    def invalidate(self, message_type: OMFMessageType = None, ids: list[str] = None):
+        """
+        Forgets registered definitions so that they are sent again
+        :param message_type: Type or Container, None for both
+        :param ids: Ids of the definitions to forget, None for all of them
+        """
+        message_types = list(self.__hashes) if message_type is None else [message_type]
+        with self.__lock:
+            for message_type in message_types:
+                hashes = self.__getHashes(message_type)
+                if ids is None:
+                    hashes.clear()
+                else:
+                    for id in ids:
+                        hashes.pop(id, None)
+            self.__save()
+
+    def contains(self, message_type: OMFMessageType, id: str) -> bool:
+        """
+        Gets whether a definition is registered
+        :param message_type: Type or Container
+        :param id: Id of the definition
+        :return:
+        """
+        return id in self.__getHashes(message_type)
+
+    @staticmethod
+    def hash(definition: OMFType | OMFContainer) -> str:
+        """
+        Gets the content hash of a definition
+        :param definition: OMF Type or OMF Container
+        :return: Hex encoded sha256 of the serialized definition
+        """
+        return hashlib.sha256(definition.toJson().encode('utf-8')).hexdigest()
+
+    def __getHashes(self, message_type: OMFMessageType) -> dict[str, str]:
+        hashes = self.__hashes.get(message_type)
+        if hashes is None:
+            raise ValueError(f'Definitions of type {message_type} are not registered')
+        return hashes
+
+    def __save(self):
+        if self.__path is None:
+            return
+
+        # Write to a temporary file first so that a crash cannot leave a truncated registry behind
+        content = {
+            message_type.value: hashes for message_type, hashes in self.__hashes.items()
+        }
+        temporary_path = self.__path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(content, file)
+        os.replace(temporary_path, self.__path)
@@ -1,3 +1,6 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable
+
 from ..Client.OMFClient import OMFClient
 from ..Models.OMFContainer import OMFContainer
 from ..Models.OMFData import OMFData
@@ -6,20 +9,43 @@ from ..Models.OMFMessageType import OMFMessageType
 from ..Models.OMFType import OMFType
 from .ContainerService import ContainerService
 from .DataService import DataService
+from .DefinitionRegistry import DefinitionRegistry
 from .TypeService import TypeService
 
 
 class GeneralService:
-    def __init__(self, omf_client: OMFClient):
+    def __init__(
+        self,
+        omf_client: OMFClient,
+        max_workers: int = 1,
+        chunk_size: int = 1000,
+        registry: DefinitionRegistry = None,
+    ):
+        """
+        :param omf_client: OMF client used to send the messages
+        :param max_workers: Number of requests sent concurrently within each phase, 1 sends each phase as a single request
+        :param chunk_size: Number of OMF objects per request when sending concurrently
+        :param registry: Optional registry of the types and containers already created, used to skip unchanged ones
+        """
         self.__omf_client = omf_client
-        self.__container_service = ContainerService(omf_client)
+        self.__max_workers = max_workers
+        self.__chunk_size = chunk_size
+        self.__container_service = ContainerService(omf_client, registry)
         self.__data_service = DataService(omf_client)
-        self.__type_service = TypeService(omf_client)
+        self.__type_service = TypeService(omf_client, registry)
 
     @property
     def OMFClient(self) -> OMFClient:
         return self.__omf_client
 
+    @property
+    def MaxWorkers(self) -> int:
+        return self.__max_workers
+
+    @property
+    def ChunkSize(self) -> int:
+        return self.__chunk_size
+
     @property
     def ContainerService(self) -> ContainerService:
         return self.__container_service
@@ -51,41 +77,62 @@ class GeneralService:
 
         return types, containers, data
 
+    def __dispatch(self, send: Callable[[list], None], omf_objects: list):
+        """
+        Sends one phase of OMF objects, concurrently in chunks when more than one worker is configured.
+        Returns only once every chunk of the phase has been sent. On the first error the chunks not started yet are
+        cancelled, the requests in flight are waited for, and the error is thrown.
+        """
+        if len(omf_objects) == 0:
+            return
+
+        if self.__max_workers <= 1 or len(omf_objects) <= self.__chunk_size:
+            send(omf_objects)
+            return
+
+        chunks = [
+            omf_objects[i : i + self.__chunk_size]
+            for i in range(0, len(omf_objects), self.__chunk_size)
+        ]
+        executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+        try:
+            futures = [executor.submit(send, chunk) for chunk in chunks]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in futures:
+                if future in done:
+                    future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
     def create(self, omf_objects: list[OMFType | OMFContainer | OMFData]):
         """
-        Creates OMF Objects and throws error on failure
+        Creates OMF Objects and throws error on failure.
+        Types are created before containers, and containers before data.
         :param omf_objects: List of OMF Objects
         """
         types, containers, data = self.__split_omf_objects(omf_objects)
-        if len(types) > 0:
-            self.TypeService.createTypes(types)
-        if len(containers) > 0:
-            self.ContainerService.createContainers(containers)
-        if len(data) > 0:
-            self.DataService.createData(data)
+        self.__dispatch(self.TypeService.createTypes, types)
+        self.__dispatch(self.ContainerService.createContainers, containers)
+        self.__dispatch(self.DataService.createData, data)
 
     def update(self, omf_objects: list[OMFType | OMFContainer | OMFData]):
         """
-        Updates OMF Objects and throws error on failure
+        Updates OMF Objects and throws error on failure.
+        Types are updated before containers, and containers before data.
         :param omf_objects: List of OMF Objects
         """
         types, containers, data = self.__split_omf_objects(omf_objects)
-        if len(types) > 0:
-            self.TypeService.updateTypes(types)
-        if len(containers) > 0:
-            self.ContainerService.updateContainers(containers)
-        if len(data) > 0:
-            self.DataService.updateData(data)
+        self.__dispatch(self.TypeService.updateTypes, types)
+        self.__dispatch(self.ContainerService.updateContainers, containers)
+        self.__dispatch(self.DataService.updateData, data)
 
     def delete(self, omf_objects: list[OMFType | OMFContainer | OMFData]):
         """
-        Deletes OMF Objects and throws error on failure
+        Deletes OMF Objects and throws error on failure.
+        Data is deleted before containers, and containers before types.
         :param omf_objects: List of OMF Objects
         """
         types, containers, data = self.__split_omf_objects(omf_objects)
-        if len(types) > 0:
-            self.TypeService.deleteTypes(types)
-        if len(containers) > 0:
-            self.ContainerService.deleteContainers(containers)
-        if len(data) > 0:
-            self.DataService.deleteData(data)
+        self.__dispatch(self.DataService.deleteData, data)
+        self.__dispatch(self.ContainerService.deleteContainers, containers)
+        self.__dispatch(self.TypeService.deleteTypes, types)
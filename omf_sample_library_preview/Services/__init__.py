@@ -1,4 +1,11 @@
+from .AsyncContainerService import AsyncContainerService
+from .AsyncDataService import AsyncDataService
+from .AsyncGeneralService import AsyncGeneralService
+from .AsyncTypeService import AsyncTypeService
+from .BufferedDataWriter import BufferedDataWriter
 from .ContainerService import ContainerService
+from .DataFilter import DataFilter
 from .DataService import DataService
+from .DefinitionRegistry import DefinitionRegistry
 from .GeneralService import GeneralService
 from .TypeService import TypeService
@@ -1,2 +1,96 @@
+import gzip
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pytest
+from requests import Response
+
+from ..Client.CompressionPolicy import CompressionPolicy
+from ..Client.OMFClient import OMFClient
+from ..Models import OMFData
+
+
 def pytest_addoption(parser):
     parser.addoption("--e2e", action="store", default=False)
+
+
+@dataclass
+class MyClass1:
+    timestamp: datetime
+    value: float
+
+
+class FakeDataService:
+    def __init__(self, error: Exception = None):
+        self.Sent = []
+        self.Event = threading.Event()
+        self.Error = error
+
+    def createData(self, omf_data: list[OMFData]):
+        self.Sent.append(omf_data)
+        self.Event.set()
+        if self.Error:
+            raise self.Error
+
+
+def createValues(count: int) -> list[MyClass1]:
+    rng = random.Random(0)
+    start = datetime(2000, 1, 1)
+    return [MyClass1(start + timedelta(seconds=i), rng.random()) for i in range(count)]
+
+
+def createData(container_id: str, count: int) -> OMFData:
+    start = datetime(2000, 1, 1)
+    return OMFData(
+        [MyClass1(start + timedelta(seconds=i), i + 0.5) for i in range(count)],
+        ContainerId=container_id,
+    )
+
+
+def createResponse(
+    status_code: int = 202, headers: dict = None, content: bytes = b''
+) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = content
+    return response
+
+
+def decompress(bodies: list[bytes]) -> list[dict]:
+    return [
+        message
+        for body in bodies
+        for message in json.loads(
+            gzip.decompress(body) if CompressionPolicy.isCompressed(body) else body
+        )
+    ]
+
+
+@pytest.fixture
+def createClient(monkeypatch):
+    """
+    Returns a factory of clients whose requests are answered with status_code and
+    appended to sent as (headers, body) tuples
+    """
+
+    def factory(sent: list, status_code: int = 202, delay: float = 0) -> OMFClient:
+        client = OMFClient(url='https://test.com')
+        lock = threading.Lock()
+
+        def request(method, url, params=None, data=None, headers=None, **kwargs):
+            time.sleep(delay)
+            with lock:
+                sent.append(
+                    (headers, data if isinstance(data, bytes) else b''.join(data))
+                )
+            return createResponse(status_code)
+
+        monkeypatch.setattr(client, 'request', request)
+        return client
+
+    return factory
@@ -0,0 +1,102 @@
+import pytest
+
+from ..Client.AdaptiveBatcher import AdaptiveBatcher
+from ..Client.InMemoryMetrics import InMemoryMetrics
+from ..Client.OMFClient import OMFClient
+from ..Client.OMFError import OMFError
+from ..Client.PrometheusExporter import PrometheusExporter
+from ..Emulator import OMFEmulator
+from ..Models import (OMFContainer, OMFMessageAction, OMFMessageType, OMFType,
+                      OMFTypeCode, OMFTypeProperty)
+from ..Services import DataService, GeneralService
+from .conftest import createData
+
+
+def record(batcher: AdaptiveBatcher, values: int, seconds: float, status_code: int):
+    batcher.record(
+        OMFMessageType.Data, OMFMessageAction.Create, 1, values, seconds, status_code
+    )
+
+
+def test_split_respects_targets():
+    batcher = AdaptiveBatcher(
+        min_values=1, initial_values=25, min_messages=1, initial_messages=3
+    )
+    omf_data = [createData(f'c{i}', count) for i, count in enumerate([60, 5, 5, 5, 5])]
+
+    batches = list(batcher.split(omf_data))
+    assert [[len(message.Values) for message in batch] for batch in batches] == [
+        [25],
+        [25],
+        [10, 5, 5],
+        [5, 5],
+    ]
+    assert [message.ContainerId for message in batches[2]] == ['c0', 'c1', 'c2']
+    assert batches[1][0].Values == omf_data[0].Values[25:50]
+    assert batches[3][1] is omf_data[4]
+
+
+def test_record_adjusts_targets():
+    batcher = AdaptiveBatcher(initial_values=1000, initial_messages=10)
+    metrics = InMemoryMetrics()
+    batcher.Metrics = metrics
+
+    # Growing while the values per second keep up
+    record(batcher, 1000, 1.0, 202)
+    record(batcher, 1250, 1.0, 202)
+    assert batcher.ValuesPerRequest == 1562
+    assert batcher.MessagesPerRequest == 15
+
+    # Stepping back when they drop
+    record(batcher, 1562, 2.0, 202)
+    assert batcher.ValuesPerRequest == 1250
+    assert batcher.ValuesPerSecond == 781
+
+    # Throttling cuts the targets, payload too large also lowers the largest target
+    record(batcher, 1250, 1.0, 429)
+    assert batcher.ValuesPerRequest == 625
+    assert batcher.MaxValuesPerRequest == 100000
+    record(batcher, 600, 1.0, 413)
+    assert batcher.ValuesPerRequest == 300
+    assert batcher.MaxValuesPerRequest == 300
+    for _ in range(10):
+        record(batcher, 300, 0.1, 202)
+    assert batcher.ValuesPerRequest == 300
+
+    # Other errors are not the batch size's fault
+    record(batcher, 300, 1.0, 400)
+    assert batcher.ValuesPerRequest == 300
+
+    series = metrics.snapshot()['Data']['Create']
+    assert series['batch_values'] == 300
+    assert series['batch_messages'] == batcher.MessagesPerRequest
+    assert series['values_per_second'] == 3000
+    text = PrometheusExporter(metrics).render()
+    assert 'omf_batch_values{message_type="Data",action="Create"} 300' in text
+
+
+def test_data_service_splits_payload_too_large_requests():
+    omf_type = OMFType(
+        'MyType',
+        Properties={
+            'timestamp': OMFTypeProperty(OMFTypeCode.String, IsIndex=True),
+            'value': OMFTypeProperty(OMFTypeCode.Number),
+        },
+    )
+    with OMFEmulator() as emulator, OMFClient(emulator.Url) as client:
+        GeneralService(client).create([omf_type, OMFContainer('c1', 'MyType')])
+        emulator.MaxBodySize = 4096
+        client.MaxRetries = 0
+
+        batcher = AdaptiveBatcher(min_values=10, initial_values=10000)
+        service = DataService(client, batcher)
+        service.createData([createData('c1', 5000)])
+
+        assert emulator.ValueCounts == {'c1': 5000}
+        assert emulator.stats()['status_codes'][413] >= 1
+        assert batcher.MaxValuesPerRequest < 5000
+
+        # Requests that cannot be split further still fail
+        emulator.MaxBodySize = 10
+        with pytest.raises(OMFError, match='413'):
+            service.createData([createData('c1', 10)])
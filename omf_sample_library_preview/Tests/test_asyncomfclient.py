@@ -0,0 +1,117 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+from ..Client.AsyncOMFClient import AsyncOMFClient
+from ..Client.OMFError import OMFError
+from ..Client.RetryPolicy import RetryPolicy
+from ..Client.StoreAndForwardQueue import StoreAndForwardQueue
+from ..Models import OMFData
+from ..Services import AsyncDataService
+from .conftest import MyClass1
+
+
+async def startServer(statuses: list[int], received: list):
+    async def handler(request: web.Request):
+        received.append(
+            (dict(request.headers), json.loads(gzip.decompress(await request.read())))
+        )
+        return web.Response(status=statuses.pop(0) if statuses else 200)
+
+    app = web.Application()
+    app.router.add_post('/omf', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def test_async_data_service_sends_gzip_omf_message():
+    async def run():
+        received = []
+        runner, url = await startServer([], received)
+        try:
+            async with AsyncOMFClient(url) as client:
+                await AsyncDataService(client).createData(
+                    [OMFData([MyClass1(datetime(2000, 1, 1), 5)], ContainerId='c1')]
+                )
+        finally:
+            await runner.cleanup()
+        return received
+
+    received = asyncio.run(run())
+    assert len(received) == 1
+    headers, body = received[0]
+    assert headers['messagetype'] == 'Data'
+    assert headers['action'] == 'Create'
+    assert body == [
+        {
+            'Values': [{'timestamp': '2000-01-01T00:00:00', 'value': 5}],
+            'ContainerId': 'c1',
+        }
+    ]
+
+
+def test_async_retry_uses_asyncio_sleep(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+
+    async def run():
+        received = []
+        runner, url = await startServer([503, 504], received)
+        try:
+            async with AsyncOMFClient(url) as client:
+                client.RetryPolicy = RetryPolicy(jitter=False)
+                await AsyncDataService(client).createData(
+                    [OMFData([MyClass1(datetime(2000, 1, 1), 5)])]
+                )
+        finally:
+            await runner.cleanup()
+        return received
+
+    assert len(asyncio.run(run())) == 3
+    assert [seconds for seconds in sleeps if seconds] == [1, 2]
+
+
+def test_async_stored_bodies_are_sent_on_sync_session():
+    async def run():
+        received = []
+        runner, url = await startServer([], received)
+        try:
+            async with AsyncOMFClient(url) as client:
+                client.StoreAndForward = StoreAndForwardQueue(':memory:')
+                await AsyncDataService(client).createData(
+                    [OMFData([MyClass1(datetime(2000, 1, 1), 5)], ContainerId='c1')]
+                )
+                flushed = await asyncio.get_running_loop().run_in_executor(
+                    None, client.StoreAndForward.flush, 5
+                )
+        finally:
+            await runner.cleanup()
+        return flushed, received
+
+    flushed, received = asyncio.run(run())
+    assert flushed
+    assert [body[0]['ContainerId'] for _, body in received] == ['c1']
+
+
+def test_async_closed_client_raises_error():
+    async def run():
+        client = AsyncOMFClient('http://127.0.0.1')
+        await client.close()
+        with pytest.raises(OMFError):
+            client.ClientSession
+
+    asyncio.run(run())
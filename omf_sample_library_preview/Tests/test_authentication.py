@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+
+import requests
+
+from ..Client.Authentication import Authentication
+from .conftest import createResponse
+
+
+def createIdentityServer(monkeypatch, expires_in: float = 3600) -> dict:
+    calls = {'discovery': 0, 'token': 0}
+    lock = threading.Lock()
+
+    def get(url, *args, **kwargs):
+        with lock:
+            calls['discovery'] += 1
+        return createResponse(
+            200, content=b'{"token_endpoint": "https://test.com/token"}'
+        )
+
+    def post(url, *args, **kwargs):
+        time.sleep(0.05)
+        with lock:
+            calls['token'] += 1
+            count = calls['token']
+        content = {'access_token': f'token{count}', 'expires_in': expires_in}
+        return createResponse(200, content=json.dumps(content).encode('utf-8'))
+
+    monkeypatch.setattr(requests, 'get', get)
+    monkeypatch.setattr(requests, 'post', post)
+    return calls
+
+
+def test_concurrent_callers_share_one_refresh(monkeypatch):
+    calls = createIdentityServer(monkeypatch)
+    authentication = Authentication(
+        'tenant', 'https://shared.test.com', 'id', 'secret', background_refresh=False
+    )
+    tokens = []
+
+    threads = [
+        threading.Thread(target=lambda: tokens.append(authentication.getToken()))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ['token1'] * 10
+    assert calls['token'] == 1
+
+
+def test_discovery_document_is_cached(monkeypatch):
+    calls = createIdentityServer(monkeypatch, expires_in=0)
+    first = Authentication(
+        'tenant', 'https://cached.test.com', 'id', 'secret', background_refresh=False
+    )
+    second = Authentication(
+        'tenant', 'https://cached.test.com', 'id', 'secret', background_refresh=False
+    )
+
+    first.getToken()
+    first.getToken()
+    second.getToken()
+
+    assert calls == {'discovery': 1, 'token': 3}
+
+
+def test_slow_discovery_does_not_block_other_servers(monkeypatch):
+    release = threading.Event()
+
+    def get(url, *args, **kwargs):
+        if url.startswith('https://slow.test.com'):
+            release.wait(5)
+        return createResponse(
+            200, content=b'{"token_endpoint": "https://test.com/token"}'
+        )
+
+    monkeypatch.setattr(requests, 'get', get)
+    slow = Authentication(
+        'tenant', 'https://slow.test.com', 'id', 'secret', background_refresh=False
+    )
+    fast = Authentication(
+        'tenant', 'https://fast.test.com', 'id', 'secret', background_refresh=False
+    )
+    thread = threading.Thread(target=slow.getDiscoveryDocument)
+    thread.start()
+    try:
+        start = time.monotonic()
+        fast.getDiscoveryDocument()
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_token_is_refreshed_in_the_background(monkeypatch):
+    calls = createIdentityServer(monkeypatch, expires_in=5 * 60 + 0.4)
+    authentication = Authentication(
+        'tenant', 'https://background.test.com', 'id', 'secret', refresh_margin=5 * 60
+    )
+    try:
+        assert authentication.getToken() == 'token1'
+        time.sleep(0.6)
+        assert calls['token'] >= 2
+        assert authentication.getToken() != 'token1'
+    finally:
+        authentication.close()
+
+    count = calls['token']
+    time.sleep(0.6)
+    assert calls['token'] == count
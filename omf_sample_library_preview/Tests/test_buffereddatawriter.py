@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from ..Client.OMFError import OMFError
+from ..Services import BufferedDataWriter
+from .conftest import FakeDataService, MyClass1
+
+
+def test_values_are_coalesced_per_container():
+    data_service = FakeDataService()
+    with BufferedDataWriter(data_service, max_latency=60) as writer:
+        writer.write('c1', MyClass1(datetime(2000, 1, 1), 1))
+        writer.write('c2', MyClass1(datetime(2000, 1, 1), 2), 'type')
+        writer.write('c1', MyClass1(datetime(2000, 1, 2), 3))
+        writer.flush()
+
+    assert len(data_service.Sent) == 1
+    sent = {data.ContainerId: data for data in data_service.Sent[0]}
+    assert [value.value for value in sent['c1'].Values] == [1, 3]
+    assert sent['c2'].TypeId == 'type'
+
+
+def test_value_count_triggers_send():
+    data_service = FakeDataService()
+    writer = BufferedDataWriter(data_service, max_values=3, max_latency=60)
+    writer.writeMany('c1', [MyClass1(datetime(2000, 1, 1), i) for i in range(3)])
+    assert data_service.Event.wait(5)
+    writer.close()
+    assert len(data_service.Sent) == 1
+
+
+def test_latency_triggers_send():
+    data_service = FakeDataService()
+    with BufferedDataWriter(data_service, max_latency=0.05) as writer:
+        start = time.monotonic()
+        writer.write('c1', MyClass1(datetime(2000, 1, 1), 1))
+        assert data_service.Event.wait(5)
+        assert time.monotonic() - start >= 0.05
+
+
+def test_close_drains_buffer_and_rejects_writes():
+    data_service = FakeDataService()
+    writer = BufferedDataWriter(data_service, max_latency=60)
+    writer.write('c1', MyClass1(datetime(2000, 1, 1), 1))
+    writer.close()
+
+    assert len(data_service.Sent) == 1
+    with pytest.raises(OMFError):
+        writer.write('c1', MyClass1(datetime(2000, 1, 1), 1))
+
+
+def test_send_error_is_raised_on_flush():
+    data_service = FakeDataService(OMFError('Failed to create data'))
+    writer = BufferedDataWriter(data_service, max_latency=60)
+    writer.write('c1', MyClass1(datetime(2000, 1, 1), 1))
+    with pytest.raises(OMFError):
+        writer.flush()
+    writer.close()
+
+
+def test_queue_size_counts_values():
+    data_service = FakeDataService()
+    writer = BufferedDataWriter(data_service, max_latency=60, max_queue_size=5)
+    values = [MyClass1(datetime(2000, 1, 1), i) for i in range(6)]
+    with pytest.raises(OMFError):
+        writer.writeMany('c1', values)
+
+    writer.writeMany('c1', values[:5])
+    writer.flush()
+    assert writer.QueuedValues == 0
+    writer.writeMany('c1', values[:5])
+    writer.close()
+
+    assert sum(len(data.Values) for sent in data_service.Sent for data in sent) == 10
+
+
+def test_values_written_while_closing_are_sent():
+    data_service = FakeDataService()
+    writer = BufferedDataWriter(data_service, max_latency=60)
+    written = []
+
+    def write():
+        for i in range(1000):
+            try:
+                writer.write('c1', MyClass1(datetime(2000, 1, 1), i))
+            except OMFError:
+                return
+            written.append(i)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    writer.close()
+    for thread in threads:
+        thread.join()
+
+    assert sum(len(data.Values) for sent in data_service.Sent for data in sent) == len(
+        written
+    )
+
+
+def test_max_bytes_applies_to_values_json_cannot_serialize():
+    data_service = FakeDataService()
+    with BufferedDataWriter(data_service, max_bytes=100, max_latency=60) as writer:
+        for i in range(10):
+            writer.write('c1', {'timestamp': datetime(2000, 1, 1), 'value': i})
+        writer.flush()
+
+    assert len(data_service.Sent) > 1
@@ -0,0 +1,80 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from ..Client.CompressionPolicy import CompressionPolicy
+from ..Models import OMFContainer, OMFMessageAction, OMFMessageType
+from .conftest import decompress
+
+
+def test_small_body_is_sent_uncompressed(createClient):
+    sent = []
+    client = createClient(sent)
+    client.CompressionPolicy = CompressionPolicy(min_size=1024)
+    client.omfRequest(
+        OMFMessageType.Container,
+        OMFMessageAction.Create,
+        [OMFContainer('container', 'type')],
+    )
+
+    headers, body = sent[0]
+    assert 'compression' not in headers
+    assert json.loads(body) == [{'Id': 'container', 'TypeId': 'type'}]
+    assert client.CompressionPolicy.stats()['uncompressed_bodies'] == 1
+
+
+def test_large_body_is_compressed_and_counted(createClient):
+    sent = []
+    client = createClient(sent)
+    client.CompressionPolicy = CompressionPolicy(level=1, min_size=1024)
+    containers = [OMFContainer(f'container{i}', 'type') for i in range(100)]
+    client.omfRequest(OMFMessageType.Container, OMFMessageAction.Create, containers)
+
+    headers, body = sent[0]
+    assert headers['compression'] == 'gzip'
+    assert len(json.loads(gzip.decompress(body))) == 100
+
+    stats = client.CompressionPolicy.stats()
+    assert stats['compressed_bodies'] == 1
+    assert stats['bytes_after_compression'] == len(body)
+    assert stats['bytes_before_compression'] == len(gzip.decompress(body))
+
+
+def test_batches_are_compressed_on_executor(createClient):
+    sent = []
+    client = createClient(sent)
+    client.CompressionPolicy = CompressionPolicy(level=6, executor='thread')
+    client.MaxPayloadSize = 1_000
+    containers = [OMFContainer(f'container{i}', f'type{i}') for i in range(1_000)]
+    with client:
+        client.omfRequest(OMFMessageType.Container, OMFMessageAction.Create, containers)
+
+    assert len(sent) > 1
+    assert decompress([body for _, body in sent]) == [
+        container.toDictionary() for container in containers
+    ]
+    assert client.CompressionPolicy.CompressedBodies == len(sent)
+
+
+def test_invalid_policy_raises_error():
+    with pytest.raises(ValueError):
+        CompressionPolicy(level=10)
+    with pytest.raises(ValueError):
+        CompressionPolicy(executor='gpu')
+    with pytest.raises(ValueError):
+        CompressionPolicy(executor='process')
+
+
+def test_replaced_policy_is_closed(createClient):
+    client = createClient([])
+    client.CompressionPolicy = CompressionPolicy(executor='thread')
+    client.MaxPayloadSize = 1_000
+    containers = [OMFContainer(f'container{i}', f'type{i}') for i in range(1_000)]
+    client.omfRequest(OMFMessageType.Container, OMFMessageAction.Create, containers)
+
+    threads = [t for t in threading.enumerate() if t.name.startswith('OMFCompression')]
+    assert threads
+    client.CompressionPolicy = CompressionPolicy()
+    assert not any(thread.is_alive() for thread in threads)
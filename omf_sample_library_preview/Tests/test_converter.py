@@ -3,9 +3,10 @@ from types import NoneType
 
 import pytest
 
-from ..Converters.ClassToOMFTypeConverter import (convert,
+from ..Converters.ClassToOMFTypeConverter import (convert, convertModule,
                                                   getOMFTypeFromPythonType,
-                                                  omf_type, omf_type_property)
+                                                  invalidate, omf_type,
+                                                  omf_type_property)
 from ..Models import (OMFClassification, OMFFormatCode, OMFType, OMFTypeCode,
                       OMFTypeProperty, OMFTypeType)
 
@@ -105,3 +106,72 @@ class MyClass1:
 )
 def test_convert(omf_class: type, expected: OMFType):
     assert convert(omf_class) == expected
+
+
+def test_convert_returns_copies():
+    first = convert(MyClass1)
+    first.Properties['value'].Uom = 'm'
+    first.Properties.pop('timestamp')
+
+    second = convert(MyClass1)
+    assert second is not first
+    assert second.Properties['value'].Uom is None
+    assert 'timestamp' in second.Properties
+    assert getattr(MyClass1, '__omf_type').Properties is None
+
+
+def test_invalidate():
+    @omf_type()
+    class MyClass2:
+        @property
+        def value(self) -> float:
+            return 0
+
+    assert convert(MyClass2).Properties['value'].Type == OMFTypeCode.Number
+
+    MyClass2.value = property(lambda self: 0)
+    MyClass2.value.fget.__annotations__['return'] = int
+    assert convert(MyClass2).Properties['value'].Type == OMFTypeCode.Number
+
+    invalidate(MyClass2)
+    assert convert(MyClass2).Properties['value'].Type == OMFTypeCode.Integer
+
+
+def test_convertModule(tmp_path, monkeypatch):
+    package = tmp_path / 'omf_test_types'
+    (package / 'sub').mkdir(parents=True)
+    (package / '__init__.py').write_text('')
+    (package / 'sub' / '__init__.py').write_text('')
+    definition = '''
+from omf_sample_library_preview.Converters import omf_type, omf_type_property
+
+
+@omf_type(Id='{id}')
+class {name}:
+    @omf_type_property(IsIndex=True)
+    def timestamp(self) -> str:
+        return ''
+
+
+class NotAType:
+    pass
+'''
+    (package / 'first.py').write_text(definition.format(id='Type1', name='First'))
+    (package / 'sub' / 'second.py').write_text(
+        definition.format(id='Type2', name='Second') + 'from ..first import First\n'
+    )
+    (package / 'sub' / 'third.py').write_text(
+        definition.format(id='Type1', name='Third')
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    omf_types = convertModule('omf_test_types')
+    assert [omf_type.Id for omf_type in omf_types] == ['Type1', 'Type2']
+    assert convertModule('omf_test_types.sub', recursive=False) == []
+    assert [t.Id for t in convertModule('omf_test_types.sub.second')] == ['Type2']
+
+    (package / 'sub' / 'fourth.py').write_text(
+        definition.format(id='Type2', name='Fourth').replace('-> str', '-> int')
+    )
+    with pytest.raises(ValueError):
+        convertModule('omf_test_types')
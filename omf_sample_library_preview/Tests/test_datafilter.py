@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from ..Client.OMFClient import OMFClient
+from ..Emulator import OMFEmulator
+from ..Models import (OMFColumnData, OMFContainer, OMFData, OMFType,
+                      OMFTypeCode, OMFTypeProperty)
+from ..Services import DataFilter, DataService, GeneralService
+
+START = datetime(2000, 1, 1)
+
+
+@dataclass
+class MyStateClass:
+    timestamp: datetime
+    value: float
+    state: str = 'On'
+
+
+def createType() -> OMFType:
+    return OMFType(
+        'MyType',
+        Properties={
+            'timestamp': OMFTypeProperty(OMFTypeCode.String, IsIndex=True),
+            'value': OMFTypeProperty(OMFTypeCode.Number),
+            'state': OMFTypeProperty(OMFTypeCode.String),
+        },
+    )
+
+
+def createStateData(
+    values: list[float], container_id: str = 'c1', start: int = 0
+) -> OMFData:
+    return OMFData(
+        [
+            MyStateClass(START + timedelta(seconds=i), value)
+            for i, value in enumerate(values, start)
+        ],
+        'MyType',
+        container_id,
+    )
+
+
+def sentValues(omf_data: list[OMFData]) -> list[tuple[float, float]]:
+    return [
+        ((value.timestamp - START).total_seconds(), value.value)
+        for message in omf_data
+        for value in message.Values
+    ]
+
+
+def test_deadband_sends_the_last_held_value():
+    data_filter = DataFilter([createType()], deadband=0.5)
+    omf_data = createStateData([10, 10.1, 10.2, 12, 12.1, 12.2])
+
+    assert sentValues(data_filter.filter([omf_data])) == [
+        (0, 10),
+        (2, 10.2),
+        (3, 12),
+    ]
+    assert sentValues(data_filter.flush()) == [(5, 12.2)]
+    assert data_filter.flush() == []
+
+
+def test_deadband_percent_and_other_properties():
+    data_filter = DataFilter([createType()], deadband=0.5, deadband_percent=1)
+    omf_data = createStateData([100, 100.9, 101.1, 101.1, 101.1])
+    omf_data.Values[3].state = omf_data.Values[4].state = 'Off'
+
+    # 100.9 is within 1% of 100, the state change passes regardless of the value
+    assert sentValues(data_filter.filter([omf_data])) == [
+        (0, 100),
+        (1, 100.9),
+        (2, 101.1),
+        (3, 101.1),
+    ]
+
+
+def test_max_seconds():
+    data_filter = DataFilter([createType()], deadband=1, max_seconds=10)
+    omf_data = createStateData([5] * 25)
+
+    assert sentValues(data_filter.filter([omf_data])) == [(0, 5), (10, 5), (20, 5)]
+
+
+def test_swinging_door_keeps_the_corners():
+    data_filter = DataFilter([createType()], compression=0.1)
+    ramp = (
+        [float(i) for i in range(11)]
+        + [10.0] * 10
+        + [10 - i * 0.5 for i in range(1, 5)]
+    )
+
+    sent = sentValues(data_filter.filter([createStateData(ramp)]))
+    sent += sentValues(data_filter.flush())
+    assert sent == [(0, 0), (10, 10), (20, 10), (24, 8)]
+
+
+def test_swinging_door_after_deadband():
+    # The deadband removes the noise, then the door sends the corners of the ramp
+    data_filter = DataFilter([createType()], deadband=0.05, compression=0.5)
+    values = [0.0, 0.01, 0.02, 1, 2, 3, 4, 4.01, 4.02, 4.03]
+
+    sent = sentValues(data_filter.filter([createStateData(values)]))
+    sent += sentValues(data_filter.flush())
+    assert sent == [(0, 0), (3, 1), (6, 4), (9, 4.03)]
+
+
+def test_filter_state_is_kept_per_container():
+    data_filter = DataFilter(
+        [createType()], [OMFContainer('c2', 'MyType')], deadband=0.5
+    )
+    data_filter.configure('c2', deadband=None)
+    untyped = createStateData([1, 1, 1], 'c2')
+    untyped.TypeId = None
+    unknown = createStateData([1, 1, 1], 'c3')
+    unknown.TypeId = 'OtherType'
+
+    filtered = data_filter.filter(
+        [createStateData([1, 1]), untyped, unknown, createStateData([1, 2], start=2)]
+    )
+    assert [(message.ContainerId, len(message.Values)) for message in filtered] == [
+        ('c1', 1),
+        ('c2', 3),
+        ('c3', 3),
+        ('c1', 2),
+    ]
+
+
+def test_column_data_zero_values_are_compared():
+    omf_type = createType()
+    data_filter = DataFilter([omf_type], deadband=1)
+    values = [
+        MyStateClass(START + timedelta(seconds=i), value)
+        for i, value in enumerate([0.0, 0.5, -0.5, 0.0, 2.0])
+    ]
+    sent = data_filter.filter([OMFColumnData.fromValues(omf_type, values, 'c1')])
+
+    assert (
+        sent[0].toDictionary()['Values']
+        == OMFData([values[0], values[3], values[4]]).toDictionary()['Values']
+    )
+
+
+def test_data_service_filters_created_data():
+    omf_type = createType()
+    with OMFEmulator() as emulator, OMFClient(emulator.Url) as client:
+        GeneralService(client).create([omf_type, OMFContainer('c1', 'MyType')])
+        service = DataService(client, data_filter=DataFilter([omf_type], deadband=1))
+
+        service.createData([createStateData([1, 1.5, 1.2])])
+        service.createData([createStateData([1.4], start=3)])
+        assert emulator.ValueCounts == {'c1': 1}
+
+        # Column backed values are filtered too
+        values = [MyStateClass(START + timedelta(seconds=i), 5) for i in range(4, 7)]
+        service.createData([OMFColumnData.fromValues(omf_type, values, 'c1')])
+        assert emulator.ValueCounts == {'c1': 3}
+
+        service.flushData()
+        assert emulator.ValueCounts == {'c1': 4}
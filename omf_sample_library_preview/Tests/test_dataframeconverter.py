@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+
+from ..Converters import (convertDataFrame, getDataFrameContainers,
+                          getDataFrameData, sendDataFrame)
+from ..Models import (OMFClassification, OMFContainer, OMFFormatCode, OMFType,
+                      OMFTypeCode, OMFTypeProperty, OMFTypeType)
+
+
+def createDataFrame():
+    return pd.DataFrame(
+        {
+            'Timestamp': pd.date_range(
+                '2000-01-01', periods=3, freq='s', tz='Etc/GMT+1'
+            ),
+            'Value': [1.5, np.nan, 2.5],
+            'Count': pd.Series([1, None, 3], dtype='Int64'),
+            'Flag': np.array([True, False, True]),
+            'Small': np.array([1, 2, 3], dtype='int32'),
+        }
+    ).set_index('Timestamp')
+
+
+def test_dataframe_type():
+    omf_type = convertDataFrame(createDataFrame(), 'MyType')
+
+    assert omf_type == [
+        OMFType(
+            'MyType',
+            OMFClassification.Dynamic,
+            OMFTypeType.Object,
+            Properties={
+                'Timestamp': OMFTypeProperty(
+                    OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+                ),
+                'Value': OMFTypeProperty(
+                    [OMFTypeCode.Number, OMFTypeCode.Null], OMFFormatCode.Float64
+                ),
+                'Count': OMFTypeProperty(
+                    [OMFTypeCode.Integer, OMFTypeCode.Null], OMFFormatCode.Int64
+                ),
+                'Flag': OMFTypeProperty(OMFTypeCode.Boolean),
+                'Small': OMFTypeProperty(OMFTypeCode.Integer, OMFFormatCode.Int32),
+            },
+        )
+    ]
+
+
+def test_dataframe_data():
+    omf_data = list(getDataFrameData(createDataFrame(), 'MyContainer', chunk_size=2))
+
+    assert [[data.toDictionary() for data in chunk] for chunk in omf_data] == [
+        [
+            {
+                'Values': [
+                    {
+                        'Timestamp': '2000-01-01T01:00:00',
+                        'Value': 1.5,
+                        'Count': 1,
+                        'Flag': True,
+                        'Small': 1,
+                    },
+                    {
+                        'Timestamp': '2000-01-01T01:00:01',
+                        'Value': None,
+                        'Count': None,
+                        'Flag': False,
+                        'Small': 2,
+                    },
+                ],
+                'ContainerId': 'MyContainer',
+            }
+        ],
+        [
+            {
+                'Values': [
+                    {
+                        'Timestamp': '2000-01-01T01:00:02',
+                        'Value': 2.5,
+                        'Count': 3,
+                        'Flag': True,
+                        'Small': 3,
+                    }
+                ],
+                'ContainerId': 'MyContainer',
+            }
+        ],
+    ]
+
+
+def test_dataframe_per_column():
+    data_frame = createDataFrame().reset_index()
+    omf_types = convertDataFrame(data_frame, 'MyType', 'Timestamp', per_column=True)
+    containers = getDataFrameContainers(
+        data_frame, 'MyContainer', 'MyType', 'Timestamp', per_column=True
+    )
+    omf_data = list(
+        getDataFrameData(data_frame, 'MyContainer', 'Timestamp', per_column=True)
+    )
+
+    assert [omf_type.Id for omf_type in omf_types] == [
+        'MyType.Value',
+        'MyType.Count',
+        'MyType.Flag',
+        'MyType.Small',
+    ]
+    assert list(omf_types[0].Properties) == ['Timestamp', 'Value']
+    assert containers[0] == OMFContainer('MyContainer.Value', 'MyType.Value')
+    assert [data.ContainerId for data in omf_data[0]] == [
+        container.Id for container in containers
+    ]
+    assert omf_data[0][2].toDictionary()['Values'][1] == {
+        'Timestamp': '2000-01-01T01:00:01',
+        'Flag': False,
+    }
+
+
+def test_dataframe_requires_index_name():
+    with pytest.raises(ValueError):
+        convertDataFrame(pd.DataFrame({'Value': [1.0]}), 'MyType')
+
+
+def test_send_dataframe():
+    class DataService:
+        def __init__(self):
+            self.Sent = []
+
+        def createData(self, omf_data):
+            self.Sent.append([json.loads(data.toJson()) for data in omf_data])
+
+    data_service = DataService()
+    sendDataFrame(data_service, createDataFrame(), 'MyContainer', chunk_size=1)
+
+    assert len(data_service.Sent) == 3
+    assert data_service.Sent[2][0]['Values'][0]['Count'] == 3
@@ -0,0 +1,71 @@
+import pytest
+
+from ..Client.OMFError import OMFError
+from ..Models import OMFContainer, OMFMessageType, OMFType
+from ..Services import ContainerService, DefinitionRegistry, TypeService
+from .conftest import decompress
+
+
+def sentIds(sent: list) -> list[list[str]]:
+    return [[message['Id'] for message in decompress([body])] for _, body in sent]
+
+
+def test_unchanged_definitions_are_skipped(createClient):
+    sent = []
+    registry = DefinitionRegistry()
+    type_service = TypeService(createClient(sent), registry)
+
+    type_service.createTypes([OMFType('type1'), OMFType('type2')])
+    type_service.createTypes([OMFType('type1'), OMFType('type2', Name='changed')])
+    type_service.createTypes([OMFType('type1'), OMFType('type2', Name='changed')])
+
+    assert sentIds(sent) == [['type1', 'type2'], ['type2']]
+
+
+def test_failed_definitions_are_not_registered(createClient):
+    sent = []
+    registry = DefinitionRegistry()
+    client = createClient(sent, status_code=400)
+    container_service = ContainerService(client, registry)
+
+    with pytest.raises(OMFError):
+        container_service.createContainers([OMFContainer('container1', 'type1')])
+
+    assert not registry.contains(OMFMessageType.Container, 'container1')
+
+
+def test_invalidate_and_delete_force_resend(createClient):
+    sent = []
+    registry = DefinitionRegistry()
+    container_service = ContainerService(createClient(sent), registry)
+    containers = [
+        OMFContainer('container1', 'type1'),
+        OMFContainer('container2', 'type1'),
+    ]
+
+    container_service.createContainers(containers)
+    registry.invalidate(OMFMessageType.Container, ['container1'])
+    container_service.createContainers(containers)
+    container_service.deleteContainers(containers[1:])
+    container_service.createContainers(containers)
+
+    assert sentIds(sent) == [
+        ['container1', 'container2'],
+        ['container1'],
+        ['container2'],
+        ['container2'],
+    ]
+
+
+def test_registry_is_persisted(createClient, tmp_path):
+    sent = []
+    path = str(tmp_path / 'registry.json')
+    client = createClient(sent)
+
+    TypeService(client, DefinitionRegistry(path)).createTypes([OMFType('type1')])
+    TypeService(client, DefinitionRegistry(path)).createTypes(
+        [OMFType('type1'), OMFType('type2')]
+    )
+
+    assert sentIds(sent) == [['type1'], ['type2']]
+    assert DefinitionRegistry(path).contains(OMFMessageType.Type, 'type2')
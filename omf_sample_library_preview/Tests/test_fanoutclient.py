@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+from requests import Response
+
+from ..Client.CompressionPolicy import CompressionPolicy
+from ..Client.FanOutClient import FanOutClient
+from ..Client.InMemoryMetrics import InMemoryMetrics
+from ..Client.OMFClient import OMFClient
+from ..Client.OMFError import OMFError
+from ..Client.PIOMFClient import PIOMFClient
+from ..Client.StageTimings import StageTimings
+from ..Emulator import OMFEmulator
+from ..Models import (OMFContainer, OMFData, OMFType, OMFTypeCode,
+                      OMFTypeProperty)
+from ..Services import DataService, GeneralService
+from .conftest import MyClass1
+
+# Nothing listens on this port, so requests to it fail right away
+UNAVAILABLE_URL = 'http://127.0.0.1:9'
+
+
+def createObjects(count: int = 10) -> list:
+    start = datetime(2000, 1, 1)
+    return [
+        OMFType(
+            'MyType',
+            Properties={
+                'timestamp': OMFTypeProperty(OMFTypeCode.String, IsIndex=True),
+                'value': OMFTypeProperty(OMFTypeCode.Number),
+            },
+        ),
+        OMFContainer('MyContainer', 'MyType'),
+        OMFData(
+            [MyClass1(start + timedelta(seconds=i), i) for i in range(count)],
+            ContainerId='MyContainer',
+        ),
+    ]
+
+
+def test_fan_out_sends_to_every_endpoint():
+    with OMFEmulator() as first, OMFEmulator() as second:
+        clients = [OMFClient(first.Url), OMFClient(second.Url)]
+        for client in clients:
+            client.Metrics = InMemoryMetrics()
+
+        with FanOutClient(clients) as fan_out, StageTimings.collect() as timings:
+            GeneralService(fan_out).create(createObjects())
+            assert fan_out.flush(10)
+
+        # Each request was serialized once for both endpoints
+        assert len(timings) == 3
+        assert first.ValueCounts == second.ValueCounts == {'MyContainer': 10}
+        for client in clients:
+            assert client.Metrics.total('values') == 10
+            assert client.Metrics.total('requests') == 3
+            client.close()
+
+
+def test_each_client_authenticates_and_compresses_its_bodies(monkeypatch):
+    with OMFEmulator() as first, OMFEmulator() as second:
+        pi_client = PIOMFClient(first.Url, 'user', 'password')
+        pi_client.CompressionPolicy = CompressionPolicy(min_size=1024**2)
+        client = OMFClient(second.Url)
+        compressed = []
+        session_request = pi_client.Session.request
+
+        # Answers like a PI Web API requiring Basic authentication
+        def request(method, url, **kwargs):
+            auth = kwargs.get('auth')
+            if auth is None or (auth.username, auth.password) != ('user', 'password'):
+                response = Response()
+                response.status_code = 401
+                response._content = b''
+                return response
+            compressed.append('compression' in kwargs['headers'])
+            return session_request(method, url, **kwargs)
+
+        monkeypatch.setattr(pi_client.Session, 'request', request)
+        with FanOutClient([pi_client, client]) as fan_out:
+            GeneralService(fan_out).create(createObjects())
+            assert fan_out.flush(10)
+            assert fan_out.Queues[0].Dropped == 0
+
+        assert first.ValueCounts == second.ValueCounts == {'MyContainer': 10}
+        assert compressed == [False] * 3
+        assert pi_client.CompressionPolicy.UncompressedBodies == 3
+        assert client.CompressionPolicy.CompressedBodies == 3
+        pi_client.close()
+        client.close()
+
+
+def test_unavailable_endpoint_does_not_block_the_others():
+    with OMFEmulator() as emulator:
+        clients = [OMFClient(UNAVAILABLE_URL), OMFClient(emulator.Url)]
+        fan_out = FanOutClient(clients, retry_interval=60)
+        GeneralService(fan_out).create(createObjects())
+        DataService(fan_out).createData(createObjects()[2:])
+
+        assert not fan_out.flush(0.1)
+        assert fan_out.Queues[1].flush(10)
+        assert emulator.ValueCounts == {'MyContainer': 20}
+        assert fan_out.Queues[0].Pending == 4
+
+        fan_out.close(0)
+        assert fan_out.Closed
+        with pytest.raises(OMFError, match='closed'):
+            DataService(fan_out).createData(createObjects()[2:])
+        for client in clients:
+            client.close()
+
+
+def test_full_queue_only_affects_its_endpoint():
+    with OMFEmulator() as emulator:
+        clients = [OMFClient(UNAVAILABLE_URL), OMFClient(emulator.Url)]
+        with FanOutClient(
+            clients, max_queue_bytes=1000, drop_policy='error', retry_interval=60
+        ) as fan_out:
+            GeneralService(fan_out).create(createObjects())
+            with pytest.raises(OMFError, match=UNAVAILABLE_URL):
+                for _ in range(20):
+                    DataService(fan_out).createData(createObjects()[2:])
+                    assert fan_out.Queues[1].flush(10)
+
+            assert fan_out.Queues[1].flush(10)
+            assert fan_out.Queues[0].PendingBytes <= 1000
+            # The unavailable endpoint holds the type, the container and the data accepted before its queue was full,
+            # and the other endpoint also received the data refused by that queue
+            assert (
+                emulator.ValueCounts['MyContainer']
+                == (fan_out.Queues[0].Pending - 1) * 10
+            )
+
+            fan_out.close(0)
+        for client in clients:
+            client.close()
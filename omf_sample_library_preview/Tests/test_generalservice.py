@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from ..Client.OMFClient import OMFClient
+from ..Client.OMFError import OMFError
+from ..Models import OMFContainer, OMFData, OMFType
+from ..Services import AsyncGeneralService, GeneralService
+from .conftest import createResponse
+
+
+def createObjects() -> list:
+    return (
+        [OMFData([], ContainerId=f'container{i}') for i in range(25)]
+        + [OMFContainer(f'container{i}', f'type{i % 3}') for i in range(25)]
+        + [OMFType(f'type{i}') for i in range(3)]
+    )
+
+
+def test_parallel_create_keeps_phase_order(createClient):
+    sent = []
+    service = GeneralService(
+        createClient(sent, delay=0.01), max_workers=4, chunk_size=5
+    )
+    service.create(createObjects())
+
+    assert [headers['messagetype'] for headers, _ in sent] == ['Type'] + [
+        'Container'
+    ] * 5 + ['Data'] * 5
+
+
+def test_delete_sends_data_before_containers_before_types(createClient):
+    sent = []
+    service = GeneralService(
+        createClient(sent, delay=0.01), max_workers=4, chunk_size=5
+    )
+    service.delete(createObjects())
+
+    assert [headers['messagetype'] for headers, _ in sent] == ['Data'] * 5 + [
+        'Container'
+    ] * 5 + ['Type']
+    assert all(headers['action'] == 'Delete' for headers, _ in sent)
+
+
+def test_sequential_create_sends_one_request_per_phase(createClient):
+    sent = []
+    GeneralService(createClient(sent, delay=0.01)).create(createObjects())
+
+    assert [headers['messagetype'] for headers, _ in sent] == [
+        'Type',
+        'Container',
+        'Data',
+    ]
+
+
+def test_parallel_failure_stops_before_next_phase(createClient):
+    sent = []
+    service = GeneralService(
+        createClient(sent, 400, delay=0.01), max_workers=4, chunk_size=5
+    )
+    with pytest.raises(OMFError):
+        service.create(createObjects()[:50])
+
+    assert all(headers['messagetype'] == 'Container' for headers, _ in sent)
+
+
+def test_parallel_failure_cancels_remaining_chunks(createClient):
+    sent = []
+    service = GeneralService(
+        createClient(sent, 400, delay=0.01), max_workers=2, chunk_size=1
+    )
+    with pytest.raises(OMFError):
+        service.create([OMFContainer(f'container{i}', 'type') for i in range(20)])
+
+    assert len(sent) < 20
+
+
+class FakeAsyncClient:
+    def __init__(self, sent: list, status_code: int = 202):
+        self.Sent = sent
+        self.StatusCode = status_code
+
+    async def omfRequest(self, message_type, action, omf_message):
+        await asyncio.sleep(0.01)
+        self.Sent.append((message_type.value, action.value))
+        return createResponse(self.StatusCode)
+
+    def verifySuccessfulResponse(self, response, main_message, throw_on_bad=True):
+        OMFClient(url='https://test.com').verifySuccessfulResponse(
+            response, main_message, throw_on_bad
+        )
+
+
+def test_async_parallel_failure_cancels_remaining_chunks():
+    sent = []
+    service = AsyncGeneralService(
+        FakeAsyncClient(sent, 400), max_workers=2, chunk_size=1
+    )
+    with pytest.raises(OMFError):
+        asyncio.run(
+            service.create([OMFContainer(f'container{i}', 'type') for i in range(20)])
+        )
+
+    assert len(sent) < 20
@@ -0,0 +1,117 @@
+import asyncio
+
+import requests
+
+from ..Client.AsyncOMFClient import AsyncOMFClient
+from ..Client.InMemoryMetrics import InMemoryMetrics
+from ..Client.OMFClient import OMFClient
+from ..Client.PrometheusExporter import PrometheusExporter
+from ..Client.RetryPolicy import RetryPolicy
+from ..Emulator import OMFEmulator
+from ..Models import (OMFContainer, OMFMessageAction, OMFMessageType, OMFType,
+                      OMFTypeCode, OMFTypeProperty)
+from .conftest import createData
+
+
+def createMessages() -> tuple[list, list, list]:
+    omf_type = OMFType(
+        'MyType',
+        Properties={
+            'timestamp': OMFTypeProperty(OMFTypeCode.String, IsIndex=True),
+            'value': OMFTypeProperty(OMFTypeCode.Number),
+        },
+    )
+    container = OMFContainer('MyContainer', 'MyType')
+    data = createData('MyContainer', 10)
+    return [omf_type], [container], [data, data]
+
+
+def sendMessages(client: OMFClient):
+    omf_types, containers, data = createMessages()
+    client.omfRequest(OMFMessageType.Type, OMFMessageAction.Create, omf_types)
+    client.omfRequest(OMFMessageType.Container, OMFMessageAction.Create, containers)
+    return client.omfRequest(OMFMessageType.Data, OMFMessageAction.Create, data)
+
+
+def test_metrics_counts_messages_values_and_bytes():
+    metrics = InMemoryMetrics()
+    with OMFEmulator() as emulator, OMFClient(emulator.Url) as client:
+        client.Metrics = metrics
+        sendMessages(client)
+        client.StreamingChunkSize = 64
+        sendMessages(client)
+
+    data = metrics.snapshot()['Data']['Create']
+    assert data['messages'] == 4
+    assert data['values'] == 40
+    assert data['requests'] == 2
+    assert data['status_codes'] == {'202': 2}
+    assert data['errors'] == 0
+    assert data['compressed_bytes'] == emulator.stats()['bytes_received'] - sum(
+        metrics.snapshot()[message_type]['Create']['compressed_bytes']
+        for message_type in ('Type', 'Container')
+    )
+    assert data['raw_bytes'] > data['compressed_bytes']
+    assert sum(data['latency_seconds']['buckets']) == 2
+    assert metrics.total('requests') == 6
+
+
+def test_metrics_counts_retries_throttles_and_errors():
+    metrics = InMemoryMetrics()
+    with OMFEmulator(max_requests_per_second=2) as emulator:
+        with OMFClient(emulator.Url) as client:
+            client.Metrics = metrics
+            client.RetryPolicy = RetryPolicy(max_retries=1, max_delay=0)
+            for _ in range(2):
+                sendMessages(client)
+
+    assert metrics.total('throttles') > 0
+    assert metrics.total('retries') > 0
+    assert metrics.total('errors') >= metrics.total('throttles')
+    assert metrics.total('requests') == 6 + metrics.total('retries')
+
+
+def test_async_metrics():
+    async def send():
+        async with AsyncOMFClient(emulator.Url) as client:
+            client.Metrics = metrics
+            omf_types, containers, data = createMessages()
+            await client.omfRequest(
+                OMFMessageType.Type, OMFMessageAction.Create, omf_types
+            )
+            await client.omfRequest(OMFMessageType.Data, OMFMessageAction.Create, data)
+
+    metrics = InMemoryMetrics()
+    with OMFEmulator() as emulator:
+        asyncio.run(send())
+
+    snapshot = metrics.snapshot()
+    assert snapshot['Type']['Create']['status_codes'] == {'202': 1}
+    assert snapshot['Data']['Create']['values'] == 20
+    assert snapshot['Data']['Create']['errors'] == 1
+
+
+def test_prometheus_exporter():
+    metrics = InMemoryMetrics(buckets=(0.1, 1))
+    metrics.recordMessages(OMFMessageType.Data, OMFMessageAction.Create, 2, 20)
+    metrics.recordRequest(OMFMessageType.Data, OMFMessageAction.Create, 0.05, 202)
+    metrics.recordRequest(OMFMessageType.Data, OMFMessageAction.Create, 2, 429)
+
+    exporter = PrometheusExporter(metrics)
+    text = exporter.render()
+    labels = 'message_type="Data",action="Create"'
+    assert f'omf_values_total{{{labels}}} 20' in text
+    assert f'omf_throttles_total{{{labels}}} 1' in text
+    assert f'omf_requests_total{{{labels},status_code="429"}} 1' in text
+    assert f'omf_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'omf_request_duration_seconds_bucket{{{labels},le="1"}} 1' in text
+    assert f'omf_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'omf_request_duration_seconds_count{{{labels}}} 2' in text
+
+    exporter.start('127.0.0.1', 0)
+    try:
+        response = requests.get(exporter.Url)
+        assert response.status_code == 200
+        assert response.text == text
+    finally:
+        exporter.stop()
@@ -0,0 +1,127 @@
+import gzip
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from ..Client.OMFClient import OMFClient
+from ..Client.PayloadBatcher import PayloadBatcher
+from ..Client.StreamingEncoder import StreamingEncoder
+from ..Models import (OMFArrayData, OMFData, OMFFormatCode, OMFType,
+                      OMFTypeCode, OMFTypeProperty)
+
+
+@dataclass
+class MyCountClass:
+    timestamp: datetime
+    value: float
+    count: int
+
+
+def createArrays(count: int) -> dict:
+    start = np.datetime64('2000-01-01T00:00:00', 's')
+    return {
+        'timestamp': start + np.arange(count).astype('timedelta64[s]'),
+        'value': np.arange(1, count + 1) * 0.25,
+        'count': np.arange(1, count + 1),
+    }
+
+
+def test_array_data_serializes_like_omf_data():
+    arrays = createArrays(100)
+    array_data = OMFArrayData.fromArrays(container_id='container', **arrays)
+    omf_data = OMFData(
+        [
+            MyCountClass(
+                datetime(2000, 1, 1) + timedelta(seconds=i),
+                float(arrays['value'][i]),
+                int(arrays['count'][i]),
+            )
+            for i in range(100)
+        ],
+        ContainerId='container',
+    )
+
+    assert array_data.toJson() == omf_data.toJson()
+    assert array_data.toDictionary() == omf_data.toDictionary()
+
+
+def test_nulls_and_fractional_timestamps():
+    array_data = OMFArrayData.fromArrays(
+        timestamp=np.array(['2000-01-01T00:00:00.5', 'NaT'], dtype='datetime64[ns]'),
+        value=np.array([np.nan, 1.5]),
+        flag=np.array([True, False]),
+        name=np.array(['a"b', 'c']),
+    )
+
+    assert array_data.toDictionary()['Values'] == [
+        {
+            'timestamp': '2000-01-01T00:00:00.500',
+            'value': None,
+            'flag': True,
+            'name': 'a"b',
+        },
+        {'timestamp': None, 'value': 1.5, 'flag': False, 'name': 'c'},
+    ]
+
+
+def test_infinite_values_are_null():
+    array_data = OMFArrayData.fromArrays(
+        value=np.array([np.inf, -np.inf, 1.5], dtype='float32')
+    )
+
+    assert json.loads(array_data.toJson()) == {
+        'Values': [{'value': None}, {'value': None}, {'value': 1.5}]
+    }
+
+
+def test_columns_follow_type_property_order():
+    omf_type = OMFType(
+        'MyType',
+        Properties={
+            'timestamp': OMFTypeProperty(
+                OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+            ),
+            'value': OMFTypeProperty(OMFTypeCode.Number),
+        },
+    )
+    arrays = createArrays(2)
+    array_data = OMFArrayData.fromArrays(
+        omf_type, value=arrays['value'], timestamp=arrays['timestamp']
+    )
+
+    assert array_data.TypeId == 'MyType'
+    assert list(array_data.toDictionary()['Values'][0]) == ['timestamp', 'value']
+    with pytest.raises(ValueError):
+        OMFArrayData.fromArrays(omf_type, **arrays)
+
+
+def test_array_data_is_split_by_batcher_and_streamed():
+    array_data = OMFArrayData.fromArrays(
+        container_id='container', **createArrays(10_000)
+    )
+    bodies = PayloadBatcher(20_000).batch([array_data])
+    assert len(bodies) > 1
+
+    messages = [m for body in bodies for m in json.loads(gzip.decompress(body))]
+    assert all(message['ContainerId'] == 'container' for message in messages)
+    values = [value for message in messages for value in message['Values']]
+    assert values == array_data.toDictionary()['Values']
+
+    streamed = b''.join(StreamingEncoder().encode([array_data]))
+    assert json.loads(gzip.decompress(streamed)) == [array_data.toDictionary()]
+
+
+def test_array_data_body_is_not_built_from_dictionaries(monkeypatch):
+    array_data = OMFArrayData.fromArrays(container_id='container', **createArrays(100))
+    expected = array_data.toDictionary()
+
+    def toDictionary(self):
+        raise AssertionError('OMFArrayData should be sent from its json')
+
+    monkeypatch.setattr(OMFArrayData, 'toDictionary', toDictionary)
+    body = OMFClient(url='https://test.com')._createBody([array_data])
+    assert json.loads(gzip.decompress(body)) == [expected]
@@ -33,3 +33,20 @@ def test_check_response_error_response(client: OMFClient):
 def test_invalid_omf_message_in_request_raises_error(client: OMFClient):
     with pytest.raises(TypeError):
         client.omfRequest(None, None, 'bad')
+
+
+def test_session_is_pooled_and_reused(client: OMFClient):
+    session = client.Session
+    assert client.Session is session
+    adapter = session.get_adapter('https://test.com/omf')
+    assert adapter._pool_connections == client.PoolConnections
+    assert adapter._pool_maxsize == client.PoolMaxSize
+
+
+def test_closed_client_raises_error():
+    with OMFClient(url='https://test.com/omf', keep_alive=False) as client:
+        assert client.Session.headers['Connection'] == 'close'
+
+    assert client.Closed
+    with pytest.raises(OMFError):
+        client.Session
@@ -0,0 +1,204 @@
+import gzip
+import json
+import math
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ..Client.PayloadBatcher import PayloadBatcher
+from ..Converters import convert, omf_type, omf_type_property
+from ..Models import (OMFColumnData, OMFColumns, OMFData, OMFFormatCode,
+                      OMFType, OMFTypeCode, OMFTypeProperty)
+from ..Services import BufferedDataWriter
+from .conftest import FakeDataService
+
+
+@omf_type()
+class MyTypedClass:
+    def __init__(self, timestamp, value, count, flag, label):
+        self.__timestamp = timestamp
+        self.__value = value
+        self.__count = count
+        self.__flag = flag
+        self.__label = label
+
+    @omf_type_property(IsIndex=True)
+    def timestamp(self) -> datetime:
+        return self.__timestamp
+
+    @omf_type_property()
+    def value(self) -> float | None:
+        return self.__value
+
+    @omf_type_property()
+    def count(self) -> int:
+        return self.__count
+
+    @omf_type_property()
+    def flag(self) -> bool:
+        return self.__flag
+
+    @omf_type_property()
+    def label(self) -> str:
+        return self.__label
+
+
+def createTypedValues(count: int) -> list[MyTypedClass]:
+    start = datetime(2000, 1, 1)
+    return [
+        MyTypedClass(
+            start + timedelta(seconds=i, microseconds=i),
+            None if i % 5 == 0 else i * 0.5,
+            i,
+            i % 2 == 0,
+            f'label{i % 3}' if i % 3 else '',
+        )
+        for i in range(count)
+    ]
+
+
+def test_column_data_serializes_like_omf_data():
+    values = createTypedValues(20)
+    column_data = OMFColumnData.fromValues(convert(MyTypedClass), values, 'container')
+    omf_data = OMFData(values, 'MyTypedClass', 'container')
+
+    assert column_data.toDictionary() == omf_data.toDictionary()
+    assert column_data.toJson() == omf_data.toJson()
+    assert column_data.Values[3] == omf_data.toDictionary()['Values'][3]
+
+
+def test_columns_accept_dictionaries_tuples_and_unexpected_values():
+    omf_type = OMFType(
+        'MyType',
+        Properties={
+            'timestamp': OMFTypeProperty(
+                OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+            ),
+            'value': OMFTypeProperty(OMFTypeCode.Integer),
+        },
+    )
+    utc = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    columns = OMFColumns(omf_type, [{'timestamp': utc, 'value': 1}, (utc, 2)])
+    assert columns.ItemSize == 16
+    assert columns.toRows() == [
+        {'timestamp': '2000-01-01T00:00:00+00:00', 'value': 1},
+        {'timestamp': '2000-01-01T00:00:00+00:00', 'value': 2},
+    ]
+
+    # Values an array cannot hold turn their column into a list without changing the rows
+    columns.append(('2000-01-02T00:00:00Z', 2**70))
+    assert columns.ItemSize == 0
+    assert columns[2] == {'timestamp': '2000-01-02T00:00:00Z', 'value': 2**70}
+    assert len(columns[1:]) == 2
+    assert columns[1:][0]['value'] == 2
+
+
+@dataclass
+class MyMixedClass:
+    timestamp: datetime
+    number: float = 0.5
+    nullable: float | None = None
+    integer: int = 1
+    flag: bool = True
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        MyMixedClass(datetime(2000, 1, 1), number=5),
+        MyMixedClass(datetime(2000, 1, 1), number=True),
+        MyMixedClass(datetime(2000, 1, 1), nullable=math.nan),
+        MyMixedClass(datetime(2000, 1, 1), integer=True),
+        MyMixedClass(datetime(2000, 1, 1), flag=2),
+    ],
+)
+def test_columns_keep_values_their_array_would_change(value: MyMixedClass):
+    omf_type = OMFType(
+        'MyMixedClass',
+        Properties={
+            'timestamp': OMFTypeProperty(
+                OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+            ),
+            'number': OMFTypeProperty(OMFTypeCode.Number),
+            'nullable': OMFTypeProperty([OMFTypeCode.Number, OMFTypeCode.Null]),
+            'integer': OMFTypeProperty(OMFTypeCode.Integer),
+            'flag': OMFTypeProperty(OMFTypeCode.Boolean),
+        },
+    )
+    values = [MyMixedClass(datetime(2000, 1, 1)), value]
+    column_data = OMFColumnData.fromValues(omf_type, values, 'container')
+
+    assert column_data.Values.ItemSize < OMFColumns(omf_type, values[:1]).ItemSize
+    assert column_data.toJson() == OMFData(values, 'MyMixedClass', 'container').toJson()
+
+
+def test_column_data_is_split_by_the_batcher():
+    values = createTypedValues(1000)
+    column_data = OMFColumnData.fromValues(convert(MyTypedClass), values, 'container')
+    batcher = PayloadBatcher(4096)
+
+    sent = []
+    for body in batcher.batch([column_data]):
+        sent.extend(json.loads(gzip.decompress(body))[0]['Values'])
+    assert sent == column_data.Values.toRows()
+
+
+def test_column_data_memory():
+    # Time series values are a timestamp and a number, which the columns hold in 16 bytes
+    @dataclass
+    class Value:
+        timestamp: datetime
+        value: float
+
+    omf_type = OMFType(
+        'Value',
+        Properties={
+            'timestamp': OMFTypeProperty(
+                OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+            ),
+            'value': OMFTypeProperty(OMFTypeCode.Number),
+        },
+    )
+    start = datetime(2000, 1, 1)
+    count = 20000
+
+    tracemalloc.start()
+    try:
+        values = [Value(start + timedelta(seconds=i), i * 0.5) for i in range(count)]
+        objects, _ = tracemalloc.get_traced_memory()
+        column_data = OMFColumnData.fromValues(omf_type, values)
+        del values
+        columns, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(column_data.Values) == count
+    assert column_data.Values.ItemSize == 16
+    assert columns * 8 < objects
+    assert (
+        column_data.toJson()
+        == OMFData(
+            [Value(start + timedelta(seconds=i), i * 0.5) for i in range(count)],
+            'Value',
+        ).toJson()
+    )
+
+
+def test_buffered_data_writer_compact_types():
+    data_service = FakeDataService()
+    values = createTypedValues(10)
+    with BufferedDataWriter(
+        data_service, max_latency=60, omf_types=[convert(MyTypedClass)]
+    ) as writer:
+        writer.writeMany('c1', values, 'MyTypedClass')
+        writer.writeMany('c2', values)
+        writer.flush()
+
+    sent = {data.ContainerId: data for data in data_service.Sent[0]}
+    assert isinstance(sent['c1'], OMFColumnData)
+    assert type(sent['c2']) is OMFData
+    assert (
+        sent['c1'].toDictionary()['Values'] == OMFData(values).toDictionary()['Values']
+    )
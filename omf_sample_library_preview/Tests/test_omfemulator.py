@@ -0,0 +1,93 @@
+import gzip
+from datetime import datetime
+
+import pytest
+import requests
+
+from ..Client.OMFClient import OMFClient
+from ..Client.OMFError import OMFError
+from ..Client.RetryPolicy import RetryPolicy
+from ..Emulator import OMFEmulator
+from ..Models import (OMFContainer, OMFData, OMFMessageAction, OMFMessageType,
+                      OMFType, OMFTypeCode, OMFTypeProperty)
+from ..Services import GeneralService
+from .conftest import MyClass1
+
+
+def createObjects() -> list:
+    return [
+        OMFType(
+            'MyType',
+            Properties={
+                'timestamp': OMFTypeProperty(OMFTypeCode.String, IsIndex=True),
+                'value': OMFTypeProperty(OMFTypeCode.Number),
+            },
+        ),
+        OMFContainer('MyContainer', 'MyType'),
+        OMFData([MyClass1(datetime(2000, 1, 1), 1.5)] * 3, ContainerId='MyContainer'),
+    ]
+
+
+def test_emulator_tracks_types_containers_and_values():
+    with OMFEmulator(store_values=True) as emulator, OMFClient(emulator.Url) as client:
+        client.StreamingChunkSize = 1024
+        service = GeneralService(client)
+        service.create(createObjects())
+        service.create(createObjects()[2:])
+
+        assert list(emulator.Types) == ['MyType']
+        assert list(emulator.Containers) == ['MyContainer']
+        assert emulator.ValueCounts == {'MyContainer': 6}
+        assert emulator.Values['MyContainer'][0] == {
+            'timestamp': '2000-01-01T00:00:00',
+            'value': 1.5,
+        }
+
+        service.delete(createObjects()[1:2])
+        assert emulator.Containers == {}
+        assert emulator.stats()['status_codes'] == {202: 4, 204: 1}
+
+
+def test_emulator_rejects_invalid_requests():
+    with OMFEmulator() as emulator, OMFClient(emulator.Url) as client:
+        service = GeneralService(client)
+        with pytest.raises(OMFError, match='Unknown container'):
+            service.create(createObjects()[2:])
+        with pytest.raises(OMFError, match='unknown type'):
+            service.create(createObjects()[1:2])
+
+        service.create(createObjects()[:1])
+        with pytest.raises(OMFError, match='different definition'):
+            service.create([OMFType('MyType', Name='changed')])
+
+        headers = client.getHeaders(OMFMessageType.Type, OMFMessageAction.Create)
+        headers['omfversion'] = '0.9'
+        response = requests.post(
+            client.OMFEndpoint, data=gzip.compress(b'[]'), headers=headers
+        )
+        assert response.status_code == 400
+        headers['omfversion'] = '1.2'
+        response = requests.post(client.OMFEndpoint, data=b'[', headers=headers)
+        assert response.status_code == 400
+
+
+def test_emulator_injects_throttling_errors_and_size_limits():
+    with OMFEmulator(max_requests_per_second=1, error_rate=0.5, seed=1) as emulator:
+        with OMFClient(emulator.Url) as client:
+            client.RetryPolicy = RetryPolicy(max_retries=0)
+            statuses = [
+                client.omfRequest(
+                    OMFMessageType.Type, OMFMessageAction.Create, createObjects()[:1]
+                )
+                for _ in range(6)
+            ]
+
+        assert {response.status_code for response in statuses} >= {429}
+        assert statuses[-1].headers['Retry-After'] == '1'
+        assert emulator.stats()['requests'] == 6
+
+    with OMFEmulator(max_body_size=100) as emulator, OMFClient(emulator.Url) as client:
+        response = client.omfRequest(
+            OMFMessageType.Type, OMFMessageAction.Create, createObjects()[:1] * 20
+        )
+        assert response.status_code == 413
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from ..Client.PayloadBatcher import PayloadBatcher
+from ..Models import OMFContainer, OMFData, OMFMessageAction, OMFMessageType
+from .conftest import createValues, decompress
+
+
+def test_small_payload_is_one_body():
+    containers = [OMFContainer(f'container{i}', 'type') for i in range(10)]
+    bodies = PayloadBatcher(100_000).batch(containers)
+    assert len(bodies) == 1
+    assert decompress(bodies) == [container.toDictionary() for container in containers]
+
+
+def test_messages_are_packed_under_limit():
+    limit = 2_000
+    containers = [
+        OMFContainer(
+            f'container{i}', 'type', Description=str(random.Random(i).random())
+        )
+        for i in range(1_000)
+    ]
+    bodies = PayloadBatcher(limit).batch(containers)
+
+    assert len(bodies) > 1
+    assert all(len(body) <= limit for body in bodies)
+    assert all(len(body) > limit / 2 for body in bodies[:-1])
+    assert decompress(bodies) == [container.toDictionary() for container in containers]
+
+
+def test_oversized_data_is_split_by_values():
+    limit = 5_000
+    data = OMFData(createValues(5_000), TypeId='type', ContainerId='container')
+    bodies = PayloadBatcher(limit).batch([data])
+
+    assert len(bodies) > 1
+    assert all(len(body) <= limit for body in bodies)
+
+    messages = decompress(bodies)
+    assert all(message['ContainerId'] == 'container' for message in messages)
+    assert all(message['TypeId'] == 'type' for message in messages)
+    values = [value for message in messages for value in message['Values']]
+    assert values == data.toDictionary()['Values']
+
+
+def test_invalid_max_payload_size_raises_error():
+    with pytest.raises(ValueError):
+        PayloadBatcher(0)
+
+
+def test_omf_request_sends_one_request_per_batch(createClient):
+    sent = []
+    client = createClient(sent)
+    client.MaxPayloadSize = 5_000
+    data = OMFData(createValues(5_000), ContainerId='container')
+    response = client.omfRequest(OMFMessageType.Data, OMFMessageAction.Create, [data])
+
+    assert response.status_code == 202
+    assert len(sent) > 1
+    values = [
+        value
+        for message in decompress([body for _, body in sent])
+        for value in message['Values']
+    ]
+    assert len(values) == 5_000
@@ -0,0 +1,119 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from ..Client.OMFClient import OMFClient
+from ..Client.RetryPolicy import RetryPolicy
+from ..Models import OMFContainer, OMFMessageAction, OMFMessageType
+from .conftest import createResponse
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list:
+    sleeps = []
+    monotonic = time.monotonic
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    monkeypatch.setattr(time, 'monotonic', lambda: monotonic() + sum(sleeps))
+    return sleeps
+
+
+def createRequest(results: list):
+    def request(*args, **kwargs):
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return (
+            createResponse(*result)
+            if isinstance(result, tuple)
+            else createResponse(result)
+        )
+
+    return request
+
+
+def test_retries_throttling_and_transport_errors(sleeps):
+    policy = RetryPolicy(jitter=False)
+    request = createRequest(
+        [
+            429,
+            502,
+            requests.exceptions.ConnectionError(),
+            requests.exceptions.Timeout(),
+            202,
+        ]
+    )
+
+    assert policy.run(request).status_code == 202
+    assert sleeps == [1, 2, 4, 8]
+
+
+def test_full_jitter_stays_under_exponential_delay(sleeps):
+    policy = RetryPolicy(max_retries=6, retry_budget=None)
+    policy.run(createRequest([503] * 6 + [202]))
+
+    assert len(sleeps) == 6
+    assert all(0 <= delay <= 2**attempt for attempt, delay in enumerate(sleeps))
+
+
+def test_retry_after_header_takes_precedence(sleeps):
+    policy = RetryPolicy(max_delay=60)
+    retry_time = format_datetime(
+        datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True
+    )
+    request = createRequest(
+        [(429, {'Retry-After': '7'}), (503, {'Retry-After': retry_time}), 202]
+    )
+
+    assert policy.run(request).status_code == 202
+    assert sleeps[0] == 7
+    assert 25 <= sleeps[1] <= 30
+
+
+def test_non_retryable_and_exhausted_requests(sleeps):
+    policy = RetryPolicy(max_retries=2, jitter=False)
+
+    assert policy.run(createRequest([400])).status_code == 400
+    assert policy.run(createRequest([503, 503, 503])).status_code == 503
+    with pytest.raises(requests.exceptions.ConnectionError):
+        policy.run(createRequest([requests.exceptions.ConnectionError()] * 3))
+    assert sleeps == [1, 2, 1, 2]
+
+
+def test_max_elapsed_time(sleeps):
+    policy = RetryPolicy(max_elapsed_time=5, jitter=False)
+
+    assert policy.run(createRequest([503, 503, 503, 503, 202])).status_code == 503
+    assert sleeps == [1, 2]
+
+
+def test_retry_budget_is_shared_and_refilled(sleeps):
+    policy = RetryPolicy(jitter=False, retry_budget=2, budget_ratio=0.5)
+
+    assert policy.run(createRequest([503, 503, 503])).status_code == 503
+    assert policy.run(createRequest([503])).status_code == 503
+    assert len(sleeps) == 2
+
+    policy.run(createRequest([202]))
+    policy.run(createRequest([202]))
+    assert policy.run(createRequest([503, 202])).status_code == 202
+    assert len(sleeps) == 3
+
+
+def test_client_retries_omf_requests(monkeypatch, sleeps):
+    client = OMFClient(url='https://test.com')
+    client.RetryPolicy = RetryPolicy(jitter=False)
+    monkeypatch.setattr(client, 'request', createRequest([503, 429, 202]))
+
+    response = client.omfRequest(
+        OMFMessageType.Container,
+        OMFMessageAction.Create,
+        [OMFContainer('container', 'type')],
+    )
+
+    assert response.status_code == 202
+    assert sleeps == [1, 2]
+    client.MaxRetries = 3
+    assert client.RetryPolicy.MaxRetries == 3
@@ -1,10 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from typing import Any, get_type_hints
 
 import pytest
 
 from ..Converters.ClassToOMFTypeConverter import omf_type, omf_type_property
-from ..Models import OMFContainer, OMFData, OMFExtrapolationMode, Serializeable
+from ..Models import (OMFClassification, OMFContainer, OMFData,
+                      OMFExtrapolationMode, OMFFormatCode, OMFType,
+                      OMFTypeCode, OMFTypeProperty, OMFTypeType, Serializeable)
+from ..Models.Serializeable import deserialize, dictionaryFactory
 
 
 @omf_type()
@@ -59,3 +63,127 @@ class MyClass2:
 )
 def test_canSerializeModel(model: Serializeable, expected: dict):
     assert model.toDictionary() == expected
+
+
+@dataclass
+class MyClass3:
+    timestamp: datetime
+    value: float
+    count: int = 0
+    flag: bool = False
+    label: str = ''
+    codes: list[OMFTypeCode] = None
+    nested: MyClass2 = None
+    items: list[MyClass2] = None
+    lookup: dict[str, Any] = None
+    extrapolation: OMFExtrapolationMode = None
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        OMFType(
+            'test',
+            OMFClassification.Dynamic,
+            OMFTypeType.Object,
+            Tags=['1'],
+            Properties={
+                'timestamp': OMFTypeProperty(
+                    OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+                ),
+                'value': OMFTypeProperty(
+                    [OMFTypeCode.Number, OMFTypeCode.Null], Minimum=0, Maximum=10
+                ),
+                'items': OMFTypeProperty(
+                    OMFTypeCode.Array, Items=OMFTypeProperty(OMFTypeCode.Integer)
+                ),
+            },
+        ),
+        OMFData[MyClass3](
+            [
+                MyClass3(datetime(2000, 1, 1), 0.0),
+                MyClass3(
+                    datetime(2000, 1, 2, 3, 4, 5, 6),
+                    1.5,
+                    3,
+                    True,
+                    'label',
+                    [OMFTypeCode.Number, OMFTypeCode.Null],
+                    MyClass2(datetime(2000, 1, 1), 5),
+                    [MyClass2(datetime(2000, 1, 1), 0)],
+                    {'a': [1, 2], 'b': {'c': None}},
+                    OMFExtrapolationMode.Forward,
+                ),
+            ],
+            TypeId='MyClass3',
+            ContainerId='container',
+            Properties={'a': 1},
+        ),
+        OMFData[MyClass1]([MyClass1(datetime(2000, 1, 1), 5)]),
+        OMFData[dict]([{'timestamp': '2000-01-01T00:00:00', 'value': 5}]),
+    ],
+)
+def test_compiledSerializerMatchesAsdict(model: Serializeable):
+    assert model.toDictionary() == asdict(model, dict_factory=dictionaryFactory)
+
+
+def legacyFromJson(cls: type, content: dict) -> Serializeable:
+    return cls(
+        **{
+            field: deserialize(field_type, content[field])
+            for field, field_type in get_type_hints(cls).items()
+            if field in content
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "cls,content",
+    [
+        (
+            OMFContainer,
+            {
+                'Id': 'test',
+                'TypeId': 'type',
+                'Tags': ['a', 'b'],
+                'Metadata': {'a': 1},
+                'Extrapolation': 'All',
+            },
+        ),
+        (
+            OMFType,
+            {
+                'Id': 'test',
+                'Classification': 'dynamic',
+                'Type': 'Object',
+                'Properties': {
+                    'value': {'Type': 'Number', 'Minimum': 0, 'Maximum': 2.5},
+                    'items': {'Type': 'Array', 'Items': {'Type': 'Integer'}},
+                },
+            },
+        ),
+        (OMFTypeProperty, {'Type': 'String', 'Minimum': '1', 'Name': 5}),
+    ],
+)
+def test_compiledDecoderMatchesDeserialize(cls: type, content: dict):
+    assert cls.fromJson(content) == legacyFromJson(cls, content)
+
+
+def test_fromJsonRoundTrip():
+    omf_type = OMFType(
+        'test',
+        OMFClassification.Dynamic,
+        OMFTypeType.Object,
+        Properties={
+            'timestamp': OMFTypeProperty(
+                OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+            ),
+            'value': OMFTypeProperty([OMFTypeCode.Number, OMFTypeCode.Null]),
+        },
+    )
+    container = OMFContainer('container', 'test', Tags=['a'])
+    assert OMFType.fromJson(omf_type.toDictionary()) == omf_type
+    assert OMFContainer.fromJsonMany([container.toDictionary()] * 2) == [container] * 2
+
+    data = OMFData.fromJson({'Values': [{'value': 1}], 'ContainerId': 'container'})
+    assert data == OMFData([{'value': 1}], ContainerId='container')
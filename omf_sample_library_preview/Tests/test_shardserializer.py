@@ -0,0 +1,122 @@
+import multiprocessing
+
+import pytest
+
+from ..Client.CompressionPolicy import CompressionPolicy
+from ..Client.OMFClient import OMFClient
+from ..Client.ShardSerializer import ShardSerializer
+from ..Emulator import OMFEmulator
+from ..Models import (OMFColumnData, OMFContainer, OMFFormatCode, OMFType,
+                      OMFTypeCode, OMFTypeProperty)
+from ..Services import DataService, GeneralService
+from .conftest import createData, decompress
+
+MY_TYPE = OMFType(
+    'MyType',
+    Properties={
+        'timestamp': OMFTypeProperty(
+            OMFTypeCode.String, OMFFormatCode.DateTime, IsIndex=True
+        ),
+        'value': OMFTypeProperty(OMFTypeCode.Number),
+    },
+)
+
+
+def createColumnData(container_id: str, count: int) -> OMFColumnData:
+    return OMFColumnData.fromValues(
+        MY_TYPE, createData(container_id, count).Values, container_id
+    )
+
+
+def readValues(bodies: list[bytes]) -> list[tuple[str, dict]]:
+    return [
+        (message['ContainerId'], value)
+        for message in decompress(bodies)
+        for value in message['Values']
+    ]
+
+
+@pytest.fixture(scope='module')
+def serializer():
+    with ShardSerializer(max_workers=2, shard_values=1000, min_values=2500) as result:
+        yield result
+
+
+def test_shard_cuts_messages_in_order(serializer):
+    omf_type = OMFType('MyType', Properties={})
+    shards = list(
+        serializer.shard([omf_type, createData('c1', 1500), createData('c2', 800)])
+    )
+
+    assert [
+        [
+            (getattr(message, 'ContainerId', None), len(getattr(message, 'Values', [])))
+            for message in shard
+        ]
+        for shard in shards
+    ] == [[(None, 0), ('c1', 999)], [('c1', 501), ('c2', 499)], [('c2', 301)]]
+    assert shards[1][0].Values[0] == createData('c1', 1500).Values[999]
+
+
+def test_only_column_values_are_sharded_by_default(serializer):
+    assert serializer.accepts([createColumnData('c1', 3000), createData('c2', 500)])
+    assert not serializer.accepts([createColumnData('c1', 2000)])
+    assert not serializer.accepts([createData('c1', 5000)])
+
+    with ShardSerializer(2, 1000, 2500, 'fork') as forked:
+        assert forked.accepts([createData('c1', 5000)])
+
+
+def test_bodies_hold_every_value_in_order(serializer):
+    omf_data = [createColumnData('c1', 2000), createColumnData('c2', 1500)]
+    assert serializer.accepts(omf_data)
+    assert not serializer.accepts(omf_data[1:])
+
+    client = OMFClient('http://127.0.0.1')
+    expected = readValues(client._createBodies(omf_data))
+
+    compression_policy = CompressionPolicy()
+    bodies = list(serializer.iterBodies(omf_data, compression_policy))
+    assert len(bodies) == 4
+    assert readValues(bodies) == expected
+    assert compression_policy.CompressedBodies == 4
+
+    bodies = list(serializer.iterBodies(omf_data, max_payload_size=4096))
+    assert all(len(body) <= 4096 for body in bodies)
+    assert readValues(bodies) == expected
+
+
+def test_serializer_does_not_fork_by_default(serializer):
+    assert serializer.StartMethod != 'fork'
+
+
+@pytest.mark.parametrize('start_method', ['spawn', 'fork'])
+def test_start_methods_produce_the_same_bodies(start_method: str):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f'{start_method} is not available')
+
+    omf_data = [createColumnData('c1', 2000), createData('c2', 1500)]
+    expected = readValues(OMFClient('http://127.0.0.1')._createBodies(omf_data))
+
+    with ShardSerializer(2, 1000, start_method=start_method) as serializer:
+        assert serializer.StartMethod == start_method
+        assert readValues(list(serializer.iterBodies(omf_data))) == expected
+
+
+def test_client_sends_shards_in_order(serializer):
+    with OMFEmulator(store_values=True) as emulator, OMFClient(emulator.Url) as client:
+        GeneralService(client).create([MY_TYPE, OMFContainer('c1', 'MyType')])
+        client.ShardSerializer = serializer
+        emulator.resetStats()
+
+        DataService(client).createData([createColumnData('c1', 3000)])
+        assert emulator.stats()['requests'] == 3
+        DataService(client).createData([createColumnData('c1', 100)])
+        assert emulator.stats()['requests'] == 4
+
+        sent = emulator.Values['c1']
+        assert len(sent) == 3100
+        assert [value['value'] for value in sent[:3000]] == [
+            i + 0.5 for i in range(3000)
+        ]
+        client.ShardSerializer = None
@@ -0,0 +1,106 @@
+import asyncio
+import os
+
+from ..Client.AsyncOMFClient import AsyncOMFClient
+from ..Client.CompressionPolicy import CompressionPolicy
+from ..Client.OMFClient import OMFClient
+from ..Client.Profiling import profileCalls, traceAllocations
+from ..Client.RetryPolicy import RetryPolicy
+from ..Client.StageTimings import STAGES, StageTimings
+from ..Emulator import OMFEmulator
+from ..Models import OMFContainer, OMFMessageAction, OMFMessageType, OMFType
+from ..Services import ContainerService, DataService, TypeService
+from .conftest import createData
+
+
+def test_stage_timings_callback():
+    results = []
+    with OMFEmulator() as emulator, OMFClient(emulator.Url) as client:
+        client.StageTimingCallback = results.append
+        client.omfRequest(
+            OMFMessageType.Data,
+            OMFMessageAction.Create,
+            [createData('MyContainer', 50)],
+        )
+
+    assert len(results) == 1
+    timings = results[0]
+    assert timings.MessageType == OMFMessageType.Data
+    assert list(timings.Seconds) == list(STAGES)
+    assert timings.Counts == {
+        'serialize': 1,
+        'compress': 1,
+        'headers': 1,
+        'network': 1,
+        'backoff': 0,
+    }
+    assert sum(timings.Seconds.values()) <= timings.Total
+
+
+def test_stage_timings_collect_counts_retries_and_batches():
+    with OMFEmulator(seed=1) as emulator, OMFClient(emulator.Url) as client:
+        TypeService(client).createTypes([OMFType('MyType')])
+        ContainerService(client).createContainers(
+            [OMFContainer('MyContainer', 'MyType')]
+        )
+        emulator.ErrorRate = 0.5
+        emulator.resetStats()
+
+        client.RetryPolicy = RetryPolicy(max_delay=0.001, retry_budget=None)
+        client.MaxPayloadSize = 300
+        client.CompressionPolicy = CompressionPolicy(executor='thread')
+        with StageTimings.collect() as results:
+            DataService(client).createData([createData('MyContainer', 50)])
+
+    assert len(results) == 1
+    assert results[0].MessageType == OMFMessageType.Data
+    counts = results[0].Counts
+    batches = emulator.stats()['status_codes'][202]
+    assert batches > 1
+    assert counts['network'] == counts['headers'] == emulator.stats()['requests']
+    assert counts['backoff'] == counts['network'] - batches > 0
+    assert counts['compress'] > batches
+
+
+def test_stage_timings_off_by_default():
+    with OMFEmulator() as emulator, OMFClient(emulator.Url) as client:
+        with StageTimings.collect() as results:
+            pass
+        client.omfRequest(
+            OMFMessageType.Data,
+            OMFMessageAction.Create,
+            [createData('MyContainer', 50)],
+        )
+
+    assert results == []
+
+
+def test_async_stage_timings():
+    async def send():
+        async with AsyncOMFClient(emulator.Url) as client:
+            with StageTimings.collect() as results:
+                await client.omfRequest(
+                    OMFMessageType.Data,
+                    OMFMessageAction.Create,
+                    [createData('MyContainer', 50)],
+                )
+            return results
+
+    with OMFEmulator() as emulator:
+        results = asyncio.run(send())
+
+    assert len(results) == 1
+    assert results[0].Counts['serialize'] == 1
+    assert results[0].Counts['network'] == 1
+
+
+def test_profiling_reports(tmp_path):
+    profile_path = os.path.join(tmp_path, 'profile.txt')
+    memory_path = os.path.join(tmp_path, 'memory.txt')
+    with profileCalls(profile_path), traceAllocations(memory_path):
+        [message.toDictionary() for message in [createData('MyContainer', 50)] * 100]
+
+    with open(profile_path) as file:
+        assert 'toDictionary' in file.read()
+    with open(memory_path) as file:
+        assert file.readline().startswith('Peak traced memory')
@@ -0,0 +1,185 @@
+import gzip
+import json
+import threading
+
+import pytest
+
+from ..Client.OMFClient import OMFClient
+from ..Client.OMFError import OMFError
+from ..Client.PIOMFClient import PIOMFClient
+from ..Client.StoreAndForwardQueue import StoreAndForwardQueue
+from ..Models import OMFContainer, OMFMessageAction, OMFMessageType
+from .conftest import createResponse
+
+
+def test_bodies_are_stored_and_sent_in_order(monkeypatch, tmp_path):
+    client = OMFClient(url='https://test.com')
+    status_codes = [503, 503, 202, 202, 202]
+    sent = []
+    lock = threading.Lock()
+
+    def request(method, url, params=None, data=None, headers=None, **kwargs):
+        with lock:
+            status_code = status_codes.pop(0)
+            if status_code == 202:
+                sent.append((headers['messagetype'], json.loads(gzip.decompress(data))))
+        return createResponse(status_code)
+
+    monkeypatch.setattr(client.Session, 'request', request)
+    client.StoreAndForward = StoreAndForwardQueue(
+        str(tmp_path / 'queue.db'), retry_interval=0.01
+    )
+
+    for i in range(3):
+        response = client.omfRequest(
+            OMFMessageType.Container,
+            OMFMessageAction.Create,
+            [OMFContainer(f'container{i}', 'type')],
+        )
+        assert response.status_code == 202
+
+    assert client.StoreAndForward.flush(timeout=5)
+    client.close()
+
+    assert [body[0]['Id'] for _, body in sent] == [
+        'container0',
+        'container1',
+        'container2',
+    ]
+    assert all(message_type == 'Container' for message_type, _ in sent)
+
+
+def test_stored_bodies_are_sent_with_client_authentication(monkeypatch):
+    client = PIOMFClient('https://test.com', 'user', 'password')
+    sent = []
+
+    def request(method, url, params=None, data=None, headers=None, **kwargs):
+        auth = kwargs.get('auth')
+        if auth is None or (auth.username, auth.password) != ('user', 'password'):
+            return createResponse(401)
+        sent.append(json.loads(gzip.decompress(data)))
+        return createResponse(202)
+
+    monkeypatch.setattr(client.Session, 'request', request)
+    client.StoreAndForward = StoreAndForwardQueue(':memory:', retry_interval=0.01)
+    client.omfRequest(
+        OMFMessageType.Container,
+        OMFMessageAction.Create,
+        [OMFContainer('container', 'type')],
+    )
+
+    assert client.StoreAndForward.flush(timeout=5)
+    assert client.StoreAndForward.Dropped == 0
+    client.close()
+    assert sent == [[{'Id': 'container', 'TypeId': 'type'}]]
+
+
+def test_stored_bodies_survive_restart(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    with StoreAndForwardQueue(path) as queue:
+        queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'body1')
+        queue.put(OMFMessageType.Data, OMFMessageAction.Update, b'body2')
+
+    sent = []
+    with StoreAndForwardQueue(path) as queue:
+        assert queue.Pending == 2
+        queue.start(
+            lambda message_type, action, body: sent.append((action, body))
+            or createResponse(202)
+        )
+        assert queue.flush(timeout=5)
+
+    assert sent == [
+        (OMFMessageAction.Create, b'body1'),
+        (OMFMessageAction.Update, b'body2'),
+    ]
+
+
+def test_rejected_bodies_are_dropped():
+    sent = []
+    with StoreAndForwardQueue(':memory:') as queue:
+        queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'bad')
+        queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'good')
+        queue.start(
+            lambda message_type, action, body: sent.append(body)
+            or createResponse(400 if body == b'bad' else 202)
+        )
+        assert queue.flush(timeout=5)
+        assert queue.Dropped == 1
+
+    assert sent == [b'bad', b'good']
+
+
+def test_sender_keeps_running_after_errors():
+    sent = []
+    errors = [OMFError('Failed to refresh the token'), ValueError('Unexpected')]
+
+    def send(message_type, action, body):
+        if errors:
+            raise errors.pop(0)
+        sent.append(body)
+        return createResponse(202)
+
+    with StoreAndForwardQueue(':memory:', retry_interval=0.01) as queue:
+        queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'body')
+        queue.start(send)
+        assert queue.flush(timeout=5)
+        assert queue.Dropped == 0
+
+    assert sent == [b'body']
+
+
+def test_close_waits_for_the_sender_before_closing_the_file(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    sending = threading.Event()
+    release = threading.Event()
+    sender = []
+
+    def send(message_type, action, body):
+        sender.append(threading.current_thread())
+        sending.set()
+        release.wait(5)
+        return createResponse(202)
+
+    queue = StoreAndForwardQueue(path)
+    queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'body')
+    queue.start(send)
+    assert sending.wait(5)
+    queue.close(timeout=0.01)
+    release.set()
+    sender[0].join(5)
+
+    # The body sent after the close timeout is still removed from the file
+    with StoreAndForwardQueue(path) as queue:
+        assert queue.Pending == 0
+
+
+@pytest.mark.parametrize(
+    'drop_policy,expected',
+    [('oldest', [b'2' * 4, b'3' * 4]), ('newest', [b'1' * 4, b'2' * 4])],
+)
+def test_quota_drop_policy(drop_policy: str, expected: list):
+    sent = []
+    with StoreAndForwardQueue(
+        ':memory:', max_disk_bytes=8, drop_policy=drop_policy
+    ) as queue:
+        for body in [b'1' * 4, b'2' * 4, b'3' * 4]:
+            queue.put(OMFMessageType.Data, OMFMessageAction.Create, body)
+
+        assert queue.Dropped == 1
+        assert queue.PendingBytes == 8
+        queue.start(
+            lambda message_type, action, body: sent.append(body) or createResponse(202)
+        )
+        assert queue.flush(timeout=5)
+
+    assert sent == expected
+
+
+def test_quota_error_policy():
+    with StoreAndForwardQueue(
+        ':memory:', max_disk_bytes=8, drop_policy='error'
+    ) as queue:
+        queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'1' * 8)
+        with pytest.raises(OMFError):
+            queue.put(OMFMessageType.Data, OMFMessageAction.Create, b'2')
@@ -0,0 +1,30 @@
+import gzip
+import json
+
+from ..Client.StreamingEncoder import StreamingEncoder
+from ..Models import OMFContainer, OMFData, OMFMessageAction, OMFMessageType
+from .conftest import createValues, decompress
+
+
+def test_streaming_encoder_matches_body():
+    omf_message = [
+        OMFContainer('container', 'type'),
+        OMFData(createValues(1_000), TypeId='type', ContainerId='container'),
+        OMFData([], ContainerId='empty'),
+    ]
+    chunks = list(StreamingEncoder(chunk_size=1_000).encode(omf_message))
+
+    assert len(chunks) > 1
+    assert gzip.decompress(b''.join(chunks)) == json.dumps(
+        [message.toDictionary() for message in omf_message]
+    ).encode('utf-8')
+
+
+def test_omf_request_streams_body(createClient):
+    sent = []
+    client = createClient(sent)
+    client.StreamingChunkSize = 1_000
+    data = OMFData(createValues(100), ContainerId='container')
+    client.omfRequest(OMFMessageType.Data, OMFMessageAction.Create, [data])
+
+    assert decompress([body for _, body in sent]) == [data.toDictionary()]
@@ -13,8 +13,13 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type='text/markdown',
     url='https://github.com/osisoft/sample-omf_library_preview-python',
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=['benchmarks', 'benchmarks.*']),
     install_requires=['requests>=2.28.2', 'python-dateutil>=2.8.2'],
+    extras_require={
+        'async': ['aiohttp>=3.9'],
+        'numpy': ['numpy>=1.21'],
+        'pandas': ['numpy>=1.21', 'pandas>=1.5'],
+    },
     tests_require=[
         'pytest>=7.0.1',
     ],